@@ -0,0 +1,80 @@
+"""
+Benchmark of response decoding: raw JSON bytes to model objects.
+
+Compares the previous path (``json.loads`` followed by hand-written copies into
+eager dataclasses) with the schema-driven decoders, on a large DexScreener
+search response and a large CoinMarketCap info response. Recorded payloads can
+be passed with --search and --info; synthetic ones are generated otherwise.
+
+Usage:
+    python -m benchmarks.bench_decoding [--search search.json] [--info info.json] [--size 300]
+"""
+
+import argparse
+import json
+import timeit
+from typing import Any, Callable
+
+from benchmarks.bench_models import eager_coin_info, eager_pair
+from gigabot.adapters.decoding import decode, loads, orjson
+from gigabot.adapters.models.coin_info import CoinInfo
+from gigabot.adapters.models.dex_screener_models import Pair
+from tests.samples import sample_coin_info, sample_pair
+
+
+def previous_search(body: bytes):
+    return [eager_pair(pair) for pair in json.loads(body)["pairs"]]
+
+
+def decoded_search(body: bytes):
+    return [decode(Pair, pair) for pair in loads(body)["pairs"]]
+
+
+def previous_info(body: bytes):
+    return [eager_coin_info(coin) for coin in json.loads(body)["data"].values()]
+
+
+def decoded_info(body: bytes):
+    return [decode(CoinInfo, coin) for coin in loads(body)["data"].values()]
+
+
+def measure(parse: Callable[[bytes], Any], body: bytes, number: int) -> float:
+    return min(timeit.repeat(lambda: parse(body), number=number, repeat=5)) / number * 1000
+
+
+def report(name: str, body: bytes, previous: Callable[[bytes], Any], decoded: Callable[[bytes], Any], number: int):
+    objects = len(decoded(body))
+    before = measure(previous, body, number)
+    after = measure(decoded, body, number)
+    print(f"{name}: {objects} objects, {len(body) / 1024:.0f} KiB")
+    print(f"  json.loads + copy   {before:8.3f} ms/response {before / objects * 1000:8.2f} us/object")
+    print(f"  schema decoder      {after:8.3f} ms/response {after / objects * 1000:8.2f} us/object")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--search", help="recorded /latest/dex/search response")
+    parser.add_argument("--info", help="recorded /v2/cryptocurrency/info response")
+    parser.add_argument("--size", type=int, default=300, help="objects per synthetic response")
+    parser.add_argument("--number", type=int, default=20, help="decodes per measurement")
+    args = parser.parse_args()
+
+    if args.search:
+        with open(args.search, "rb") as file:
+            search = file.read()
+    else:
+        search = json.dumps({"schemaVersion": "1.0.0", "pairs": [sample_pair(index) for index in range(args.size)]}).encode()
+
+    if args.info:
+        with open(args.info, "rb") as file:
+            info = file.read()
+    else:
+        info = json.dumps({"data": {str(index): sample_coin_info(index) for index in range(args.size)}}).encode()
+
+    print(f"JSON parser: {'orjson' if orjson is not None else 'json (standard library)'}")
+    report("search", search, previous_search, decoded_search, args.number)
+    report("info", info, previous_info, decoded_info, args.number)
+
+
+if __name__ == "__main__":
+    main()
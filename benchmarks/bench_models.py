@@ -0,0 +1,213 @@
+"""
+Micro-benchmark of the response models: parse time and retained bytes per object.
+
+Compares the slotted, lazily parsed models with eager ``@dataclass`` models
+equivalent to the previous ones, on synthetic DexScreener search and
+CoinMarketCap quote/info payloads.
+
+Usage:
+    python -m benchmarks.bench_models [--pairs 30] [--repeat 2000]
+"""
+
+import argparse
+import gc
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from gigabot.adapters.dex_screener_adapter import DexScreenerAdapter
+from gigabot.adapters.utils import create_coin_info, create_cryptocurrency_quote
+from tests.samples import sample_coin_info, sample_pair, sample_quote
+
+
+# Eager models, as they were before the slotted ones.
+
+@dataclass
+class EagerToken:
+    address: str
+    name: str
+    symbol: str
+
+@dataclass
+class EagerWebsite:
+    label: str
+    url: str
+
+@dataclass
+class EagerSocial:
+    type: str
+    url: str
+
+@dataclass
+class EagerInfo:
+    imageUrl: str
+    websites: List[EagerWebsite]
+    socials: List[EagerSocial]
+
+@dataclass
+class EagerPair:
+    chainId: str
+    dexId: str
+    url: str
+    pairAddress: str
+    baseToken: EagerToken
+    quoteToken: EagerToken
+    priceNative: str
+    priceUsd: Optional[str]
+    txns: Dict[str, Dict[str, int]]
+    volume: Dict[str, float]
+    priceChange: Dict[str, float]
+    liquidity: Optional[Dict[str, float]]
+    fdv: Optional[float]
+    pairCreatedAt: Optional[int]
+    info: Optional[EagerInfo]
+
+@dataclass
+class EagerTag:
+    slug: str
+    name: str
+    category: str
+
+@dataclass
+class EagerPlatform:
+    id: int
+    name: str
+    symbol: str
+    slug: str
+    token_address: str
+
+@dataclass
+class EagerQuote:
+    id: int
+    symbol: str
+    tags: List[EagerTag]
+    platform: Optional[EagerPlatform]
+    quote: Dict[str, Any]
+    fields: Dict[str, Any]
+
+@dataclass
+class EagerURLs:
+    website: List[str]
+    twitter: List[str]
+    message_board: List[str]
+    chat: List[str]
+    facebook: List[str]
+    explorer: List[str]
+    reddit: List[str]
+    technical_doc: List[str]
+    source_code: List[str]
+    announcement: List[str]
+
+@dataclass
+class EagerContractAddress:
+    contract_address: str
+    platform: Dict[str, Any]
+
+@dataclass
+class EagerCoinInfo:
+    id: int
+    urls: EagerURLs
+    platform: Optional[EagerPlatform]
+    contract_address: List[EagerContractAddress]
+    fields: Dict[str, Any]
+
+
+def eager_pair(data: Dict[str, Any]) -> EagerPair:
+    info = data.get("info")
+    return EagerPair(
+        chainId=data["chainId"],
+        dexId=data["dexId"],
+        url=data["url"],
+        pairAddress=data["pairAddress"],
+        baseToken=EagerToken(**data["baseToken"]),
+        quoteToken=EagerToken(**data["quoteToken"]),
+        priceNative=data["priceNative"],
+        priceUsd=data.get("priceUsd"),
+        txns=data["txns"],
+        volume=data["volume"],
+        priceChange=data["priceChange"],
+        liquidity=data.get("liquidity"),
+        fdv=data.get("fdv"),
+        pairCreatedAt=data.get("pairCreatedAt"),
+        info=EagerInfo(
+            imageUrl=info["imageUrl"],
+            websites=[EagerWebsite(**website) for website in info.get("websites", [])],
+            socials=[EagerSocial(**social) for social in info.get("socials", [])],
+        ) if info else None,
+    )
+
+
+def eager_quote(data: Dict[str, Any]) -> EagerQuote:
+    return EagerQuote(
+        id=data["id"],
+        symbol=data["symbol"],
+        tags=[EagerTag(**tag) for tag in data["tags"]],
+        platform=EagerPlatform(**data["platform"]) if data["platform"] else None,
+        quote=data["quote"],
+        fields={key: value for key, value in data.items() if key not in ("tags", "platform", "quote")},
+    )
+
+
+def eager_coin_info(data: Dict[str, Any]) -> EagerCoinInfo:
+    return EagerCoinInfo(
+        id=data["id"],
+        urls=EagerURLs(**data["urls"]),
+        platform=EagerPlatform(**data["platform"]) if data["platform"] else None,
+        contract_address=[EagerContractAddress(**ca) for ca in data["contract_address"]],
+        fields={key: value for key, value in data.items() if key not in ("urls", "platform", "contract_address")},
+    )
+
+
+def retained_bytes(parse: Callable[[Dict[str, Any]], Any], payloads: List[Dict[str, Any]]) -> float:
+    """
+    Returns the bytes allocated and kept alive per parsed object, excluding the payloads.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    parsed = [parse(payload) for payload in payloads]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del parsed
+    return (after - before) / len(payloads)
+
+
+def report(name: str, parse: Callable[[Dict[str, Any]], Any], payloads: List[Dict[str, Any]], repeat: int):
+    seconds = min(timeit.repeat(lambda: [parse(payload) for payload in payloads], number=repeat // 10 or 1, repeat=5))
+    per_object = seconds / ((repeat // 10 or 1) * len(payloads)) * 1e6
+    print(f"  {name:<28} {per_object:8.2f} us/object {retained_bytes(parse, payloads):10.0f} bytes/object")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, default=30, help="pairs per search response")
+    parser.add_argument("--repeat", type=int, default=2000, help="parses per measurement")
+    args = parser.parse_args()
+
+    adapter = DexScreenerAdapter()
+    pairs = [sample_pair(index) for index in range(args.pairs)]
+    quotes = [sample_quote(index) for index in range(args.pairs)]
+    coin_infos = [sample_coin_info(index) for index in range(args.pairs)]
+
+    def lazy_pair_with_info(data):
+        pair = adapter.parse_pair(data)
+        pair.info
+        return pair
+
+    print(f"DexScreener pairs ({args.pairs} per response)")
+    report("eager dataclass", eager_pair, pairs, args.repeat)
+    report("slotted, info not read", adapter.parse_pair, pairs, args.repeat)
+    report("slotted, info read", lazy_pair_with_info, pairs, args.repeat)
+
+    print("CoinMarketCap quotes")
+    report("eager dataclass", eager_quote, quotes, args.repeat)
+    report("slotted, tags not read", create_cryptocurrency_quote, quotes, args.repeat)
+
+    print("CoinMarketCap coin infos")
+    report("eager dataclass", eager_coin_info, coin_infos, args.repeat)
+    report("slotted, platform not read", create_coin_info, coin_infos, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
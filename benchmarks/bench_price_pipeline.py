@@ -0,0 +1,288 @@
+"""
+Replay benchmark of the /price pipeline against local upstream stubs.
+
+Starts ``UpstreamStub`` on localhost, points the CoinMarketCap, DexScreener and
+Discord webhook URLs at it, and drives one of the entry points of the pipeline
+at a controlled concurrency:
+
+    service     PriceService.fetch_cryptocurrency_data
+    command     PriceCommand.run with a fake interaction context
+    send_price  scripts/send_price.send_message_via_webhook
+
+Every scenario starts from empty caches. The report gives the throughput, the
+p50/p95/p99 latency, the number of calls made to every upstream route and the
+peak memory, and can be written as JSON with --output to compare runs.
+
+Usage:
+    python -m benchmarks.bench_price_pipeline [--scenario service command send_price]
+        [--requests 500] [--concurrency 20] [--symbols 20] [--latency-ms 50]
+        [--jitter-ms 10] [--fixtures DIR] [--output report.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List
+
+from benchmarks.upstream_stub import UpstreamStub, load_fixtures, synthetic_fixtures
+
+SCENARIOS = ("service", "command", "send_price")
+
+WEBHOOK_PATH = f"/discord/api/v10/webhooks/{'1' * 18}/{'t' * 64}"
+
+
+def configure_environment(stub_url: str, workdir: str):
+    """
+    Points the bot configuration at the stub. Must run before gigabot is imported.
+    """
+    os.environ.update({
+        "COINMARKETCAP_URL": f"{stub_url}/cmc",
+        "COINMARKETCAP_TOKEN": "benchmark",
+        "DEXSCREENER_URL": f"{stub_url}/dex",
+        "DISCORD_WEBHOOK": f"{stub_url}{WEBHOOK_PATH}",
+        "CMC_ID_INDEX_PATH": os.path.join(workdir, "cmc_id_index.sqlite3"),
+        "CMC_CREDITS_PER_MINUTE": "1000000",
+        "CMC_CREDITS_PER_DAY": "100000000",
+        "CMC_CREDITS_PER_MONTH": "1000000000",
+        "TRACE_SAMPLE_RATE": "0",
+        "TRACE_SLOW_MS": "1000000000",
+    })
+
+
+class FakeContext:
+    """
+    Stand-in for the interaction context of a slash command.
+    """
+
+    def __init__(self, guild_id: int):
+        self.guild_id = guild_id
+        self.responses = 0
+        self.edits = 0
+        self.failures = 0
+
+    async def respond(self, content=None, embed=None, **kwargs):
+        self.responses += 1
+        if embed is None:
+            self.failures += 1
+
+    async def edit(self, content=None, embed=None, **kwargs):
+        self.edits += 1
+
+
+async def reset_state():
+    """
+    Drops the process-wide caches and clients so that scenarios start cold.
+    """
+    from gigabot.adapters import batching, cache, cmc_id_index, credit_budget, http_client
+    from gigabot.services import notification_service, price_service
+
+    await http_client.close_all()
+    await notification_service.get_notification_service().close()
+    notification_service._notification_service = None
+    cache._coin_info_cache = None
+    cache._quote_cache = None
+    batching._dex_screener_batcher = None
+    credit_budget._credit_budget = None
+    price_service._token_addresses.clear()
+    index = cmc_id_index._index
+    cmc_id_index._index = None
+    if index is not None and os.path.exists(index.path):
+        os.remove(index.path)
+
+
+def build_scenario(name: str, hedged: bool = False) -> Callable[[str, int], Awaitable[bool]]:
+    """
+    Returns a coroutine function running one request of a scenario, returning
+    whether it succeeded.
+    """
+    if name == "service":
+        from gigabot.services.price_service import PriceService
+
+        service = PriceService()
+        fetch = service.fetch_price_hedged if hedged else service.fetch_cryptocurrency_data
+
+        async def run(symbol: str, worker: int) -> bool:
+            return (await fetch(symbol)).ok
+
+    elif name == "command":
+        from gigabot.bot.commands.price_command import PriceCommand
+
+        async def run(symbol: str, worker: int) -> bool:
+            context = FakeContext(guild_id=worker % 8)
+            await PriceCommand(context, symbol).run()
+            return context.responses == 1 and not context.failures
+
+    elif name == "send_price":
+        from gigabot.scripts import send_price
+        from gigabot.services.price_service import PriceService
+
+        service = PriceService()
+
+        async def run(symbol: str, worker: int) -> bool:
+            await send_price.send_message_via_webhook(symbol, service)
+            return True
+
+    else:
+        raise ValueError(f"Unknown scenario {name}")
+    return run
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+async def run_scenario(
+    name: str,
+    stub: UpstreamStub,
+    symbols: List[str],
+    requests: int,
+    concurrency: int,
+    seed: int,
+    hedged: bool = False,
+) -> Dict[str, Any]:
+    await reset_state()
+    run = build_scenario(name, hedged)
+    stub.calls.clear()
+    rng = random.Random(seed)
+    workload = [rng.choice(symbols) for _ in range(requests)]
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker(index: int):
+        nonlocal errors
+        while workload:
+            symbol = workload.pop()
+            start = time.perf_counter()
+            try:
+                ok = await run(symbol, index)
+            except Exception:
+                ok = False
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    await reset_state()
+
+    return {
+        "scenario": name,
+        "requests": requests,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p95": round(percentile(latencies, 0.95), 2),
+            "p99": round(percentile(latencies, 0.99), 2),
+            "max": round(max(latencies, default=0.0), 2),
+        },
+        "upstream_calls": dict(sorted(stub.calls.items())),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(result: Dict[str, Any]):
+    latency = result["latency_ms"]
+    print(
+        f"{result['scenario']}: {result['requests']} requests in {result['seconds']} s, "
+        f"{result['throughput_rps']} req/s, {result['errors']} errors"
+    )
+    print(f"  latency ms  p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  max {latency['max']}")
+    calls = ", ".join(f"{route} {count}" for route, count in result["upstream_calls"].items())
+    print(f"  upstream    {calls}")
+    if "tracemalloc_peak_kib" in result:
+        print(f"  tracemalloc peak {result['tracemalloc_peak_kib']} KiB")
+
+
+async def main_async(args) -> Dict[str, Any]:
+    if args.fixtures:
+        fixtures = load_fixtures(args.fixtures)
+    else:
+        fixtures = synthetic_fixtures([f"SYM{index}" for index in range(args.symbols)])
+    symbols = list(fixtures["dex_search.json"])
+
+    stub = UpstreamStub(fixtures, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, seed=args.seed)
+    stub_url = await stub.start()
+    workdir = tempfile.mkdtemp(prefix="gigabot-bench-")
+    configure_environment(stub_url, workdir)
+    os.environ["PRICE_RESOLUTION"] = args.price_resolution
+
+    results = []
+    try:
+        for name in args.scenario:
+            if args.tracemalloc:
+                tracemalloc.start()
+            result = await run_scenario(
+                name, stub, symbols, args.requests, args.concurrency, args.seed, args.price_resolution == "hedged"
+            )
+            if args.tracemalloc:
+                result["tracemalloc_peak_kib"] = round(tracemalloc.get_traced_memory()[1] / 1024)
+                tracemalloc.stop()
+            print_report(result)
+            results.append(result)
+    finally:
+        await stub.stop()
+
+    return {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "symbols": len(symbols),
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "seed": args.seed,
+            "fixtures": args.fixtures or "synthetic",
+            "price_resolution": args.price_resolution,
+        },
+        "scenarios": results,
+        # ru_maxrss is in KiB on Linux.
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20, help="requests in flight at once")
+    parser.add_argument("--symbols", type=int, default=20, help="distinct symbols of the synthetic fixtures")
+    parser.add_argument("--latency-ms", type=float, default=50, help="mean upstream latency")
+    parser.add_argument("--jitter-ms", type=float, default=10, help="standard deviation of the upstream latency")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the workload and latency generators")
+    parser.add_argument("--price-resolution", choices=("coinmarketcap", "hedged"), default="coinmarketcap")
+    parser.add_argument("--fixtures", help="directory of recorded fixtures, see benchmarks/upstream_stub.py")
+    parser.add_argument("--tracemalloc", action="store_true", help="also report the tracemalloc peak (slower)")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    print(f"peak RSS {report['peak_rss_kib']} KiB")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
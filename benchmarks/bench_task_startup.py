@@ -0,0 +1,147 @@
+"""
+Import-time and start-up benchmark of the gigabot-task entrypoint.
+
+Every CronJob tick starts a fresh ``python -m gigabot.scripts.send_price``, so its
+import time and total wall-clock are paid on every run. This benchmark measures,
+over several fresh interpreters:
+
+    import   ``python -X importtime -c "import gigabot.scripts.send_price"``: total
+             import time, the slowest top-level packages, and which heavy
+             packages (py-cord, kubernetes, requests, NumPy) were loaded
+    run      wall-clock of a complete ``python -m gigabot.scripts.send_price``
+             against the local upstream stub, from process start to exit
+
+Usage:
+    python -m benchmarks.bench_task_startup [--runs 10] [--latency-ms 50] [--output report.json]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from benchmarks.bench_price_pipeline import WEBHOOK_PATH, git_commit, percentile
+from benchmarks.upstream_stub import UpstreamStub, synthetic_fixtures
+
+ENTRYPOINT = "gigabot.scripts.send_price"
+HEAVY_PACKAGES = ("discord", "kubernetes", "requests", "numpy")
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure_imports(runs: int) -> Dict[str, Any]:
+    totals: List[float] = []
+    packages: Dict[str, List[int]] = defaultdict(list)
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {ENTRYPOINT}"],
+            capture_output=True, text=True, check=True,
+        )
+        total = 0
+        self_times: Dict[str, int] = defaultdict(int)
+        for line in result.stderr.splitlines():
+            match = IMPORT_TIME_LINE.match(line)
+            if match is None:
+                continue
+            # The self time of every module is charged to its top-level package;
+            # the cumulative times of the top-level imports add up to the total.
+            self_times[match[4].split(".")[0]] += int(match[1])
+            if match[3] == " ":
+                total += int(match[2])
+        totals.append(total / 1000)
+        for name, microseconds in self_times.items():
+            packages[name].append(microseconds)
+
+    probe = subprocess.run(
+        [sys.executable, "-c", (
+            f"import sys, json, {ENTRYPOINT}; "
+            f"print(json.dumps([name for name in {HEAVY_PACKAGES!r} if name in sys.modules]))"
+        )],
+        capture_output=True, text=True, check=True,
+    )
+    slowest = sorted(
+        ((name, statistics.median(times) / 1000) for name, times in packages.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:10]
+    return {
+        "median_ms": round(statistics.median(totals), 1),
+        "min_ms": round(min(totals), 1),
+        "slowest_packages_ms": {name: round(ms, 1) for name, ms in slowest},
+        "heavy_packages_loaded": json.loads(probe.stdout),
+    }
+
+
+def measure_runs(runs: int, latency_ms: float, jitter_ms: float) -> Dict[str, Any]:
+    fixtures = synthetic_fixtures(["SYM0"])
+    stub = UpstreamStub(fixtures, latency_ms=latency_ms, jitter_ms=jitter_ms, seed=1)
+    stub_url = stub.start_in_thread()
+    workdir = tempfile.mkdtemp(prefix="gigabot-task-")
+    env = {
+        **os.environ,
+        "SYMBOL": "SYM0",
+        "COINMARKETCAP_URL": f"{stub_url}/cmc",
+        "COINMARKETCAP_TOKEN": "benchmark",
+        "DEXSCREENER_URL": f"{stub_url}/dex",
+        "DISCORD_WEBHOOK": f"{stub_url}{WEBHOOK_PATH}",
+        "TRACE_SAMPLE_RATE": "0",
+    }
+    durations: List[float] = []
+    failures = 0
+    try:
+        for run in range(runs):
+            # A fresh id index per run, like a fresh pod.
+            env["CMC_ID_INDEX_PATH"] = os.path.join(workdir, f"cmc_id_index_{run}.sqlite3")
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, "-m", ENTRYPOINT], env=env, capture_output=True, text=True)
+            durations.append((time.perf_counter() - start) * 1000)
+            failures += result.returncode != 0 or "Failed" in result.stdout
+        calls = dict(sorted(stub.calls.items()))
+    finally:
+        stub.stop_in_thread()
+    return {
+        "runs": runs,
+        "failures": failures,
+        "median_ms": round(statistics.median(durations), 1),
+        "p95_ms": round(percentile(durations, 0.95), 1),
+        "min_ms": round(min(durations), 1),
+        "upstream_calls_per_run": {route: round(count / runs, 2) for route, count in calls.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters per measurement")
+    parser.add_argument("--latency-ms", type=float, default=50, help="mean upstream latency")
+    parser.add_argument("--jitter-ms", type=float, default=10, help="standard deviation of the upstream latency")
+    parser.add_argument("--skip-run", action="store_true", help="only measure the import time")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args()
+
+    report: Dict[str, Any] = {"commit": git_commit(), "python": sys.version.split()[0]}
+    report["import"] = imports = measure_imports(args.runs)
+    print(f"import {ENTRYPOINT}: median {imports['median_ms']} ms, min {imports['min_ms']} ms")
+    print(f"  heavy packages loaded: {', '.join(imports['heavy_packages_loaded']) or 'none'}")
+    for name, ms in imports["slowest_packages_ms"].items():
+        print(f"  {name:24s} {ms:8.1f} ms")
+
+    if not args.skip_run:
+        report["run"] = run = measure_runs(args.runs, args.latency_ms, args.jitter_ms)
+        print(
+            f"python -m {ENTRYPOINT}: median {run['median_ms']} ms, p95 {run['p95_ms']} ms, "
+            f"min {run['min_ms']} ms, {run['failures']} failures"
+        )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
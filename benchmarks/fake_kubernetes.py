@@ -0,0 +1,152 @@
+"""
+Minimal fake of the Kubernetes batch/v1 CronJob API.
+
+Runs a threaded HTTP server answering the list, create and delete calls made by
+``KubernetesAdapter`` with a configurable latency, and writes a kubeconfig
+pointing the official client at it. Watches are held open without events until
+they time out.
+"""
+
+import json
+import re
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+CRONJOBS_PATH = re.compile(r"^/apis/batch/v1/namespaces/(?P<namespace>[^/]+)/cronjobs(?:/(?P<name>[^/?]+))?")
+
+
+def sample_cron_job(name: str, schedule: str = "*/5 * * * *") -> Dict[str, Any]:
+    return {
+        "apiVersion": "batch/v1",
+        "kind": "CronJob",
+        "metadata": {"name": name},
+        "spec": {
+            "schedule": schedule,
+            "jobTemplate": {"spec": {"template": {"spec": {
+                "restartPolicy": "OnFailure",
+                "containers": [{"name": name, "image": "gigabot-task:latest"}],
+            }}}},
+        },
+    }
+
+
+class FakeKubernetes:
+    """
+    In-memory CronJob store served over HTTP from a background thread.
+    """
+
+    def __init__(self, latency_ms: float = 20, cron_jobs: int = 20, namespace: str = "gigabot"):
+        """
+        Args:
+            latency_ms (float): Time every request takes to be answered.
+            cron_jobs (int): Number of CronJobs present at start.
+            namespace (str): Namespace the initial CronJobs are created in.
+        """
+        self.latency = latency_ms / 1000
+        self.cron_jobs: Dict[str, Dict[str, Dict[str, Any]]] = {
+            namespace: {
+                f"price-cron-sym{index}": sample_cron_job(f"price-cron-sym{index}")
+                for index in range(cron_jobs)
+            }
+        }
+        self.calls: Counter = Counter()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.url: Optional[str] = None
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status: int, document: Dict[str, Any]):
+                body = json.dumps(document).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _route(self, verb: str):
+                match = CRONJOBS_PATH.match(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                fake.calls[f"kubernetes.{verb}"] += 1
+                time.sleep(fake.latency)
+                if match is None:
+                    return self._reply(404, {"kind": "Status", "status": "Failure", "code": 404})
+                namespace, name = match["namespace"], match["name"]
+                with fake.lock:
+                    jobs = fake.cron_jobs.setdefault(namespace, {})
+                    if verb == "list":
+                        return self._reply(200, {
+                            "apiVersion": "batch/v1", "kind": "CronJobList", "metadata": {"resourceVersion": "1"},
+                            "items": list(jobs.values()),
+                        })
+                    if verb == "create":
+                        jobs[body["metadata"]["name"]] = body
+                        return self._reply(201, body)
+                    if jobs.pop(name, None) is None:
+                        return self._reply(404, {"kind": "Status", "status": "Failure", "code": 404})
+                    return self._reply(200, {"kind": "Status", "status": "Success"})
+
+            def _watch(self):
+                fake.calls["kubernetes.watch"] += 1
+                query = parse_qs(urlsplit(self.path).query)
+                timeout = float(query.get("timeoutSeconds", ["60"])[0])
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.wfile.flush()
+                fake.stopped.wait(timeout)
+
+            def do_GET(self):
+                if "watch=true" in self.path:
+                    return self._watch()
+                self._route("list")
+
+            def do_POST(self):
+                self._route("create")
+
+            def do_DELETE(self):
+                self._route("delete")
+
+        return Handler
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="fake-kubernetes", daemon=True).start()
+        self.url = f"http://{host}:{self._server.server_address[1]}"
+        return self.url
+
+    def stop(self):
+        self.stopped.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def write_kubeconfig(self, path: str):
+        """
+        Writes a kubeconfig whose current context targets the fake server.
+        """
+        kubeconfig = {
+            "apiVersion": "v1",
+            "kind": "Config",
+            "clusters": [{"name": "fake", "cluster": {"server": self.url}}],
+            "users": [{"name": "fake", "user": {"token": "fake"}}],
+            "contexts": [{"name": "fake", "context": {"cluster": "fake", "user": "fake"}}],
+            "current-context": "fake",
+        }
+        # JSON is valid YAML.
+        with open(path, "w") as file:
+            json.dump(kubeconfig, file)
@@ -0,0 +1,339 @@
+"""
+Load test of the slash-command handlers, ramping concurrency until the latency
+SLOs break.
+
+The handlers registered in ``gigabot/bot/bot_setup.py`` (``/price``,
+``/list-cron`` and ``/price-cron``) are invoked with fake interaction contexts,
+while CoinMarketCap and DexScreener are served by ``UpstreamStub`` and the
+Kubernetes API by ``FakeKubernetes``, each on its own thread. Every stage keeps
+``concurrency`` interactions in flight for ``--stage-seconds``, then doubles it.
+
+Per stage, the report gives the latency percentiles of every command, the
+queueing delay (time between an interaction arriving and its handler starting
+on the event loop), the event-loop lag, the peak number of threads, and how many
+interactions were not acknowledged within Discord's 3 second interaction
+deadline. The ramp stops at the first stage breaking the SLOs.
+
+Usage:
+    python -m benchmarks.load_test [--start 10] [--max 5000] [--stage-seconds 10]
+        [--slo-p95-ms 1000] [--scheduler-backend cronjob] [--output report.json]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from benchmarks.bench_price_pipeline import configure_environment, git_commit, percentile
+from benchmarks.fake_kubernetes import FakeKubernetes
+from benchmarks.upstream_stub import UpstreamStub, synthetic_fixtures
+
+# Discord invalidates an interaction that is not acknowledged within 3 seconds.
+INTERACTION_DEADLINE = 3.0
+
+COMMAND_MIX = {"price": 0.85, "list-cron": 0.10, "price-cron": 0.05}
+
+
+class FakeInteraction:
+    """
+    Stand-in for the ``ApplicationContext`` handed to slash-command handlers,
+    recording when the interaction was first acknowledged.
+    """
+
+    def __init__(self, guild_id: int):
+        self.guild_id = guild_id
+        self.arrived = time.perf_counter()
+        self.acknowledged: Optional[float] = None
+        self.failed = False
+
+    def _acknowledge(self):
+        if self.acknowledged is None:
+            self.acknowledged = time.perf_counter()
+
+    async def defer(self, *args, **kwargs):
+        self._acknowledge()
+
+    async def respond(self, content=None, embed=None, **kwargs):
+        self._acknowledge()
+        if embed is None:
+            self.failed = True
+
+    async def send(self, content=None, embed=None, **kwargs):
+        self._acknowledge()
+
+    async def edit(self, content=None, embed=None, **kwargs):
+        pass
+
+
+def handler_callback(command):
+    # bot.slash_command wraps the handler in an ApplicationCommand.
+    return getattr(command, "callback", command)
+
+
+class LoopSampler:
+    """
+    Samples the event-loop lag and the number of live threads.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lags: List[float] = []
+        self.peak_threads = 0
+        self.peak_executor_threads = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def reset(self):
+        self.lags = []
+        self.peak_threads = threading.active_count()
+        self.peak_executor_threads = 0
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, loop.time() - start - self.interval) * 1000)
+            self.peak_threads = max(self.peak_threads, threading.active_count())
+            executor = getattr(loop, "_default_executor", None)
+            if executor is not None:
+                self.peak_executor_threads = max(self.peak_executor_threads, len(executor._threads))
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+
+class LoadTest:
+    def __init__(self, args, symbols: List[str], stub: UpstreamStub, kubernetes: FakeKubernetes):
+        from gigabot.bot import bot_setup
+
+        self.args = args
+        self.symbols = symbols
+        self.stub = stub
+        self.kubernetes = kubernetes
+        self.random = random.Random(args.seed)
+        self.handlers = {
+            "price": handler_callback(bot_setup.price),
+            "list-cron": handler_callback(bot_setup.list_cron),
+            "price-cron": handler_callback(bot_setup.price_cron),
+        }
+        self.commands = list(COMMAND_MIX)
+        self.weights = [COMMAND_MIX[command] for command in self.commands]
+        self.sampler = LoopSampler()
+
+    def _invoke(self, command: str, ctx: FakeInteraction):
+        symbol = self.random.choice(self.symbols)
+        if command == "price":
+            return self.handlers[command](ctx, symbol)
+        if command == "price-cron":
+            return self.handlers[command](ctx, symbol, 5, 0)
+        return self.handlers[command](ctx)
+
+    async def _interaction(self, command: str, results: Dict[str, List[Dict[str, float]]]):
+        ctx = FakeInteraction(guild_id=self.random.randrange(50))
+        started = None
+
+        async def handle():
+            nonlocal started
+            started = time.perf_counter()
+            await self._invoke(command, ctx)
+
+        error = False
+        try:
+            await asyncio.get_running_loop().create_task(handle())
+        except Exception:
+            error = True
+        finished = time.perf_counter()
+        acknowledged = ctx.acknowledged
+        results[command].append({
+            "latency": (finished - ctx.arrived) * 1000,
+            "queueing": ((started or finished) - ctx.arrived) * 1000,
+            "missed": acknowledged is None or acknowledged - ctx.arrived > INTERACTION_DEADLINE,
+            "error": error or ctx.failed,
+        })
+
+    async def run_stage(self, concurrency: int) -> Dict[str, Any]:
+        results: Dict[str, List[Dict[str, float]]] = defaultdict(list)
+        self.stub.calls.clear()
+        self.kubernetes.calls.clear()
+        self.sampler.reset()
+        deadline = time.perf_counter() + self.args.stage_seconds
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                command = self.random.choices(self.commands, self.weights)[0]
+                await self._interaction(command, results)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        samples = [sample for command_samples in results.values() for sample in command_samples]
+        latencies = [sample["latency"] for sample in samples]
+        queueing = [sample["queueing"] for sample in samples]
+        missed = sum(sample["missed"] for sample in samples)
+        return {
+            "concurrency": concurrency,
+            "interactions": len(samples),
+            "throughput_rps": round(len(samples) / elapsed, 1),
+            "errors": sum(sample["error"] for sample in samples),
+            "deadline_missed": missed,
+            "deadline_miss_rate": round(missed / len(samples), 4) if samples else 0.0,
+            "latency_ms": summarize(latencies),
+            "commands": {
+                command: {"count": len(command_samples), "latency_ms": summarize([s["latency"] for s in command_samples])}
+                for command, command_samples in sorted(results.items())
+            },
+            "queueing_delay_ms": summarize(queueing),
+            "event_loop_lag_ms": summarize(self.sampler.lags),
+            "peak_threads": self.sampler.peak_threads,
+            "peak_executor_threads": self.sampler.peak_executor_threads,
+            "upstream_calls": dict(sorted({**self.stub.calls, **self.kubernetes.calls}.items())),
+        }
+
+    def violations(self, stage: Dict[str, Any]) -> List[str]:
+        broken = []
+        if stage["latency_ms"]["p95"] > self.args.slo_p95_ms:
+            broken.append(f"p95 latency {stage['latency_ms']['p95']} ms > {self.args.slo_p95_ms} ms")
+        if stage["deadline_miss_rate"] > self.args.slo_miss_rate:
+            broken.append(f"deadline miss rate {stage['deadline_miss_rate']} > {self.args.slo_miss_rate}")
+        return broken
+
+    async def run(self) -> List[Dict[str, Any]]:
+        stages = []
+        self.sampler.start()
+        if self.args.watchdog_ms:
+            from gigabot.observability.watchdog import start_loop_watchdog
+
+            start_loop_watchdog(self.args.watchdog_ms / 1000)
+        if self.args.scheduler_backend == "cronjob":
+            from gigabot.adapters.cron_job_cache import get_cron_job_cache
+
+            get_cron_job_cache("gigabot").start()
+        try:
+            concurrency = self.args.start
+            while concurrency <= self.args.max:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    stage = await self.run_stage(concurrency)
+                stage["slo_violations"] = self.violations(stage)
+                print_stage(stage)
+                stages.append(stage)
+                if stage["slo_violations"] and not self.args.keep_going:
+                    break
+                concurrency *= 2
+        finally:
+            self.sampler.stop()
+        return stages
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "p50": round(percentile(values, 0.50), 2),
+        "p95": round(percentile(values, 0.95), 2),
+        "p99": round(percentile(values, 0.99), 2),
+        "max": round(max(values, default=0.0), 2),
+    }
+
+
+def print_stage(stage: Dict[str, Any]):
+    latency, queueing, lag = stage["latency_ms"], stage["queueing_delay_ms"], stage["event_loop_lag_ms"]
+    print(
+        f"concurrency {stage['concurrency']:5d}: {stage['throughput_rps']:8.1f} req/s  "
+        f"p50 {latency['p50']:8.1f}  p95 {latency['p95']:8.1f}  p99 {latency['p99']:8.1f} ms  "
+        f"queue p99 {queueing['p99']:7.1f} ms  loop lag p99 {lag['p99']:7.1f} ms  "
+        f"threads {stage['peak_threads']:3d}  missed {stage['deadline_missed']}  errors {stage['errors']}"
+    )
+    for violation in stage["slo_violations"]:
+        print(f"  SLO broken: {violation}")
+
+
+def breaking_point(stages: List[Dict[str, Any]]) -> Dict[str, Optional[int]]:
+    return {
+        "slo": next((stage["concurrency"] for stage in stages if stage["slo_violations"]), None),
+        "interaction_deadline": next((stage["concurrency"] for stage in stages if stage["deadline_missed"]), None),
+    }
+
+
+async def main_async(args) -> Dict[str, Any]:
+    fixtures = synthetic_fixtures([f"SYM{index}" for index in range(args.symbols)])
+    stub = UpstreamStub(fixtures, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, seed=args.seed)
+    kubernetes = FakeKubernetes(latency_ms=args.kubernetes_latency_ms, cron_jobs=args.cron_jobs)
+    stub_url = stub.start_in_thread()
+    kubernetes.start()
+    workdir = tempfile.mkdtemp(prefix="gigabot-load-")
+    kubeconfig = os.path.join(workdir, "kubeconfig")
+    kubernetes.write_kubeconfig(kubeconfig)
+    configure_environment(stub_url, workdir)
+    os.environ.update({
+        "KUBECONFIG": kubeconfig,
+        "CLUSTER_AUTH_MODE": "local",
+        "SCHEDULER_BACKEND": args.scheduler_backend,
+        "SCHEDULE_STORE_PATH": os.path.join(workdir, "schedules.sqlite3"),
+        "ALERT_STORE_PATH": os.path.join(workdir, "alerts.sqlite3"),
+    })
+
+    from gigabot.adapters import http_client
+
+    logging.getLogger().setLevel(logging.WARNING)
+    load_test = LoadTest(args, list(fixtures["dex_search.json"]), stub, kubernetes)
+    try:
+        stages = await load_test.run()
+    finally:
+        await http_client.close_all()
+        stub.stop_in_thread()
+        kubernetes.stop()
+
+    return {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "command_mix": COMMAND_MIX,
+        "stages": stages,
+        "breaking_point": breaking_point(stages),
+        # ru_maxrss is in KiB on Linux.
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", type=int, default=10, help="concurrency of the first stage")
+    parser.add_argument("--max", type=int, default=5000, help="highest concurrency tried")
+    parser.add_argument("--stage-seconds", type=float, default=10, help="duration of every stage")
+    parser.add_argument("--slo-p95-ms", type=float, default=1000, help="p95 latency SLO")
+    parser.add_argument("--slo-miss-rate", type=float, default=0.01, help="tolerated share of missed interaction deadlines")
+    parser.add_argument("--keep-going", action="store_true", help="keep ramping after the SLOs break")
+    parser.add_argument("--symbols", type=int, default=200, help="distinct symbols requested")
+    parser.add_argument("--latency-ms", type=float, default=50, help="mean upstream latency")
+    parser.add_argument("--jitter-ms", type=float, default=10, help="standard deviation of the upstream latency")
+    parser.add_argument("--kubernetes-latency-ms", type=float, default=20, help="latency of the fake Kubernetes API")
+    parser.add_argument("--cron-jobs", type=int, default=20, help="CronJobs listed by /list-cron")
+    parser.add_argument("--scheduler-backend", choices=("cronjob", "inprocess"), default="cronjob")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the workload and latency generators")
+    parser.add_argument("--watchdog-ms", type=float, default=0, help="log the stack of loop stalls longer than this")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    print(f"breaking point: {report['breaking_point']}, peak RSS {report['peak_rss_kib']} KiB")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Local stand-in for the CoinMarketCap, DexScreener and Discord webhook APIs.
+
+Replays JSON fixtures with a configurable latency and jitter, and counts the
+calls made to every route. Fixtures are either recorded responses loaded from a
+directory, or generated for a list of synthetic symbols:
+
+    dex_search.json  {"<SYMBOL>": <search response>, ...}
+    cmc_map.json     <map response>
+    cmc_quotes.json  <quotes/latest response covering every id>
+    cmc_info.json    <info response covering every id>
+"""
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from aiohttp import web
+
+from tests.samples import sample_coin_info, sample_pair, sample_quote
+
+CMC_STATUS = {"timestamp": "2024-05-01T12:34:00.000Z", "error_code": 0, "error_message": None, "elapsed": 1, "notice": None}
+
+FIXTURE_FILES = ("dex_search.json", "cmc_map.json", "cmc_quotes.json", "cmc_info.json")
+
+
+def synthetic_fixtures(symbols: Iterable[str], pairs_per_search: int = 30) -> Dict[str, Any]:
+    """
+    Generates consistent fixtures: every symbol has a search result whose most
+    liquid raydium pair maps to a CoinMarketCap id with a quote and coin info.
+    """
+    search, map_entries, quotes, infos = {}, [], {}, {}
+    for coin_id, symbol in enumerate(symbols, start=1):
+        pairs = []
+        for index in range(pairs_per_search):
+            pair = sample_pair(coin_id * 1000 + index)
+            pair["baseToken"]["symbol"] = symbol
+            pair["liquidity"]["usd"] = 1_000_000 - index * 1000
+            pairs.append(pair)
+        token_address = pairs[0]["baseToken"]["address"]
+        search[symbol] = {"schemaVersion": "1.0.0", "pairs": pairs}
+
+        quote = sample_quote(coin_id)
+        quote["symbol"] = symbol
+        quote["platform"]["token_address"] = token_address
+        quotes[str(coin_id)] = quote
+
+        info = sample_coin_info(coin_id)
+        info["symbol"] = symbol
+        infos[str(coin_id)] = info
+
+        map_entries.append({
+            "id": coin_id, "symbol": symbol, "name": symbol.title(), "slug": symbol.lower(), "is_active": 1,
+            "platform": {"id": 5426, "name": "Solana", "symbol": "SOL", "slug": "solana", "token_address": token_address},
+        })
+    return {
+        "dex_search.json": search,
+        "cmc_map.json": {"status": CMC_STATUS, "data": map_entries},
+        "cmc_quotes.json": {"status": CMC_STATUS, "data": quotes},
+        "cmc_info.json": {"status": CMC_STATUS, "data": infos},
+    }
+
+
+def load_fixtures(directory: str) -> Dict[str, Any]:
+    fixtures = {}
+    for name in FIXTURE_FILES:
+        with open(os.path.join(directory, name)) as file:
+            fixtures[name] = json.load(file)
+    return fixtures
+
+
+def save_fixtures(fixtures: Dict[str, Any], directory: str):
+    os.makedirs(directory, exist_ok=True)
+    for name, document in fixtures.items():
+        with open(os.path.join(directory, name), "w") as file:
+            json.dump(document, file)
+
+
+class UpstreamStub:
+    """
+    aiohttp server answering the upstream routes used by the bot from fixtures.
+
+    CoinMarketCap is served under ``/cmc``, DexScreener under ``/dex`` and the
+    Discord API under ``/discord/api/v10``.
+    """
+
+    def __init__(
+        self,
+        fixtures: Dict[str, Any],
+        latency_ms: float = 50,
+        jitter_ms: float = 10,
+        seed: Optional[int] = None,
+        webhook_limit: int = 5,
+        webhook_period: float = 2.0,
+    ):
+        """
+        Args:
+            fixtures (dict): Fixture documents keyed by file name.
+            latency_ms (float): Mean response latency.
+            jitter_ms (float): Standard deviation of the latency.
+            seed (int): Seed of the latency generator, for reproducible runs.
+            webhook_limit (int): Messages a webhook accepts per period before
+                answering 429, like Discord; 0 disables the limit.
+            webhook_period (float): Seconds of the webhook rate limit window.
+        """
+        self.search = {symbol.upper(): response for symbol, response in fixtures["dex_search.json"].items()}
+        self.map_entries: List[Dict[str, Any]] = fixtures["cmc_map.json"]["data"]
+        self.quotes: Dict[str, Any] = fixtures["cmc_quotes.json"]["data"]
+        self.infos: Dict[str, Any] = fixtures["cmc_info.json"]["data"]
+        self.pairs_by_token: Dict[str, List[Dict[str, Any]]] = {}
+        for response in self.search.values():
+            for pair in response["pairs"]:
+                self.pairs_by_token.setdefault(pair["baseToken"]["address"].lower(), []).append(pair)
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.random = random.Random(seed)
+        self.webhook_limit = webhook_limit
+        self.webhook_period = webhook_period
+        self._webhook_windows: Dict[str, List[float]] = {}
+        self.calls: Counter = Counter()
+        self._runner: Optional[web.AppRunner] = None
+        self._thread_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.url: Optional[str] = None
+
+    async def _delay(self, route: str):
+        self.calls[route] += 1
+        await asyncio.sleep(max(0.0, self.random.gauss(self.latency, self.jitter)))
+
+    @staticmethod
+    def _ids(request: web.Request) -> List[str]:
+        return [coin_id for coin_id in request.query.get("id", "").split(",") if coin_id]
+
+    async def cmc_map(self, request: web.Request):
+        await self._delay("cmc.map")
+        symbol = request.query.get("symbol")
+        if symbol:
+            entries = [entry for entry in self.map_entries if entry["symbol"].upper() == symbol.upper()]
+        else:
+            start = int(request.query.get("start", 1))
+            entries = self.map_entries[start - 1:start - 1 + int(request.query.get("limit", 5000))]
+        return web.json_response({"status": {**CMC_STATUS, "credit_count": 1}, "data": entries})
+
+    async def cmc_quotes(self, request: web.Request):
+        ids = self._ids(request)
+        await self._delay("cmc.quotes")
+        data = {coin_id: self.quotes[coin_id] for coin_id in ids if coin_id in self.quotes}
+        return web.json_response({"status": {**CMC_STATUS, "credit_count": 1}, "data": data})
+
+    async def cmc_info(self, request: web.Request):
+        ids = self._ids(request)
+        await self._delay("cmc.info")
+        data = {coin_id: self.infos[coin_id] for coin_id in ids if coin_id in self.infos}
+        return web.json_response({"status": {**CMC_STATUS, "credit_count": 1}, "data": data})
+
+    async def cmc_key_info(self, request: web.Request):
+        await self._delay("cmc.key_info")
+        usage = {"current_day": {"credits_used": 0}, "current_month": {"credits_used": 0}}
+        return web.json_response({"status": CMC_STATUS, "data": {"usage": usage}})
+
+    async def dex_search(self, request: web.Request):
+        await self._delay("dex.search")
+        response = self.search.get(request.query.get("q", "").upper(), {"schemaVersion": "1.0.0", "pairs": []})
+        return web.json_response(response)
+
+    async def dex_tokens(self, request: web.Request):
+        await self._delay("dex.tokens")
+        pairs = [
+            pair
+            for address in request.match_info["addresses"].split(",")
+            for pair in self.pairs_by_token.get(address.lower(), [])
+        ]
+        return web.json_response({"schemaVersion": "1.0.0", "pairs": pairs})
+
+    async def discord_webhook(self, request: web.Request):
+        await request.read()
+        await self._delay("discord.webhook")
+        if not self.webhook_limit:
+            return web.Response(status=204)
+        now = time.monotonic()
+        window = self._webhook_windows.setdefault(request.path, [now, 0])
+        if now - window[0] >= self.webhook_period:
+            window[:] = [now, 0]
+        reset_after = f"{window[0] + self.webhook_period - now:.3f}"
+        if window[1] >= self.webhook_limit:
+            self.calls["discord.webhook_429"] += 1
+            headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": reset_after}
+            return web.json_response({"retry_after": float(reset_after), "global": False}, status=429, headers=headers)
+        window[1] += 1
+        return web.Response(status=204, headers={
+            "X-RateLimit-Limit": str(self.webhook_limit),
+            "X-RateLimit-Remaining": str(self.webhook_limit - window[1]),
+            "X-RateLimit-Reset-After": reset_after,
+        })
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Starts the server and returns its base URL.
+        """
+        app = web.Application()
+        app.router.add_get("/cmc/v1/cryptocurrency/map", self.cmc_map)
+        app.router.add_get("/cmc/v2/cryptocurrency/quotes/latest", self.cmc_quotes)
+        app.router.add_get("/cmc/v2/cryptocurrency/info", self.cmc_info)
+        app.router.add_get("/cmc/v1/key/info", self.cmc_key_info)
+        app.router.add_get("/dex/search", self.dex_search)
+        app.router.add_get("/dex/tokens/{addresses}", self.dex_tokens)
+        app.router.add_post("/discord/api/v10/webhooks/{webhook_id}/{token}", self.discord_webhook)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start_in_thread(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Starts the server on an event loop of its own thread and returns its base
+        URL, so that a blocked or saturated caller loop does not delay the stub.
+        """
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, name="upstream-stub", daemon=True).start()
+        self._thread_loop = loop
+        return asyncio.run_coroutine_threadsafe(self.start(host, port), loop).result()
+
+    def stop_in_thread(self):
+        loop, self._thread_loop = self._thread_loop, None
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(self.stop(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
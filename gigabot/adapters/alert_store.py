@@ -0,0 +1,63 @@
+# file: gigabot/adapters/alert_store.py
+
+from typing import Iterable, List
+
+from gigabot.adapters.models.price_alert import PriceAlert
+from gigabot.adapters.sqlite_store import SqliteStore
+
+
+class AlertStore(SqliteStore):
+    """
+    Durable store of the registered price alerts.
+    """
+
+    COLUMNS = "id, symbol, token_address, direction, threshold, webhook_url, guild_id, user_id"
+
+    def _create_schema(self):
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS alerts ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, symbol TEXT NOT NULL, "
+                "token_address TEXT NOT NULL, direction TEXT NOT NULL, threshold REAL NOT NULL, "
+                "webhook_url TEXT NOT NULL, guild_id INTEGER, user_id INTEGER)"
+            )
+
+    def add(self, alert: PriceAlert) -> PriceAlert:
+        """
+        Inserts an alert and sets its id.
+        """
+        with self._lock, self._connect() as connection:
+            cursor = connection.execute(
+                "INSERT INTO alerts (symbol, token_address, direction, threshold, webhook_url, guild_id, user_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    alert.symbol,
+                    alert.token_address,
+                    alert.direction,
+                    alert.threshold,
+                    alert.webhook_url,
+                    alert.guild_id,
+                    alert.user_id,
+                ),
+            )
+            alert.id = cursor.lastrowid
+        return alert
+
+    def delete_many(self, alert_ids: Iterable[int]) -> int:
+        """
+        Deletes alerts.
+
+        Returns:
+            int: The number of alerts deleted.
+        """
+        alert_ids = [(alert_id,) for alert_id in alert_ids]
+        if not alert_ids:
+            return 0
+        with self._lock, self._connect() as connection:
+            cursor = connection.executemany("DELETE FROM alerts WHERE id = ?", alert_ids)
+            return cursor.rowcount
+
+    def list(self) -> List[PriceAlert]:
+        with self._connect() as connection:
+            rows = connection.execute(f"SELECT {self.COLUMNS} FROM alerts ORDER BY id").fetchall()
+        return [PriceAlert(*row) for row in rows]
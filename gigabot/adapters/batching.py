@@ -0,0 +1,240 @@
+# file: gigabot/adapters/batching.py
+
+import asyncio
+from logging import getLogger
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, Set, TypeVar
+
+from gigabot.adapters.coinmarketcap_adapter import CoinMarketCapAdapter
+from gigabot.adapters.dex_screener_adapter import DexScreenerAdapter
+from gigabot.adapters.models.crypto_quote import CryptocurrencyQuote
+from gigabot.adapters.models.dex_screener_models import Pair
+from gigabot.adapters.request_context import RequestContext, current_context, request_context
+
+logger = getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class MicroBatcher(Generic[K, V]):
+    """
+    Collects individual lookups arriving within a short window and resolves them
+    with a single batched upstream call.
+
+    Every key requested while a batch is open is added to it; the batch is sent
+    when the window elapses or when it reaches ``max_batch_size`` keys, and each
+    caller receives the value for its own key. Callers asking for a key already in
+    the open batch share its result.
+
+    The batched call runs with the highest priority and the latest deadline among
+    the waiting callers, and is attributed to a guild only if every caller came
+    from that guild.
+    """
+
+    def __init__(
+        self,
+        fetch_batch: Callable[[List[K]], Awaitable[Optional[Dict[K, V]]]],
+        window: float = 0.005,
+        max_batch_size: int = 100,
+    ):
+        """
+        Args:
+            fetch_batch (Callable): Coroutine function fetching a list of keys and
+                returning a dict of the values found, or None on failure.
+            window (float): Seconds a batch stays open after its first key.
+            max_batch_size (int): Maximum number of keys sent in one call.
+        """
+        self.fetch_batch = fetch_batch
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[K, asyncio.Future] = {}
+        self._contexts: List[RequestContext] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Batches being resolved, referenced so they are not collected mid-call.
+        self._resolving: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.keys = 0
+
+    async def load(self, key: K) -> Optional[V]:
+        """
+        Returns the value of a key, or None if the upstream did not return it.
+        """
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            self._contexts.append(current_context())
+            if len(self._pending) >= self.max_batch_size:
+                self.flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self.flush)
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: List[K]) -> Dict[K, V]:
+        """
+        Returns the values of several keys, omitting the ones not found.
+        """
+        values = await asyncio.gather(*(self.load(key) for key in keys))
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def flush(self):
+        """
+        Sends the open batch immediately.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        contexts, self._contexts = self._contexts, []
+        task = asyncio.ensure_future(self._resolve(batch, contexts))
+        self._resolving.add(task)
+        task.add_done_callback(self._resolving.discard)
+
+    async def _resolve(self, batch: Dict[K, asyncio.Future], contexts: List[RequestContext]):
+        self.batches += 1
+        self.keys += len(batch)
+        guild_ids = {context.guild_id for context in contexts}
+        deadlines = [context.deadline for context in contexts]
+        try:
+            with request_context(
+                priority=min(context.priority for context in contexts),
+                guild_id=guild_ids.pop() if len(guild_ids) == 1 else None,
+                deadline=None if None in deadlines else max(deadlines),
+            ):
+                values = await self.fetch_batch(list(batch)) or {}
+        except Exception as e:
+            logger.error(f"Batched fetch of {len(batch)} keys failed: {e}")
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except BaseException:
+            # Cancelled (e.g. on shutdown): the callers must not wait forever.
+            for future in batch.values():
+                future.cancel()
+            raise
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(values.get(key))
+
+
+class QuoteBatcher(MicroBatcher[int, CryptocurrencyQuote]):
+    """
+    Micro-batcher packing single-coin quote lookups into ``get_quotes`` calls.
+    """
+
+    # CoinMarketCap accepts up to 100 ids per quotes/latest request on most plans.
+    MAX_IDS = 100
+
+    def __init__(self, adapter: CoinMarketCapAdapter, window: float = 0.005):
+        super().__init__(adapter.get_quotes_async, window=window, max_batch_size=self.MAX_IDS)
+
+
+class DexScreenerBatcher:
+    """
+    Packs individual DexScreener token and pair lookups into multi-address requests.
+
+    Lookups are collected in micro-batches of at most ``MAX_ADDRESSES`` addresses
+    (the API limit per request) and the pairs of each response are handed back to
+    the caller that asked for them: token lookups by ``baseToken.address`` and pair
+    lookups by ``pairAddress``. Pair lookups are batched per chain, since the pairs
+    endpoint is scoped to one chain.
+    """
+
+    MAX_ADDRESSES = 30
+
+    def __init__(self, adapter: DexScreenerAdapter, window: float = 0.005):
+        """
+        Args:
+            adapter (DexScreenerAdapter): Adapter used to send the batched requests.
+            window (float): Seconds lookups are collected before being sent.
+        """
+        self.adapter = adapter
+        self.window = window
+        self._tokens: MicroBatcher[str, List[Pair]] = MicroBatcher(
+            self._fetch_tokens, window=window, max_batch_size=self.MAX_ADDRESSES
+        )
+        self._pairs: Dict[str, MicroBatcher[str, Pair]] = {}
+
+    @staticmethod
+    def _key(address: str) -> str:
+        """
+        Returns the key an address is matched on. EVM addresses (``0x`` + hex)
+        are case-insensitive and may come back checksummed, so they are
+        lowercased; other addresses, such as Solana base58 ones, are
+        case-sensitive and kept as they are.
+        """
+        return address.lower() if address[:2].lower() == "0x" else address
+
+    async def get_token_pairs(self, token_address: str) -> List[Pair]:
+        """
+        Returns every pair whose base token is ``token_address``.
+        """
+        return await self._tokens.load(token_address) or []
+
+    async def get_tokens(self, token_addresses: Iterable[str]) -> Dict[str, List[Pair]]:
+        """
+        Returns the pairs of several tokens, keyed by the requested addresses.
+        """
+        token_addresses = list(dict.fromkeys(token_addresses))
+        pairs = await self._tokens.load_many(token_addresses)
+        return {address: pairs.get(address, []) for address in token_addresses}
+
+    async def get_pair(self, chain_id: str, pair_address: str) -> Optional[Pair]:
+        """
+        Returns a single pair, or None if DexScreener did not return it.
+        """
+        return await self._pair_batcher(chain_id).load(pair_address)
+
+    async def get_pairs(self, chain_id: str, pair_addresses: Iterable[str]) -> Dict[str, Pair]:
+        """
+        Returns several pairs of a chain, keyed by the requested addresses.
+        """
+        pair_addresses = list(dict.fromkeys(pair_addresses))
+        return await self._pair_batcher(chain_id).load_many(pair_addresses)
+
+    def _pair_batcher(self, chain_id: str) -> MicroBatcher[str, Pair]:
+        batcher = self._pairs.get(chain_id)
+        if batcher is None:
+            batcher = MicroBatcher(
+                lambda addresses: self._fetch_pairs(chain_id, addresses),
+                window=self.window,
+                max_batch_size=self.MAX_ADDRESSES,
+            )
+            self._pairs[chain_id] = batcher
+        return batcher
+
+    # Batches are keyed by the addresses the callers asked for, which are sent
+    # upstream as they are; only the matching of the response uses ``_key``.
+
+    async def _fetch_tokens(self, addresses: List[str]) -> Optional[Dict[str, List[Pair]]]:
+        response = await self.adapter.get_tokens_async(",".join(addresses))
+        if response is None:
+            return None
+        by_token: Dict[str, List[Pair]] = {}
+        for pair in response.pairs:
+            by_token.setdefault(self._key(pair.baseToken.address), []).append(pair)
+        return {address: by_token[self._key(address)] for address in addresses if self._key(address) in by_token}
+
+    async def _fetch_pairs(self, chain_id: str, addresses: List[str]) -> Optional[Dict[str, Pair]]:
+        response = await self.adapter.get_pairs_async(chain_id, ",".join(addresses))
+        if response is None:
+            return None
+        by_address = {self._key(pair.pairAddress): pair for pair in response.pairs}
+        return {address: by_address[self._key(address)] for address in addresses if self._key(address) in by_address}
+
+
+_dex_screener_batcher: Optional[DexScreenerBatcher] = None
+
+
+def get_dex_screener_batcher() -> DexScreenerBatcher:
+    """
+    Returns the process-wide DexScreener batcher.
+    """
+    global _dex_screener_batcher
+    if _dex_screener_batcher is None:
+        _dex_screener_batcher = DexScreenerBatcher(DexScreenerAdapter())
+    return _dex_screener_batcher
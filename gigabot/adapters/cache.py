@@ -0,0 +1,424 @@
+# file: gigabot/adapters/cache.py
+
+import asyncio
+import time
+from collections import OrderedDict
+from logging import getLogger
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Iterable, Optional, Tuple, TypeVar
+
+from gigabot.adapters.batching import QuoteBatcher
+from gigabot.adapters.coinmarketcap_adapter import CoinMarketCapAdapter
+from gigabot.adapters.errors import CreditBudgetExceeded, UpstreamTimeout, UpstreamUnavailable
+from gigabot.adapters.models.coin_info import CoinInfo
+from gigabot.adapters.models.crypto_quote import CryptocurrencyQuote
+from gigabot.adapters.utils import parse_timestamp
+from gigabot.bot.config import Config
+from gigabot.observability.metrics import REGISTRY
+
+logger = getLogger(__name__)
+
+V = TypeVar("V")
+
+# Errors on which the last known value is served instead: the credit budget shed
+# the call, CoinMarketCap failed or timed out, or its circuit breaker is open.
+STALE_IF_ERROR = (CreditBudgetExceeded, UpstreamTimeout, UpstreamUnavailable)
+
+
+class TTLCache(Generic[V]):
+    """
+    In-memory cache with a per-entry time to live and LRU eviction.
+
+    Entries expire ``ttl`` seconds after they were stored (unless stored with an
+    explicit TTL) and the least recently used entry is evicted once ``max_size``
+    entries are held. Expired entries are kept until evicted or overwritten, so
+    they can still be served with ``get_stale`` when the upstream is unavailable.
+    """
+
+    def __init__(self, ttl: float, max_size: int, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            ttl (float): Default time to live of an entry, in seconds.
+            max_size (int): Maximum number of entries held.
+            clock (Callable): Monotonic clock used to expire entries.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """
+        Returns the value of a live entry, or None if it is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def get_stale(self, key: Hashable) -> Optional[V]:
+        """
+        Returns the value of an entry even if it has expired.
+        """
+        entry = self._entries.get(key)
+        return None if entry is None else entry[1]
+
+    def is_expired(self, key: Hashable) -> bool:
+        """
+        Tells whether the entry of a key is held but no longer live.
+        """
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] <= self.clock()
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None):
+        """
+        Stores a value, evicting the least recently used entries if needed.
+        """
+        self._entries[key] = (self.clock() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into a single upstream call.
+
+    The first caller for a key starts the call; every caller arriving while it is
+    in flight awaits the same result instead of starting its own.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[V]]) -> Tuple[V, bool]:
+        """
+        Runs ``factory()`` unless a call for ``key`` is already in flight.
+
+        Returns:
+            tuple: The result and whether it was shared with an in-flight call.
+        """
+        task = self._in_flight.get(key)
+        shared = task is not None
+        if not shared:
+            task = asyncio.ensure_future(factory())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # Shielded so one caller giving up does not cancel the call for the others.
+        return await asyncio.shield(task), shared
+
+
+class CoinInfoCache:
+    """
+    Long-lived cache of parsed CoinMarketCap metadata, keyed by coin id.
+
+    Coin metadata (logos, urls, descriptions, tags) changes very rarely, so it is
+    kept for ``ttl`` seconds and only re-fetched on a miss. Only parsed ``CoinInfo``
+    objects are cached, never raw response dicts, so cached values are never
+    shared with code that could mutate them. An expired entry is served when it
+    cannot be re-fetched (see ``STALE_IF_ERROR``).
+    """
+
+    # Maximum number of ids sent in one /v2/cryptocurrency/info request.
+    BATCH_SIZE = 100
+
+    def __init__(self, adapter: CoinMarketCapAdapter, ttl: float, max_size: int):
+        """
+        Args:
+            adapter (CoinMarketCapAdapter): Adapter used to fetch missing entries.
+            ttl (float): Time to live of an entry, in seconds.
+            max_size (int): Maximum number of coins held.
+        """
+        self.adapter = adapter
+        self._cache: TTLCache[CoinInfo] = TTLCache(ttl, max_size)
+        self.hits = 0
+        self.misses = 0
+        self.stale_served = 0
+
+    def put(self, coin_id: int, coin_info: CoinInfo):
+        """
+        Stores the metadata of a coin.
+
+        Raises:
+            TypeError: If ``coin_info`` is not a parsed CoinInfo object.
+        """
+        if not isinstance(coin_info, CoinInfo):
+            raise TypeError(f"Expected CoinInfo, got {type(coin_info).__name__}")
+        self._cache.set(coin_id, coin_info)
+
+    async def get(self, coin_id: int) -> Optional[CoinInfo]:
+        """
+        Returns the metadata of a coin, fetching it on a miss.
+
+        Returns:
+            CoinInfo: The metadata of the coin, or None if it could not be fetched.
+        """
+        coin_info = self._cache.get(coin_id)
+        if coin_info is not None:
+            self.hits += 1
+            return coin_info
+
+        self.misses += 1
+        try:
+            coin_info = await self.adapter.get_coin_info_async(coin_id)
+        except STALE_IF_ERROR:
+            coin_info = self._cache.get_stale(coin_id)
+            if coin_info is None:
+                raise
+            self.stale_served += 1
+            return coin_info
+        if coin_info is not None:
+            self.put(coin_id, coin_info)
+        return coin_info
+
+    async def warm(self, coin_ids: Iterable[int]) -> Dict[int, CoinInfo]:
+        """
+        Loads the metadata of every coin not cached yet, in batched requests.
+
+        Coins that could not be re-fetched are returned from their expired entry, if any.
+
+        Args:
+            coin_ids (Iterable[int]): The ids to warm up.
+
+        Returns:
+            dict: The metadata of every requested coin that is now cached.
+        """
+        coin_ids = list(dict.fromkeys(coin_ids))
+        missing = [coin_id for coin_id in coin_ids if self._cache.get(coin_id) is None]
+        self.hits += len(coin_ids) - len(missing)
+        self.misses += len(missing)
+
+        for start in range(0, len(missing), self.BATCH_SIZE):
+            batch = missing[start:start + self.BATCH_SIZE]
+            try:
+                coins = await self.adapter.get_coin_infos_async(batch)
+            except STALE_IF_ERROR as e:
+                logger.warning(f"Skipped warming up coin info for {len(batch)} ids: {e}")
+                continue
+            if coins is None:
+                logger.error(f"Failed to warm up coin info for ids {batch}")
+                continue
+            for coin_id, coin_info in coins.items():
+                self.put(coin_id, coin_info)
+
+        cached = {}
+        for coin_id in coin_ids:
+            coin_info = self._cache.get(coin_id)
+            if coin_info is None:
+                coin_info = self._cache.get_stale(coin_id)
+                if coin_info is not None:
+                    self.stale_served += 1
+            if coin_info is not None:
+                cached[coin_id] = coin_info
+        return cached
+
+
+class QuoteCache:
+    """
+    Short-lived cache of CoinMarketCap quotes with request coalescing.
+
+    CoinMarketCap refreshes quotes about once a minute, so a quote is kept until
+    its ``last_updated`` timestamp is ``refresh_interval`` seconds old (bounded by
+    ``min_ttl`` and ``max_ttl``). Concurrent misses for the same coin share a
+    single upstream call, and misses for different coins arriving within the
+    batching window are fetched together in one ``get_quotes`` request. When the
+    request is shed or fails (see ``STALE_IF_ERROR``), the last known quote is
+    served instead and ``is_stale`` tells it apart.
+    """
+
+    def __init__(
+        self,
+        adapter: CoinMarketCapAdapter,
+        refresh_interval: float,
+        min_ttl: float = 5,
+        max_ttl: float = 60,
+        max_size: int = 4096,
+        batch_window: float = 0.005,
+    ):
+        """
+        Args:
+            adapter (CoinMarketCapAdapter): Adapter used to fetch missing quotes.
+            refresh_interval (float): Seconds between two upstream quote updates.
+            min_ttl (float): Lower bound of a quote's time to live, in seconds.
+            max_ttl (float): Upper bound of a quote's time to live, in seconds.
+            max_size (int): Maximum number of quotes held.
+            batch_window (float): Seconds misses are collected before being fetched.
+        """
+        self.adapter = adapter
+        self.batcher = QuoteBatcher(adapter, window=batch_window)
+        self.refresh_interval = refresh_interval
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self._cache: TTLCache[CryptocurrencyQuote] = TTLCache(max_ttl, max_size)
+        self._single_flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.stale_served = 0
+
+    def ttl_for(self, quote: CryptocurrencyQuote) -> float:
+        """
+        Returns how long a quote stays fresh, based on its ``last_updated`` time.
+        """
+        last_updated = parse_timestamp(quote.quote.USD.last_updated)
+        if last_updated is None:
+            return self.min_ttl
+        age = time.time() - last_updated
+        return min(self.max_ttl, max(self.min_ttl, self.refresh_interval - age))
+
+    def put(self, coin_id: int, quote: CryptocurrencyQuote):
+        self._cache.set(coin_id, quote, ttl=self.ttl_for(quote))
+
+    async def get(self, coin_id: int) -> Optional[CryptocurrencyQuote]:
+        """
+        Returns the quote of a coin, fetching it on a miss.
+
+        Returns:
+            CryptocurrencyQuote: The quote, or None if it could not be fetched.
+        """
+        quote = self._cache.get(coin_id)
+        if quote is not None:
+            self.hits += 1
+            return quote
+
+        quote, shared = await self._single_flight.do(coin_id, lambda: self._load(coin_id))
+        if shared:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+        return quote
+
+    async def get_many(self, coin_ids: Iterable[int]) -> Dict[int, CryptocurrencyQuote]:
+        """
+        Returns the quotes of several coins; misses are fetched in batched requests.
+
+        Coins whose quote could not be fetched nor served stale are omitted.
+        """
+        coin_ids = list(dict.fromkeys(coin_ids))
+        quotes = await asyncio.gather(*(self.get(coin_id) for coin_id in coin_ids), return_exceptions=True)
+        found = {}
+        for coin_id, quote in zip(coin_ids, quotes):
+            if isinstance(quote, STALE_IF_ERROR):
+                logger.warning(f"Skipped quote of coin {coin_id}: {quote}")
+            elif isinstance(quote, BaseException):
+                raise quote
+            elif quote is not None:
+                found[coin_id] = quote
+        return found
+
+    async def _load(self, coin_id: int) -> Optional[CryptocurrencyQuote]:
+        try:
+            quote = await self.batcher.load(coin_id)
+        except STALE_IF_ERROR:
+            quote = self._cache.get_stale(coin_id)
+            if quote is None:
+                raise
+            self.stale_served += 1
+            return quote
+        if quote is not None:
+            self.put(coin_id, quote)
+        return quote
+
+    def is_stale(self, coin_id: int) -> bool:
+        """
+        Tells whether the quote held for a coin is past its time to live, i.e.
+        whether it was served as the last known quote.
+        """
+        return self._cache.is_expired(coin_id)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the hit, miss, coalesced and stale counters of the cache.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "stale_served": self.stale_served,
+            "size": len(self._cache),
+        }
+
+
+_coin_info_cache: Optional[CoinInfoCache] = None
+_quote_cache: Optional[QuoteCache] = None
+
+
+def get_coin_info_cache() -> CoinInfoCache:
+    """
+    Returns the process-wide coin info cache.
+    """
+    global _coin_info_cache
+    if _coin_info_cache is None:
+        config = Config()
+        _coin_info_cache = CoinInfoCache(
+            CoinMarketCapAdapter(), config.COIN_INFO_CACHE_TTL, config.COIN_INFO_CACHE_SIZE
+        )
+    return _coin_info_cache
+
+
+def get_quote_cache() -> QuoteCache:
+    """
+    Returns the process-wide quote cache.
+    """
+    global _quote_cache
+    if _quote_cache is None:
+        config = Config()
+        _quote_cache = QuoteCache(
+            CoinMarketCapAdapter(),
+            config.QUOTE_REFRESH_INTERVAL,
+            max_ttl=config.QUOTE_CACHE_MAX_TTL,
+            batch_window=config.QUOTE_BATCH_WINDOW_MS / 1000,
+        )
+    return _quote_cache
+
+
+def _cache_stats():
+    if _coin_info_cache is not None:
+        yield "coin_info", _coin_info_cache
+    if _quote_cache is not None:
+        yield "quote", _quote_cache
+
+
+REGISTRY.callback(
+    "gigabot_cache_requests",
+    "Cache lookups, by cache and result.",
+    ("cache", "result"),
+    lambda: [
+        ((name, result), getattr(cache, result))
+        for name, cache in _cache_stats()
+        for result in ("hits", "misses", "coalesced", "stale_served")
+        if hasattr(cache, result)
+    ],
+    type="counter",
+)
+REGISTRY.callback(
+    "gigabot_cache_hit_ratio",
+    "Share of cache lookups served from memory since startup.",
+    ("cache",),
+    lambda: [
+        ((name,), cache.hits / (cache.hits + cache.misses))
+        for name, cache in _cache_stats()
+        if cache.hits + cache.misses
+    ],
+)
+REGISTRY.callback(
+    "gigabot_cache_entries",
+    "Entries currently held, by cache.",
+    ("cache",),
+    lambda: [((name,), len(cache._cache)) for name, cache in _cache_stats()],
+)
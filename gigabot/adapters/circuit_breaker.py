@@ -0,0 +1,214 @@
+# file: gigabot/adapters/circuit_breaker.py
+
+import asyncio
+import time
+from collections import deque
+from logging import getLogger
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+from gigabot.adapters.errors import CircuitOpen, DeadlineExceeded
+from gigabot.bot.config import Config
+from gigabot.observability.metrics import REGISTRY
+
+logger = getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+# Value of each state in the state gauge.
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+CIRCUIT_STATE = REGISTRY.gauge(
+    "gigabot_circuit_breaker_state",
+    "State of each upstream circuit breaker: 0 closed, 1 half open, 2 open.",
+    ("breaker",),
+)
+CIRCUIT_REJECTED = REGISTRY.counter(
+    "gigabot_circuit_breaker_rejected",
+    "Upstream calls failed fast by an open circuit breaker.",
+    ("breaker",),
+)
+
+
+class CircuitBreaker:
+    """
+    Fails calls to an upstream endpoint fast while it is failing or slow.
+
+    The outcome of every call made in the last ``window`` seconds is kept; a call
+    fails if it raises, if ``is_failure`` says so (e.g. a 5xx response) or if it
+    takes longer than ``slow_call_threshold``. Once at least ``min_calls`` calls
+    were made in the window and ``failure_rate`` of them failed, the breaker opens
+    and every call is rejected with ``CircuitOpen`` for ``open_seconds``. It then
+    lets a single probe call through: the breaker closes if it succeeds and opens
+    again if it fails.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        min_calls: int = 5,
+        window: float = 60,
+        open_seconds: float = 30,
+        slow_call_threshold: float = 5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            name (str): Name of the breaker in logs and metrics.
+            failure_rate (float): Share of failed calls in the window opening the breaker.
+            min_calls (int): Calls needed in the window before the breaker may open.
+            window (float): Seconds the outcome of a call is remembered.
+            open_seconds (float): Seconds calls are rejected before a probe is let through.
+            slow_call_threshold (float): Seconds after which a call counts as failed.
+            clock (Callable): Monotonic clock.
+        """
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+        self.slow_call_threshold = slow_call_threshold
+        self.clock = clock
+        self.state = CLOSED
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._state_gauge = CIRCUIT_STATE.labels(name)
+        self._rejected = CIRCUIT_REJECTED.labels(name)
+        self._state_gauge.set(_STATE_VALUES[CLOSED])
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN and self.clock() - self._opened_at < self.open_seconds
+
+    def check(self):
+        """
+        Raises ``CircuitOpen`` if a call would be rejected right now, without
+        taking the probe slot. Lets callers skip work done before the call.
+        """
+        if self.is_open or (self.state == HALF_OPEN and self._probing):
+            self._reject()
+
+    async def call(
+        self,
+        factory: Callable[[], Awaitable[T]],
+        is_failure: Optional[Callable[[T], bool]] = None,
+    ) -> T:
+        """
+        Runs ``factory()`` unless the breaker is open, and records its outcome.
+
+        Args:
+            factory (Callable): Returns the awaitable making the upstream call.
+            is_failure (Callable): Tells whether a returned result is a failure.
+
+        Returns:
+            Any: The result of the call.
+
+        Raises:
+            CircuitOpen: If the breaker rejected the call.
+        """
+        self._admit()
+        started = self.clock()
+        try:
+            result = await factory()
+        except (asyncio.CancelledError, DeadlineExceeded):
+            # The caller gave up; that says nothing about the upstream.
+            self._probing = False
+            raise
+        except Exception:
+            self._record(True)
+            raise
+        self._record(
+            self.clock() - started > self.slow_call_threshold
+            or (is_failure is not None and is_failure(result))
+        )
+        return result
+
+    def _admit(self):
+        if self.state == OPEN:
+            if self.is_open:
+                self._reject()
+            self._set_state(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probing:
+                self._reject()
+            self._probing = True
+
+    def _reject(self):
+        self._rejected.inc()
+        raise CircuitOpen(f"{self.name} is failing, try again in a moment")
+
+    def _record(self, failed: bool):
+        if self.state == HALF_OPEN:
+            self._probing = False
+            if failed:
+                self._open()
+            else:
+                self._outcomes.clear()
+                self._failures = 0
+                self._set_state(CLOSED)
+            return
+        if self.state == OPEN:
+            # A call admitted before the breaker opened.
+            return
+
+        now = self.clock()
+        self._outcomes.append((now, failed))
+        self._failures += failed
+        while self._outcomes and self._outcomes[0][0] <= now - self.window:
+            _, expired = self._outcomes.popleft()
+            self._failures -= expired
+
+        calls = len(self._outcomes)
+        if failed and calls >= self.min_calls and self._failures >= self.failure_rate * calls:
+            self._open()
+
+    def _open(self):
+        self._opened_at = self.clock()
+        self._set_state(OPEN)
+
+    def _set_state(self, state: str):
+        if state == self.state:
+            return
+        log = logger.warning if state == OPEN else logger.info
+        log(f"Circuit breaker {self.name} is now {state.replace('_', ' ')}")
+        self.state = state
+        self._state_gauge.set(_STATE_VALUES[state])
+
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """
+    Returns the process-wide breaker of an upstream endpoint, creating it on first use.
+
+    Args:
+        name (str): Name of the endpoint, e.g. ``"coinmarketcap:/v2/cryptocurrency/info"``.
+    """
+    breaker = _circuit_breakers.get(name)
+    if breaker is None:
+        config = Config()
+        breaker = CircuitBreaker(
+            name,
+            failure_rate=config.CIRCUIT_BREAKER_FAILURE_RATE,
+            min_calls=config.CIRCUIT_BREAKER_MIN_CALLS,
+            window=config.CIRCUIT_BREAKER_WINDOW,
+            open_seconds=config.CIRCUIT_BREAKER_OPEN_SECONDS,
+            slow_call_threshold=config.CIRCUIT_BREAKER_SLOW_CALL_MS / 1000,
+        )
+        _circuit_breakers[name] = breaker
+    return breaker
+
+
+def is_upstream_failure(response) -> bool:
+    """
+    Tells whether an HTTP response means the upstream is failing: a server error
+    or a rate limit, as opposed to a bad request.
+    """
+    return response.status >= 500 or response.status == 429
@@ -0,0 +1,253 @@
+# file: gigabot/adapters/cmc_id_index.py
+
+import asyncio
+import threading
+import time
+from logging import getLogger
+from typing import Dict, Iterable, Optional, Tuple
+
+from gigabot.adapters.coinmarketcap_adapter import CoinMarketCapAdapter
+from gigabot.adapters.models.coin_map import CoinMapEntry
+from gigabot.adapters.sqlite_store import SqliteStore
+from gigabot.bot.config import Config
+
+logger = getLogger(__name__)
+
+
+class CoinMarketCapIdIndex(SqliteStore):
+    """
+    Local, persistent index of CoinMarketCap ids.
+
+    The index is keyed both by ``(symbol, lowercased token address)`` and by id, and
+    is kept fully in memory for O(1) lookups. It is backed by an SQLite file so a
+    restart does not need to download the whole CoinMarketCap map again, and it is
+    refreshed from paged ``/v1/cryptocurrency/map`` responses in the background.
+
+    The file is only created and read on first use. Without a path, the index
+    lives in memory only and is downloaded again after every restart.
+    """
+
+    PAGE_SIZE = 5000
+    # Rows re-read before the last known end of the map on incremental refreshes,
+    # so entries shifted by delistings are not skipped.
+    PAGE_OVERLAP = 200
+    FULL_REFRESH_INTERVAL = 7 * 24 * 3600
+
+    def __init__(self, path: Optional[str], adapter: Optional[CoinMarketCapAdapter] = None):
+        """
+        Initializes the index, without touching its file yet.
+
+        Args:
+            path (str): Path of the SQLite file backing the index, or None to keep
+                the index in memory only.
+            adapter (CoinMarketCapAdapter): Adapter used to download the map.
+        """
+        self.path = path
+        self.adapter = adapter or CoinMarketCapAdapter()
+        self._by_key: Dict[Tuple[str, str], int] = {}
+        self._by_id: Dict[int, CoinMapEntry] = {}
+        self._meta: Dict[str, str] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._opened = False
+        self._open_lock = threading.Lock()
+
+    @staticmethod
+    def key(symbol: str, token_address: Optional[str]) -> Tuple[str, str]:
+        return symbol.upper(), (token_address or "").lower()
+
+    def __len__(self) -> int:
+        self._open()
+        return len(self._by_id)
+
+    def lookup(self, symbol: str, token_address: Optional[str]) -> Optional[int]:
+        """
+        Returns the CoinMarketCap id of a token, without any network call.
+
+        Args:
+            symbol (str): The token symbol.
+            token_address (str): The token contract address.
+
+        Returns:
+            int: The CoinMarketCap id, or None if the token is not indexed.
+        """
+        self._open()
+        return self._by_key.get(self.key(symbol, token_address))
+
+    def get(self, coin_id: int) -> Optional[CoinMapEntry]:
+        """
+        Returns the indexed entry of a CoinMarketCap id.
+        """
+        self._open()
+        return self._by_id.get(coin_id)
+
+    def add(self, entries: Iterable[CoinMapEntry]):
+        """
+        Inserts or updates entries, both in memory and on disk.
+        """
+        entries = list(entries)
+        if not entries:
+            return
+        self._open()
+        if self.path is None:
+            for entry in entries:
+                self._index(entry)
+            return
+        with self._lock:
+            with self._connect() as connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO coins "
+                    "(id, symbol, name, slug, token_address, platform, is_active) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (e.id, e.symbol, e.name, e.slug, e.token_address, e.platform, e.is_active)
+                        for e in entries
+                    ],
+                )
+            for entry in entries:
+                self._index(entry)
+
+    def remember(self, symbol: str, token_address: str, coin_id: int):
+        """
+        Stores an id resolved outside of the bulk load (e.g. by ``map_to_id``).
+        """
+        self._open()
+        if coin_id in self._by_id:
+            self._by_key[self.key(symbol, token_address)] = coin_id
+            return
+        self.add([CoinMapEntry(
+            id=coin_id,
+            symbol=symbol.upper(),
+            name=symbol,
+            slug="",
+            token_address=token_address.lower(),
+            platform=None,
+            is_active=1,
+        )])
+
+    def load(self):
+        """
+        Loads every stored entry into memory.
+        """
+        if self.path is None:
+            return
+        with self._lock, self._connect() as connection:
+            rows = connection.execute(
+                "SELECT id, symbol, name, slug, token_address, platform, is_active FROM coins"
+            ).fetchall()
+        for row in rows:
+            self._index(CoinMapEntry(*row))
+        logger.info(f"Loaded {len(rows)} CoinMarketCap ids from {self.path}")
+
+    async def refresh(self, full: bool = False):
+        """
+        Downloads the CoinMarketCap map page by page and upserts it.
+
+        An incremental refresh only re-reads the tail of the map, which is where
+        new listings appear since the map is sorted by id. A full refresh re-reads
+        every page.
+
+        Args:
+            full (bool): Whether to re-read the whole map.
+        """
+        total = int(self._get_meta("map_size") or 0)
+        full = full or total == 0 or self._full_refresh_due()
+        start = 1 if full else max(1, total - self.PAGE_OVERLAP)
+
+        fetched = 0
+        while True:
+            page = await self.adapter.list_map_async(start, self.PAGE_SIZE)
+            if page is None:
+                logger.error(f"Stopped CoinMarketCap map refresh at offset {start}")
+                return
+            await asyncio.to_thread(self.add, page)
+            fetched += len(page)
+            if len(page) < self.PAGE_SIZE:
+                break
+            start += self.PAGE_SIZE
+
+        self._set_meta("map_size", str(start + len(page) - 1))
+        if full:
+            self._set_meta("last_full_refresh", str(int(time.time())))
+        logger.info(f"Refreshed {fetched} CoinMarketCap ids ({'full' if full else 'incremental'})")
+
+    async def run_refresh_loop(self, interval: float):
+        """
+        Refreshes the index forever, every ``interval`` seconds.
+        """
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Failed to refresh CoinMarketCap id index: {e}")
+            await asyncio.sleep(interval)
+
+    def start_background_refresh(self, interval: float):
+        """
+        Starts the refresh loop on the running event loop, unless already running.
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(
+                self.run_refresh_loop(interval)
+            )
+
+    def _open(self):
+        """
+        Creates the index file and loads it into memory, the first time it is needed.
+        """
+        if self._opened:
+            return
+        with self._open_lock:
+            if self._opened:
+                return
+            if self.path is not None:
+                super().__init__(self.path)
+                self.load()
+            self._opened = True
+
+    def _index(self, entry: CoinMapEntry):
+        self._by_id[entry.id] = entry
+        self._by_key[self.key(entry.symbol, entry.token_address)] = entry.id
+
+    def _full_refresh_due(self) -> bool:
+        last_full_refresh = int(self._get_meta("last_full_refresh") or 0)
+        return time.time() - last_full_refresh > self.FULL_REFRESH_INTERVAL
+
+    def _create_schema(self):
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS coins ("
+                "id INTEGER PRIMARY KEY, symbol TEXT NOT NULL, name TEXT, slug TEXT, "
+                "token_address TEXT NOT NULL, platform TEXT, is_active INTEGER)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        self._open()
+        if self.path is None:
+            return self._meta.get(key)
+        with self._connect() as connection:
+            row = connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self._open()
+        if self.path is None:
+            self._meta[key] = value
+            return
+        with self._connect() as connection:
+            connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+_index: Optional[CoinMarketCapIdIndex] = None
+
+
+def get_id_index() -> CoinMarketCapIdIndex:
+    """
+    Returns the process-wide id index. Its file is only read on first lookup.
+    """
+    global _index
+    if _index is None:
+        _index = CoinMarketCapIdIndex(Config().CMC_ID_INDEX_PATH)
+    return _index
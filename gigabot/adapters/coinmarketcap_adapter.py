@@ -1,10 +1,22 @@
-import requests
+import asyncio
+import math
+import aiohttp
 from gigabot.bot.config import Config
-from gigabot.adapters.errors import SymbolAddressMismatch
+from gigabot.adapters.circuit_breaker import get_circuit_breaker, is_upstream_failure
+from gigabot.adapters.credit_budget import get_credit_budget
+from gigabot.adapters.errors import DecodeError, SymbolAddressMismatch, UpstreamTimeout, UpstreamUnavailable
+from gigabot.adapters.http_client import HttpResponse, get_client
+from gigabot.adapters.models.coin_info import CoinInfo
+from gigabot.adapters.models.coin_map import CoinMapEntry
 from gigabot.adapters.models.crypto_quote import CryptocurrencyQuote
-from gigabot.adapters.utils import create_cryptocurrency_quote, create_coin_info
+from gigabot.adapters.utils import create_cryptocurrency_quote, create_coin_info, create_coin_map_entry
+from gigabot.observability.metrics import timed
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from logging import getLogger
 
+# requests is only imported by the blocking methods that use it, so that the async
+# paths and the gigabot-task entrypoint do not pay for importing it.
+
 logger = getLogger(__name__)
 
 class CoinMarketCapAdapter:
@@ -13,8 +25,25 @@ class CoinMarketCapAdapter:
 
     This class abstracts the API endpoints of CoinMarketCap and provides methods
     to fetch cryptocurrency prices and other data in a simplified manner.
+
+    Every endpoint is available both as a blocking method (used by the cron scripts)
+    and as an ``*_async`` coroutine that goes through the shared keep-alive
+    connection pool and never blocks the event loop. Async calls also go through
+    the process-wide credit budget and the circuit breaker of their endpoint, so
+    that a degraded endpoint fails fast instead of holding every caller.
     """
 
+    # Seconds a request may take; listing the whole id map takes longer.
+    TIMEOUT = 10
+    LIST_MAP_TIMEOUT = 60
+
+    # Number of rows (or ids) one credit pays for, per endpoint.
+    ROWS_PER_CREDIT = {
+        "/v1/cryptocurrency/map": 5000,
+        "/v2/cryptocurrency/quotes/latest": 100,
+        "/v2/cryptocurrency/info": 100,
+    }
+
 
     def __init__(self):
         """
@@ -27,8 +56,17 @@ class CoinMarketCapAdapter:
             'Accepts': 'application/json',
             'X-CMC_PRO_API_KEY': self.api_key,
         }
+        self.http = get_client(
+            "coinmarketcap",
+            self.BASE_URL,
+            headers=self.headers,
+            limit_per_host=config.HTTP_LIMIT_PER_HOST,
+            timeout=self.TIMEOUT,
+        )
+        self.budget = get_credit_budget()
 
     # Create a function for fetching the CoinMarketCap ID for a given token address    
+    @timed("coinmarketcap")
     def map_to_id(self, token_address: str, symbol: str) -> int:
         """
         Fetches the CoinMarketCap ID for the specified token address.
@@ -44,37 +82,58 @@ class CoinMarketCapAdapter:
         
         """
         
+        import requests
         url = f"{self.BASE_URL}/v1/cryptocurrency/map"
-        parameters = {
-            'start': 1,
-            'limit': 100,
-            'sort': 'id',
-            'symbol': symbol
-        }
-        
-        response = requests.get(url, headers=self.headers, params=parameters)
+        response = requests.get(url, headers=self.headers, params=self._map_parameters(symbol), timeout=self.TIMEOUT)
         data = response.json()
         
-        print(f"Executing map_to_id for token_address: {token_address} and Symbol: {symbol}")
+        logger.debug(f"Executing map_to_id for token_address: {token_address} and Symbol: {symbol}")
         
-        if response.status_code == 200:
-            try:
-                for token in data['data']:
-                    tkn:str = token['platform']['token_address']
-                    if tkn.lower() == token_address.lower():
-                        return token['id']
-                
-                raise SymbolAddressMismatch('Token Address does not match with any symbol.')
-            except KeyError:
-                logger.error("Error: Cryptocurrency symbol not found or API structure changed.")
-                return None
-            except SymbolAddressMismatch as e:
-                logger.error(e)
-                return None
-        else:
-            logger.error(f"Error fetching data: {data.get('status', {}).get('error_message', 'Unknown error')}")
-            return None
+        return self._parse_map(response.status_code, data, token_address)
+
+    @timed("coinmarketcap")
+    async def map_to_id_async(self, token_address: str, symbol: str) -> int:
+        """
+        Non-blocking version of ``map_to_id``.
+        """
+        status, data = await self._get_async("/v1/cryptocurrency/map", self._map_parameters(symbol), rows=100)
+
+        logger.info(f"Executing map_to_id for token_address: {token_address} and Symbol: {symbol}")
+
+        return self._parse_map(status, data, token_address)
+
+    @timed("coinmarketcap")
+    def list_map(self, start: int, limit: int) -> List[CoinMapEntry]:
+        """
+        Fetches one page of the CoinMarketCap id map, sorted by id.
+
+        Args:
+            start (int): 1-based offset of the first row of the page.
+            limit (int): Maximum number of rows in the page (up to 5000).
+
+        Returns:
+            list: The entries of the page, or None if the request failed.
+        """
+        import requests
+        url = f"{self.BASE_URL}/v1/cryptocurrency/map"
+        response = requests.get(url, headers=self.headers, params=self._list_map_parameters(start, limit), timeout=self.LIST_MAP_TIMEOUT)
+        return self._parse_map_page(response.status_code, response.json())
 
+    @timed("coinmarketcap")
+    async def list_map_async(self, start: int, limit: int) -> List[CoinMapEntry]:
+        """
+        Non-blocking version of ``list_map``.
+        """
+        status, data = await self._get_async(
+            "/v1/cryptocurrency/map",
+            self._list_map_parameters(start, limit),
+            rows=limit,
+            endpoint="/v1/cryptocurrency/map?listing",
+            timeout=self.LIST_MAP_TIMEOUT,
+        )
+        return self._parse_map_page(status, data)
+
+    @timed("coinmarketcap")
     def get_quote(self, id: int, symbol: str) -> CryptocurrencyQuote:
         """
         Fetches the current quote of the specified cryptocurrency ID.
@@ -90,44 +149,288 @@ class CoinMarketCapAdapter:
             QuoteNotFound: If the symbol was not found for the specified ID.
 
         """
+        import requests
         url = f"{self.BASE_URL}/v2/cryptocurrency/quotes/latest"
         parameters = {
             'id': id
         }
-        response = requests.get(url, headers=self.headers, params=parameters, timeout=60)
-        data = response.json()
-        if response.status_code == 200:
-            try:
-                tokens = data['data'][f'{id}']
+        response = requests.get(url, headers=self.headers, params=parameters, timeout=self.TIMEOUT)
+        return self._parse_quote(response.status_code, response.json(), id)
 
-                return create_cryptocurrency_quote(tokens)
-            except KeyError:
-                logger.error("Error: Cryptocurrency symbol not found or API structure changed.")
-                return None
-        else:
-            logger.error(f"Error fetching data: {data.get('status', {}).get('error_message', 'Unknown error')}")
-            return None
+    @timed("coinmarketcap")
+    async def get_quote_async(self, id: int, symbol: str) -> CryptocurrencyQuote:
+        """
+        Non-blocking version of ``get_quote``.
+        """
+        status, data = await self._get_async("/v2/cryptocurrency/quotes/latest", {'id': id})
+        return self._parse_quote(status, data, id)
+
+    @timed("coinmarketcap")
+    def get_quotes(self, ids: Iterable[int]) -> Dict[int, CryptocurrencyQuote]:
+        """
+        Fetches the current quotes of several cryptocurrencies in a single request.
+
+        Args:
+            ids (Iterable[int]): The cryptocurrency IDs to fetch the quotes for.
 
+        Returns:
+            dict: Maps each id found to its quote, or None if the request failed.
+        """
+        import requests
+        url = f"{self.BASE_URL}/v2/cryptocurrency/quotes/latest"
+        parameters = {
+            'id': self._join_ids(ids)
+        }
+        response = requests.get(url, headers=self.headers, params=parameters, timeout=self.TIMEOUT)
+        return self._parse_quotes(response.status_code, response.json())
+
+    @timed("coinmarketcap")
+    async def get_quotes_async(self, ids: Iterable[int]) -> Dict[int, CryptocurrencyQuote]:
+        """
+        Non-blocking version of ``get_quotes``.
+        """
+        ids = list(ids)
+        status, data = await self._get_async("/v2/cryptocurrency/quotes/latest", {'id': self._join_ids(ids)}, rows=len(ids))
+        return self._parse_quotes(status, data)
+
+    @timed("coinmarketcap")
     def get_coin_info(self, coin_id: int):
         """
-            Class docstring
+        Fetches the metadata (logo, urls, description, tags...) of a cryptocurrency.
+
+        Args:
+            coin_id (int): The CoinMarketCap ID of the cryptocurrency.
+
+        Returns:
+            CoinInfo: The metadata of the cryptocurrency or None if not found.
         """
+        import requests
         url = f"{self.BASE_URL}/v2/cryptocurrency/info"
         parameters = {
             'id': coin_id
         }
 
-        response = requests.get(url, headers=self.headers, params=parameters, timeout=60)
+        response = requests.get(url, headers=self.headers, params=parameters, timeout=self.TIMEOUT)
+        return self._parse_coin_info(response.status_code, response.json(), coin_id)
+
+    @timed("coinmarketcap")
+    async def get_coin_info_async(self, coin_id: int):
+        """
+        Non-blocking version of ``get_coin_info``.
+        """
+        status, data = await self._get_async("/v2/cryptocurrency/info", {'id': coin_id})
+        return self._parse_coin_info(status, data, coin_id)
+
+    @timed("coinmarketcap")
+    def get_coin_infos(self, coin_ids: Iterable[int]) -> Dict[int, CoinInfo]:
+        """
+        Fetches the metadata of several cryptocurrencies in a single request.
+
+        Args:
+            coin_ids (Iterable[int]): The CoinMarketCap IDs of the cryptocurrencies.
+
+        Returns:
+            dict: Maps each id found to its CoinInfo, or None if the request failed.
+        """
+        import requests
+        url = f"{self.BASE_URL}/v2/cryptocurrency/info"
+        parameters = {
+            'id': self._join_ids(coin_ids)
+        }
+
+        response = requests.get(url, headers=self.headers, params=parameters, timeout=self.TIMEOUT)
+        return self._parse_coin_infos(response.status_code, response.json())
+
+    @timed("coinmarketcap")
+    async def get_coin_infos_async(self, coin_ids: Iterable[int]) -> Dict[int, CoinInfo]:
+        """
+        Non-blocking version of ``get_coin_infos``.
+        """
+        coin_ids = list(coin_ids)
+        status, data = await self._get_async("/v2/cryptocurrency/info", {'id': self._join_ids(coin_ids)}, rows=len(coin_ids))
+        return self._parse_coin_infos(status, data)
+
+    async def sync_credit_usage(self):
+        """
+        Aligns the credit budget with the usage CoinMarketCap reports for the API key.
+
+        The /v1/key/info endpoint does not consume credits.
+        """
+        response = await self.http.get("/v1/key/info")
         data = response.json()
+        if response.status != 200:
+            logger.error(f"Error fetching key info: {data.get('status', {}).get('error_message', 'Unknown error')}")
+            return
+        usage = data['data']['usage']
+        self.budget.sync_usage(
+            usage['current_day']['credits_used'],
+            usage['current_month']['credits_used'],
+        )
 
-        if response.status_code == 200:
+    async def _get_async(
+        self,
+        path: str,
+        params: dict,
+        rows: int = 1,
+        endpoint: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, Any]:
+        """
+        Performs a GET request through the circuit breaker of its endpoint and the
+        credit budget.
+
+        Args:
+            path (str): The endpoint path.
+            params (dict): Query string parameters.
+            rows (int): Number of rows or ids requested, used to estimate the cost.
+            endpoint (str): Name of the circuit breaker, defaults to the path.
+            timeout (float): Timeout of each attempt in seconds, defaults to ``TIMEOUT``.
+                Attempts are also bounded by the deadline of the request context.
+
+        Returns:
+            tuple: The HTTP status code and the decoded JSON body.
+
+        Raises:
+            CircuitOpen: If the endpoint is failing and the call was rejected.
+            CreditBudgetExceeded: If the budget does not allow the call.
+            UpstreamTimeout: If CoinMarketCap did not answer in time.
+            UpstreamUnavailable: If the request could not be completed or the body is
+                not valid JSON.
+        """
+        breaker = get_circuit_breaker(f"coinmarketcap:{endpoint or path}")
+        # Rejected calls do not spend credits.
+        breaker.check()
+        cost = max(1, math.ceil(rows / self.ROWS_PER_CREDIT.get(path, 1)))
+        await self.budget.acquire(cost)
+
+        async def fetch() -> Tuple[HttpResponse, Any]:
+            response = await self.http.get(path, params=params, timeout=timeout)
+            try:
+                data = response.json()
+            except ValueError as e:
+                # An error page or an empty body, typically along with a 5xx.
+                raise UpstreamUnavailable(
+                    f"CoinMarketCap answered {response.status} with an invalid body: {e}"
+                ) from e
+            return response, data
+
+        try:
+            response, data = await breaker.call(fetch, lambda result: is_upstream_failure(result[0]))
+        except asyncio.TimeoutError:
+            raise UpstreamTimeout("CoinMarketCap did not answer in time")
+        except aiohttp.ClientError as e:
+            raise UpstreamUnavailable(f"CoinMarketCap is unavailable: {e}")
+        status = data.get('status') if isinstance(data, dict) else None
+        self.budget.record(cost, (status or {}).get('credit_count'))
+        return response.status, data
+
+    @staticmethod
+    def _join_ids(ids: Iterable[int]) -> str:
+        return ",".join(str(id) for id in ids)
+
+    @staticmethod
+    def _map_parameters(symbol: str) -> dict:
+        return {
+            'start': 1,
+            'limit': 100,
+            'sort': 'id',
+            'symbol': symbol
+        }
+
+    @staticmethod
+    def _list_map_parameters(start: int, limit: int) -> dict:
+        return {
+            'start': start,
+            'limit': limit,
+            'sort': 'id',
+        }
+
+    @staticmethod
+    def _parse_map_page(status_code: int, data: dict):
+        if status_code == 200:
+            entries = []
+            for token in data.get('data') or []:
+                try:
+                    entries.append(create_coin_map_entry(token))
+                except KeyError as e:
+                    logger.error(f"Failed to parse map entry: {token} due to {e}")
+            return entries
+        else:
+            logger.error(f"Error fetching data: {data.get('status', {}).get('error_message', 'Unknown error')}")
+            return None
+
+    @staticmethod
+    def _parse_map(status_code: int, data: dict, token_address: str):
+        if status_code == 200:
+            try:
+                for token in data['data']:
+                    tkn:str = token['platform']['token_address']
+                    if tkn.lower() == token_address.lower():
+                        return token['id']
+                
+                raise SymbolAddressMismatch('Token Address does not match with any symbol.')
+            except KeyError:
+                logger.error("Error: Cryptocurrency symbol not found or API structure changed.")
+                return None
+            except SymbolAddressMismatch as e:
+                logger.error(e)
+                return None
+        else:
+            logger.error(f"Error fetching data: {data.get('status', {}).get('error_message', 'Unknown error')}")
+            return None
+
+    @staticmethod
+    def _parse_quote(status_code: int, data: dict, id: int):
+        if status_code == 200:
+            try:
+                tokens = data['data'][f'{id}']
+
+                return create_cryptocurrency_quote(tokens)
+            except (KeyError, DecodeError):
+                logger.error("Error: Cryptocurrency symbol not found or API structure changed.")
+                return None
+        else:
+            logger.error(f"Error fetching data: {data.get('status', {}).get('error_message', 'Unknown error')}")
+            return None
+
+    @staticmethod
+    def _parse_quotes(status_code: int, data: dict):
+        if status_code == 200:
+            quotes = {}
+            for token in (data.get('data') or {}).values():
+                try:
+                    quotes[token['id']] = create_cryptocurrency_quote(token)
+                except (KeyError, TypeError, DecodeError) as e:
+                    logger.error(f"Failed to parse quote: {e}")
+            return quotes
+        else:
+            logger.error(f"Error fetching data: {data.get('status', {}).get('error_message', 'Unknown error')}")
+            return None
+
+    @staticmethod
+    def _parse_coin_info(status_code: int, data: dict, coin_id: int):
+        if status_code == 200:
             try:
                 coin = data['data'][f'{coin_id}']
 
                 return create_coin_info(coin)
-            except KeyError as e:
+            except (KeyError, DecodeError) as e:
                 logger.error(e)
                 return None
         else:
             logger.error("Error fetching data: %s", data.get('status', {}).get('error_message', 'Unknown error'))
-            return None
\ No newline at end of file
+            return None
+
+    @staticmethod
+    def _parse_coin_infos(status_code: int, data: dict):
+        if status_code == 200:
+            coins = {}
+            for coin in (data.get('data') or {}).values():
+                try:
+                    coins[coin['id']] = create_coin_info(coin)
+                except (KeyError, TypeError, DecodeError) as e:
+                    logger.error(f"Failed to parse coin info: {e}")
+            return coins
+        else:
+            logger.error("Error fetching data: %s", data.get('status', {}).get('error_message', 'Unknown error'))
+            return None
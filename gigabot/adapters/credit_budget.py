@@ -0,0 +1,273 @@
+# file: gigabot/adapters/credit_budget.py
+
+import asyncio
+import heapq
+import itertools
+import time
+from datetime import datetime, timezone
+from logging import getLogger
+from typing import Callable, Dict, List, Optional, Tuple
+
+from gigabot.adapters.errors import CreditBudgetExceeded
+from gigabot.adapters.request_context import Priority, bound_timeout, current_context
+from gigabot.bot.config import Config
+from gigabot.observability.metrics import REGISTRY
+
+logger = getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at ``capacity`` tokens per ``period`` seconds.
+    """
+
+    def __init__(self, capacity: float, period: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.clock = clock
+        self.tokens = capacity
+        self._updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self, amount: float) -> bool:
+        self._refill()
+        if self.tokens < amount:
+            return False
+        self.tokens -= amount
+        return True
+
+    def take(self, amount: float):
+        """
+        Takes tokens unconditionally; the bucket may go negative.
+        """
+        self._refill()
+        self.tokens -= amount
+
+    def give(self, amount: float):
+        """
+        Returns tokens taken for work that was not done, up to the capacity.
+        """
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def seconds_until(self, amount: float) -> float:
+        self._refill()
+        return max(0.0, (amount - self.tokens) / self.rate)
+
+
+class CreditBudget:
+    """
+    Central CoinMarketCap credit budget every CMC call goes through.
+
+    Spending is paced by a per-minute token bucket. Callers waiting for credits are
+    served by priority, so interactive commands always go before scheduled posts
+    and background refreshes. Daily and monthly usage is tracked from the
+    ``status.credit_count`` of every response; when the remaining quota runs low,
+    lower priorities are shed first (``RESERVES``). Interactive calls made for a
+    guild are also limited to that guild's fair share of the per-minute budget.
+    """
+
+    # Fraction of the daily and monthly quota that must remain for a priority to spend.
+    RESERVES = {
+        Priority.INTERACTIVE: 0.0,
+        Priority.SCHEDULED: 0.05,
+        Priority.BACKGROUND: 0.2,
+    }
+    # Seconds a caller may wait for per-minute credits before being shed.
+    MAX_WAIT = {
+        Priority.INTERACTIVE: 2.0,
+        Priority.SCHEDULED: 30.0,
+        Priority.BACKGROUND: 60.0,
+    }
+
+    def __init__(
+        self,
+        per_minute: int,
+        per_day: int,
+        per_month: int,
+        guild_share: float = 0.25,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            per_minute (int): Credits the plan allows per minute.
+            per_day (int): Credits the plan allows per UTC day.
+            per_month (int): Credits the plan allows per UTC month.
+            guild_share (float): Fraction of the per-minute credits one guild may use.
+            clock (Callable): Monotonic clock used by the token buckets.
+        """
+        self.per_minute = per_minute
+        self.per_day = per_day
+        self.per_month = per_month
+        self.guild_share = guild_share
+        self.clock = clock
+        self._minute = TokenBucket(per_minute, 60, clock)
+        self._guilds: Dict[int, TokenBucket] = {}
+        self._waiters: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._day, self._month = self._periods()
+        self.used_today = 0
+        self.used_this_month = 0
+        self.shed = 0
+
+    @staticmethod
+    def _periods() -> Tuple[str, str]:
+        now = datetime.now(timezone.utc)
+        return now.strftime("%Y-%m-%d"), now.strftime("%Y-%m")
+
+    def _roll_periods(self):
+        day, month = self._periods()
+        if day != self._day:
+            self._day, self.used_today = day, 0
+        if month != self._month:
+            self._month, self.used_this_month = month, 0
+
+    def _check_quota(self, cost: float, priority: Priority):
+        self._roll_periods()
+        reserve = self.RESERVES[priority]
+        if self.used_today + cost > self.per_day * (1 - reserve):
+            raise CreditBudgetExceeded(f"Daily CoinMarketCap credits exhausted for {priority.name.lower()} work")
+        if self.used_this_month + cost > self.per_month * (1 - reserve):
+            raise CreditBudgetExceeded(f"Monthly CoinMarketCap credits exhausted for {priority.name.lower()} work")
+
+    def _check_guild(self, cost: float, guild_id: Optional[int]) -> Optional[TokenBucket]:
+        if guild_id is None:
+            return None
+        bucket = self._guilds.get(guild_id)
+        if bucket is None:
+            bucket = TokenBucket(max(1.0, self.per_minute * self.guild_share), 60, self.clock)
+            self._guilds[guild_id] = bucket
+        if not bucket.try_take(cost):
+            raise CreditBudgetExceeded("This server is sending too many price requests, try again in a minute")
+        return bucket
+
+    async def acquire(self, cost: float = 1, priority: Optional[Priority] = None, guild_id: Optional[int] = None):
+        """
+        Waits until ``cost`` credits may be spent.
+
+        Priority and guild default to the ones of the current request context. A
+        caller is not kept waiting past the deadline of its request.
+
+        Raises:
+            CreditBudgetExceeded: If the call is shed, or costs more than the
+                per-minute budget and could never be served.
+        """
+        context = current_context()
+        priority = context.priority if priority is None else priority
+        guild_id = context.guild_id if guild_id is None else guild_id
+
+        guild_bucket = None
+        try:
+            if cost > self._minute.capacity:
+                raise CreditBudgetExceeded(
+                    f"This call needs {cost} CoinMarketCap credits, more than the {self.per_minute} allowed per minute"
+                )
+            self._check_quota(cost, priority)
+            if priority == Priority.INTERACTIVE:
+                guild_bucket = self._check_guild(cost, guild_id)
+        except CreditBudgetExceeded:
+            self.shed += 1
+            raise
+
+        if not self._waiters and self._minute.try_take(cost):
+            self._spend(cost)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), cost, future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+        try:
+            await asyncio.wait_for(future, bound_timeout(self.MAX_WAIT[priority]))
+        except asyncio.TimeoutError:
+            # Nothing was spent: give the guild its share back.
+            if guild_bucket is not None:
+                guild_bucket.give(cost)
+            self.shed += 1
+            raise CreditBudgetExceeded("CoinMarketCap rate limit reached, try again shortly")
+        except asyncio.CancelledError:
+            if guild_bucket is not None and future.cancelled():
+                guild_bucket.give(cost)
+            raise
+
+    async def _dispatch(self):
+        while self._waiters:
+            priority, _, cost, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._minute.try_take(cost):
+                heapq.heappop(self._waiters)
+                self._spend(cost)
+                future.set_result(None)
+                continue
+            await asyncio.sleep(self._minute.seconds_until(cost))
+
+    def _spend(self, cost: float):
+        self._roll_periods()
+        self.used_today += cost
+        self.used_this_month += cost
+
+    def record(self, estimated: float, actual: Optional[float]):
+        """
+        Corrects the usage with the ``credit_count`` reported by the response.
+        """
+        if actual is None or actual == estimated:
+            return
+        difference = actual - estimated
+        if difference > 0:
+            self._minute.take(difference)
+        else:
+            self._minute.give(-difference)
+        self._spend(difference)
+
+    def sync_usage(self, used_today: int, used_this_month: int):
+        """
+        Replaces the tracked usage with the one reported by CoinMarketCap.
+        """
+        self._roll_periods()
+        self.used_today = used_today
+        self.used_this_month = used_this_month
+
+    def stats(self) -> Dict[str, float]:
+        self._roll_periods()
+        return {
+            "used_today": self.used_today,
+            "used_this_month": self.used_this_month,
+            "remaining_today": self.per_day - self.used_today,
+            "remaining_this_month": self.per_month - self.used_this_month,
+            "waiting": len(self._waiters),
+            "shed": self.shed,
+        }
+
+
+_credit_budget: Optional[CreditBudget] = None
+
+
+def get_credit_budget() -> CreditBudget:
+    """
+    Returns the process-wide CoinMarketCap credit budget.
+    """
+    global _credit_budget
+    if _credit_budget is None:
+        config = Config()
+        _credit_budget = CreditBudget(
+            config.CMC_CREDITS_PER_MINUTE,
+            config.CMC_CREDITS_PER_DAY,
+            config.CMC_CREDITS_PER_MONTH,
+            config.CMC_GUILD_SHARE,
+        )
+    return _credit_budget
+
+
+REGISTRY.callback(
+    "gigabot_cmc_credits",
+    "CoinMarketCap credit budget usage.",
+    ("stat",),
+    lambda: [] if _credit_budget is None else [((stat,), value) for stat, value in _credit_budget.stats().items()],
+)
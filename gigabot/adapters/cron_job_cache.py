@@ -0,0 +1,147 @@
+# file: gigabot/adapters/cron_job_cache.py
+
+import asyncio
+import threading
+from logging import getLogger
+from typing import Dict, List, Optional
+
+from kubernetes import client, watch
+from kubernetes.client.rest import ApiException
+
+from gigabot.adapters.kubernetes_adapter import KubernetesAdapter
+
+logger = getLogger(__name__)
+
+
+class CronJobCache:
+    """
+    In-memory copy of the CronJobs of one namespace, kept current by a watch.
+
+    Like a client-go informer, a background thread lists the CronJobs once, then
+    follows the watch from that resource version and applies every event on the
+    event loop. The list is taken again when the watch expires or fails. Until
+    the first list completes, reads fall back to the API server.
+
+    Writes made by the bot are applied locally as soon as the API accepts them,
+    so a command sees its own changes before the watch event arrives.
+    """
+
+    WATCH_TIMEOUT = 300
+    RETRY_DELAY = 5
+
+    def __init__(self, namespace: str, adapter: Optional[KubernetesAdapter] = None):
+        """
+        Args:
+            namespace (str): Namespace whose CronJobs are cached.
+            adapter (KubernetesAdapter): Adapter used for the fallback reads.
+        """
+        self.namespace = namespace
+        self.adapter = adapter or KubernetesAdapter()
+        self._jobs: Dict[str, client.V1CronJob] = {}
+        self._synced = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def synced(self) -> bool:
+        return self._synced
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def put(self, cron_job: client.V1CronJob):
+        self._jobs[cron_job.metadata.name] = cron_job
+
+    def discard(self, name: str):
+        self._jobs.pop(name, None)
+
+    async def list_cron_jobs(self) -> List[client.V1CronJob]:
+        """
+        Returns the CronJobs of the namespace, sorted by name.
+        """
+        if not self._synced:
+            return await self.adapter.list_cron_jobs_async(self.namespace)
+        return sorted(self._jobs.values(), key=lambda cron_job: cron_job.metadata.name)
+
+    async def exists(self, name: str) -> bool:
+        if not self._synced:
+            cron_jobs = await self.adapter.list_cron_jobs_async(self.namespace)
+            return any(cron_job.metadata.name == name for cron_job in cron_jobs)
+        return name in self._jobs
+
+    def _replace(self, cron_jobs: List[client.V1CronJob]):
+        self._jobs = {cron_job.metadata.name: cron_job for cron_job in cron_jobs}
+        self._synced = True
+
+    def _apply(self, event_type: str, cron_job: client.V1CronJob):
+        if event_type == "DELETED":
+            self.discard(cron_job.metadata.name)
+        elif event_type in ("ADDED", "MODIFIED"):
+            self.put(cron_job)
+
+    def _call_in_loop(self, callback, *args):
+        self._loop.call_soon_threadsafe(callback, *args)
+
+    def _list_and_watch(self):
+        batch_v1 = self.adapter.batch_v1
+        response = batch_v1.list_namespaced_cron_job(self.namespace)
+        resource_version = response.metadata.resource_version
+        self._call_in_loop(self._replace, response.items)
+        logger.info(f"Cached {len(response.items)} CronJobs of namespace {self.namespace}")
+
+        while not self._stopped.is_set():
+            stream = watch.Watch().stream(
+                batch_v1.list_namespaced_cron_job,
+                self.namespace,
+                resource_version=resource_version,
+                timeout_seconds=self.WATCH_TIMEOUT,
+            )
+            for event in stream:
+                if event["type"] == "ERROR":
+                    # Typically 410 Gone: the resource version is too old to resume from.
+                    raise ApiException(status=event["raw_object"].get("code"), reason="watch error")
+                cron_job = event["object"]
+                resource_version = cron_job.metadata.resource_version
+                if event["type"] != "BOOKMARK":
+                    self._call_in_loop(self._apply, event["type"], cron_job)
+                if self._stopped.is_set():
+                    return
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self._list_and_watch()
+            except Exception as e:
+                logger.warning(f"CronJob watch of namespace {self.namespace} failed, listing again: {e}")
+                self._stopped.wait(self.RETRY_DELAY)
+
+    def start(self):
+        """
+        Starts the watch thread for the running event loop, unless already running.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"cronjob-watch-{self.namespace}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+
+_cron_job_caches: Dict[str, CronJobCache] = {}
+
+
+def get_cron_job_cache(namespace: str) -> CronJobCache:
+    """
+    Returns the process-wide CronJob cache of a namespace.
+    """
+    cache = _cron_job_caches.get(namespace)
+    if cache is None:
+        cache = CronJobCache(namespace)
+        _cron_job_caches[namespace] = cache
+    return cache
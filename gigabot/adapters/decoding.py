@@ -0,0 +1,143 @@
+# file: gigabot/adapters/decoding.py
+
+import dataclasses
+import json
+from typing import Any, Callable, Dict, List, Optional, Type, TypeVar, Union, get_args, get_origin
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the standard library decoder gives the same results.
+    orjson = None
+
+from gigabot.adapters.errors import DecodeError
+
+T = TypeVar("T")
+
+# Field metadata key holding the JSON key of a field, when it differs from its name.
+JSON_KEY = "json"
+
+_decoders: Dict[type, Callable[[Any], Any]] = {}
+
+
+def loads(body: Union[bytes, str]) -> Any:
+    """
+    Decodes a JSON document, with orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def decode(model: Type[T], data: Any) -> T:
+    """
+    Builds a model object from decoded JSON.
+
+    Raises:
+        DecodeError: If the data does not match the model's schema.
+    """
+    return decoder(model)(data)
+
+
+def decode_json(model: Type[T], body: Union[bytes, str]) -> T:
+    """
+    Decodes a raw JSON document straight into a model object.
+
+    Raises:
+        DecodeError: If the body is not valid JSON or does not match the schema.
+    """
+    try:
+        data = loads(body)
+    except ValueError as e:
+        raise DecodeError(f"Invalid JSON: {e}") from e
+    return decode(model, data)
+
+
+def decoder(model: Type[T]) -> Callable[[Any], T]:
+    """
+    Returns the decoder of a dataclass, compiling it on first use.
+
+    The decoder is generated from the dataclass fields, like ``dataclasses``
+    generates ``__init__``: every field becomes one dict lookup passed positionally
+    to the constructor, nested dataclasses (and lists of them) are decoded by their
+    own decoder, and keys the model does not declare are never read, so new
+    upstream fields are ignored. Fields without a default are required unless
+    their type is Optional; a missing optional field decodes to None.
+    """
+    compiled = _decoders.get(model)
+    if compiled is None:
+        compiled = _compile(model)
+    return compiled
+
+
+def _is_optional(annotation: Any) -> bool:
+    return get_origin(annotation) is Union and type(None) in get_args(annotation)
+
+
+def _strip_optional(annotation: Any) -> Any:
+    if _is_optional(annotation):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _compile(model: type) -> Callable[[Any], Any]:
+    if not dataclasses.is_dataclass(model):
+        raise TypeError(f"{model.__name__} is not a dataclass")
+
+    namespace: Dict[str, Any] = {"Model": model, "_dict": dict, "DecodeError": DecodeError}
+    arguments: List[str] = []
+    for index, field in enumerate(dataclasses.fields(model)):
+        if not field.init:
+            continue
+        key = field.metadata.get(JSON_KEY, field.name)
+        required = False
+        if field.default is not dataclasses.MISSING:
+            namespace[f"default_{index}"] = field.default
+            lookup = f"data.get({key!r}, default_{index})"
+        elif field.default_factory is not dataclasses.MISSING:
+            namespace[f"factory_{index}"] = field.default_factory
+            lookup = f"(data[{key!r}] if {key!r} in data else factory_{index}())"
+        elif _is_optional(field.type):
+            lookup = f"data.get({key!r})"
+        else:
+            lookup = f"data[{key!r}]"
+            required = True
+
+        annotation = _strip_optional(field.type)
+        if dataclasses.is_dataclass(annotation):
+            # Nested decoders are compiled up front; models are not recursive.
+            namespace[f"decode_{index}"] = decoder(annotation)
+            template = "decode_{index}({value})"
+        elif (
+            get_origin(annotation) in (list, List)
+            and get_args(annotation)
+            and dataclasses.is_dataclass(get_args(annotation)[0])
+        ):
+            namespace[f"decode_{index}"] = decoder(get_args(annotation)[0])
+            template = "[decode_{index}(item) for item in {value}]"
+        else:
+            arguments.append(lookup)
+            continue
+        if required:
+            expression = template.format(index=index, value=lookup)
+        else:
+            value = f"value_{index}"
+            expression = f"(None if ({value} := {lookup}) is None else {template.format(index=index, value=value)})"
+        arguments.append(expression)
+
+    source = (
+        f"def decode_{model.__name__}(data):\n"
+        f"    if type(data) is not _dict:\n"
+        f"        raise DecodeError(f'{model.__name__}: expected an object, got {{type(data).__name__}}')\n"
+        f"    try:\n"
+        f"        return Model({', '.join(arguments)})\n"
+        f"    except KeyError as e:\n"
+        f"        raise DecodeError(f'{model.__name__}: missing field {{e}}') from None\n"
+        f"    except TypeError as e:\n"
+        f"        raise DecodeError(f'{model.__name__}: {{e}}') from None\n"
+    )
+    exec(source, namespace)
+    compiled = namespace[f"decode_{model.__name__}"]
+    _decoders[model] = compiled
+    return compiled
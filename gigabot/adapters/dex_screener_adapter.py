@@ -1,13 +1,21 @@
-import requests
+import asyncio
+import aiohttp
 from logging import getLogger
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Optional, Tuple
+from gigabot.adapters.circuit_breaker import get_circuit_breaker, is_upstream_failure
+from gigabot.adapters.decoding import decode
+from gigabot.adapters.errors import UpstreamTimeout, UpstreamUnavailable
+from gigabot.adapters.http_client import HttpResponse, get_client
+from gigabot.bot.config import Config
 from gigabot.adapters.models.dex_screener_models import (
     Pair,
     PairsResponse,
-    Social,
-    Token,
     Info,
-    Website,
 )
+from gigabot.observability.metrics import timed
+
+# requests is only imported by the blocking methods that use it, so that the async
+# paths and the gigabot-task entrypoint do not pay for importing it.
 
 logger = getLogger(__name__)
 
@@ -17,110 +25,263 @@ class DexScreenerAdapter:
     Adapter class to handle interactions with the DexScreener API.
     This class abstracts the API endpoints of DexScreener and provides methods
     to fetch cryptocurrency pairs and token data in a simplified manner.
+
+    Async calls go through the circuit breaker of their endpoint (``/pairs``,
+    ``/tokens`` or ``/search``). Requests DexScreener rejects (such as a 404)
+    return None, while upstream failures raise ``UpstreamTimeout`` or
+    ``UpstreamUnavailable`` (``CircuitOpen`` when the breaker is open), so that
+    callers can fall back to what they already know instead of reporting an
+    outage as a token that does not exist.
     """
 
     def __init__(self):
         """
         Initializes the adapter by setting up the base URL for the DexScreener API.
         """
-        self.BASE_URL = "https://api.dexscreener.com/latest/dex"
+        config = Config()
+        self.BASE_URL = config.DEXSCREENER_URL
+        self.http = get_client(
+            "dexscreener",
+            self.BASE_URL,
+            limit_per_host=config.HTTP_LIMIT_PER_HOST,
+            timeout=10,
+        )
 
+    @timed("dexscreener")
     def get_pairs(self, chain_id: str, pair_addresses: str):
         """
         Fetches one or multiple pairs by chain ID and pair addresses.
         """
+        import requests
         url = f"{self.BASE_URL}/pairs/{chain_id}/{pair_addresses}"
         try:
             response = requests.get(url, timeout=10)
             response.raise_for_status()
-            data = response.json()
-            pairs = []
-            for pair_data in data.get("pairs", []):
-                try:
-                    pairs.append(self.parse_pair(pair_data))
-                except Exception as e:
-                    logger.error(f"Failed to parse pair: {pair_data} due to {e}")
-            return PairsResponse(
-                schemaVersion=data.get("schemaVersion", "unknown"), pairs=pairs
-            )
+            return self.parse_pairs_response(response.json())
         except requests.RequestException as e:
             logger.error(f"Failed to fetch pairs: {e}")
             return None
 
+    @timed("dexscreener")
     def get_tokens(self, token_addresses: str):
         """
         Fetches one or multiple pairs by token addresses.
         """
+        import requests
         url = f"{self.BASE_URL}/tokens/{token_addresses}"
         try:
             response = requests.get(url, timeout=10)
             response.raise_for_status()
-            data = response.json()
-            pairs = []
-            for pair_data in data.get("pairs", []):
-                try:
-                    pairs.append(self.parse_pair(pair_data))
-                except Exception as e:
-                    logger.error(f"Failed to parse pair: {pair_data} due to {e}")
-            return PairsResponse(
-                schemaVersion=data.get("schemaVersion", "unknown"), pairs=pairs
-            )
+            return self.parse_pairs_response(response.json())
         except requests.RequestException as e:
             logger.error(f"Failed to fetch tokens: {e}")
             return None
 
+    @timed("dexscreener")
     def search_pairs(self, query: str):
         """
         Searches for pairs matching a query.
         """
+        import requests
         url = f"{self.BASE_URL}/search?q={query}"
         try:
             response = requests.get(url, timeout=10)
             response.raise_for_status()
-            data = response.json()
-            pairs = []
-            for pair_data in data.get("pairs", []):
-                try:
-                    pairs.append(self.parse_pair(pair_data))
-                except Exception as e:
-                    logger.error(f"Failed to parse pair: {pair_data} due to {e}")
-            return PairsResponse(
-                schemaVersion=data.get("schemaVersion", "unknown"), pairs=pairs
-            )
+            return self.parse_pairs_response(response.json())
         except requests.RequestException as e:
             logger.error(f"Failed to search for pairs: {e}")
             return None
 
+    @timed("dexscreener")
+    async def get_pairs_async(self, chain_id: str, pair_addresses: str):
+        """
+        Non-blocking version of ``get_pairs``.
+        """
+        return await self._fetch_pairs_async(
+            f"/pairs/{chain_id}/{pair_addresses}", None, "Failed to fetch pairs"
+        )
+
+    @timed("dexscreener")
+    async def get_tokens_async(self, token_addresses: str):
+        """
+        Non-blocking version of ``get_tokens``.
+        """
+        return await self._fetch_pairs_async(
+            f"/tokens/{token_addresses}", None, "Failed to fetch tokens"
+        )
+
+    @timed("dexscreener")
+    async def search_pairs_async(self, query: str):
+        """
+        Non-blocking version of ``search_pairs``.
+        """
+        return await self._fetch_pairs_async(
+            "/search", {"q": query}, "Failed to search for pairs"
+        )
+
+    async def iter_search_pairs_async(self, query: str) -> AsyncIterator[Pair]:
+        """
+        Searches for pairs matching a query, yielding each pair as it is decoded.
+
+        Callers that stop iterating early never pay for decoding the remaining pairs.
+        """
+        data = await self._fetch_json_async("/search", {"q": query}, "Failed to search for pairs")
+        for pair in self.iter_pairs(data):
+            yield pair
+
+    @timed("dexscreener")
+    async def find_pair_async(
+        self,
+        query: str,
+        dex_ids: Optional[Iterable[str]] = None,
+        chain_ids: Optional[Iterable[str]] = None,
+        base_symbol: Optional[str] = None,
+        rank_by_liquidity: bool = True,
+    ) -> Optional[Pair]:
+        """
+        Searches for pairs matching a query and returns the best one passing the filters.
+
+        Args:
+            query (str): The search query.
+            dex_ids (Iterable[str]): Accepted ``dexId`` values, any if None.
+            chain_ids (Iterable[str]): Accepted ``chainId`` values, any if None.
+            base_symbol (str): Required base token symbol (case-insensitive), any if None.
+            rank_by_liquidity (bool): Whether to return the most liquid match instead
+                of the first one.
+
+        Returns:
+            Pair: The selected pair, or None if no pair matched.
+
+        Raises:
+            UpstreamTimeout: If DexScreener did not answer in time.
+            UpstreamUnavailable: If DexScreener is failing.
+        """
+        data = await self._fetch_json_async("/search", {"q": query}, "Failed to search for pairs")
+        return self.select_pair(data, dex_ids, chain_ids, base_symbol, rank_by_liquidity)
+
+    def select_pair(
+        self,
+        data: Optional[Dict[str, Any]],
+        dex_ids: Optional[Iterable[str]] = None,
+        chain_ids: Optional[Iterable[str]] = None,
+        base_symbol: Optional[str] = None,
+        rank_by_liquidity: bool = True,
+    ) -> Optional[Pair]:
+        """
+        Selects a pair from a pairs/tokens/search payload without decoding the others.
+
+        The filters and the liquidity ranking are evaluated on the raw pair dicts,
+        so only the selected pair is turned into a Pair object. Without ranking,
+        the scan stops at the first match.
+        """
+        dex_ids = None if dex_ids is None else frozenset(dex_ids)
+        chain_ids = None if chain_ids is None else frozenset(chain_ids)
+        base_symbol = None if base_symbol is None else base_symbol.upper()
+
+        candidates = []
+        for pair_data in (data or {}).get("pairs") or []:
+            if dex_ids is not None and pair_data.get("dexId") not in dex_ids:
+                continue
+            if chain_ids is not None and pair_data.get("chainId") not in chain_ids:
+                continue
+            if base_symbol is not None and ((pair_data.get("baseToken") or {}).get("symbol") or "").upper() != base_symbol:
+                continue
+            if not rank_by_liquidity:
+                pair = self._try_parse_pair(pair_data)
+                if pair is not None:
+                    return pair
+                continue
+            candidates.append(pair_data)
+
+        # Most liquid first; the next candidate is used if one fails to decode.
+        candidates.sort(key=self._liquidity_usd, reverse=True)
+        for pair_data in candidates:
+            pair = self._try_parse_pair(pair_data)
+            if pair is not None:
+                return pair
+        return None
+
+    @staticmethod
+    def _liquidity_usd(pair_data: Dict[str, Any]) -> float:
+        return (pair_data.get("liquidity") or {}).get("usd") or 0
+
+    async def _fetch_json_async(self, path: str, params, error_message: str) -> Optional[Dict[str, Any]]:
+        """
+        Performs a GET request through the circuit breaker of its endpoint.
+
+        Returns:
+            dict: The decoded JSON body, or None if DexScreener rejected the request
+            (e.g. 404 for an unknown pair).
+
+        Raises:
+            CircuitOpen: If the endpoint is failing and the call was rejected.
+            UpstreamTimeout: If DexScreener did not answer in time.
+            UpstreamUnavailable: If the request could not be completed, DexScreener
+                answered with a server error or a rate limit, or the body is not valid JSON.
+        """
+        breaker = get_circuit_breaker(f"dexscreener:/{path.strip('/').split('/', 1)[0]}")
+
+        async def fetch() -> Tuple[HttpResponse, Any]:
+            response = await self.http.get(path, params=params)
+            if response.status >= 400:
+                return response, None
+            try:
+                return response, response.json()
+            except ValueError as e:
+                raise UpstreamUnavailable(f"{error_message}: invalid body: {e}") from e
+
+        try:
+            response, data = await breaker.call(fetch, lambda result: is_upstream_failure(result[0]))
+        except asyncio.TimeoutError:
+            raise UpstreamTimeout(f"{error_message}: DexScreener did not answer in time")
+        except aiohttp.ClientError as e:
+            raise UpstreamUnavailable(f"{error_message}: {e}")
+        if is_upstream_failure(response):
+            raise UpstreamUnavailable(f"{error_message}: HTTP {response.status}")
+        if response.status >= 400:
+            logger.error(f"{error_message}: HTTP {response.status}")
+            return None
+        return data
+
+    async def _fetch_pairs_async(self, path: str, params, error_message: str):
+        data = await self._fetch_json_async(path, params, error_message)
+        if data is None:
+            return None
+        return self.parse_pairs_response(data)
+
+    def parse_pairs_response(self, data):
+        """
+        Parses a pairs/tokens/search payload into a PairsResponse object.
+        """
+        return PairsResponse(
+            schemaVersion=data.get("schemaVersion", "unknown"), pairs=list(self.iter_pairs(data))
+        )
+
+    def iter_pairs(self, data: Optional[Dict[str, Any]]) -> Iterator[Pair]:
+        """
+        Decodes the pairs of a pairs/tokens/search payload one at a time, skipping
+        the ones that fail to decode.
+        """
+        for pair_data in (data or {}).get("pairs") or []:
+            pair = self._try_parse_pair(pair_data)
+            if pair is not None:
+                yield pair
+
+    def _try_parse_pair(self, pair_data) -> Optional[Pair]:
+        try:
+            return self.parse_pair(pair_data)
+        except Exception as e:
+            logger.error(f"Failed to parse pair: {pair_data} due to {e}")
+            return None
+
     def parse_pair(self, pair_data):
         """
         Parses pair data into a Pair object.
         """
-        return Pair(
-            chainId=pair_data["chainId"],
-            dexId=pair_data["dexId"],
-            url=pair_data["url"],
-            pairAddress=pair_data["pairAddress"],
-            baseToken=Token(**pair_data["baseToken"]),
-            quoteToken=Token(**pair_data["quoteToken"]),
-            priceNative=pair_data["priceNative"],
-            priceUsd=pair_data.get("priceUsd"),
-            txns=pair_data["txns"],
-            volume=pair_data["volume"],
-            priceChange=pair_data["priceChange"],
-            liquidity=pair_data.get("liquidity"),
-            fdv=pair_data.get("fdv"),
-            pairCreatedAt=pair_data.get("pairCreatedAt"),
-            info=self.parse_info(pair_data.get("info")),
-        )
+        return decode(Pair, pair_data)
 
     def parse_info(self, info_data):
         """
         Parses additional info data into an Info object.
         """
-        if not info_data:
-            return None
-        return Info(
-            imageUrl=info_data["imageUrl"],
-            websites=[Website(**website) for website in info_data.get("websites", [])],
-            socials=[Social(**social) for social in info_data.get("socials", [])],
-        )
+        return Info.from_dict(info_data)
@@ -1,7 +1,31 @@
-
+import asyncio
 
 class SymbolAddressMismatch(Exception):
     """ Token Address does not match with any symbol. """
 
 class QuoteNotFound(Exception): 
-    """ Quote for symbol was not found """
\ No newline at end of file
+    """ Quote for symbol was not found """
+
+class TokenNotFound(Exception):
+    """ No supported DEX pair was found for the symbol """
+
+class CoinInfoNotFound(Exception):
+    """ Metadata for the coin was not found """
+
+class UpstreamTimeout(Exception):
+    """ An upstream call did not complete before its deadline """
+
+class CreditBudgetExceeded(Exception):
+    """ The CoinMarketCap credit budget does not allow this call right now """
+
+class DecodeError(ValueError):
+    """ An upstream payload does not match the schema of its model """
+
+class UpstreamUnavailable(Exception):
+    """ An upstream call failed or the upstream answered with a server error """
+
+class CircuitOpen(UpstreamUnavailable):
+    """ Calls to a failing upstream endpoint are rejected until it recovers """
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """ The deadline of the request passed before an upstream call could complete """
@@ -0,0 +1,316 @@
+# file: gigabot/adapters/http_client.py
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from logging import getLogger
+from typing import Any, Dict, Mapping, Optional, Set
+
+import aiohttp
+
+from gigabot.adapters.decoding import loads
+from gigabot.adapters.errors import DeadlineExceeded
+from gigabot.adapters.request_context import bound_timeout, time_remaining
+from gigabot.observability.metrics import UPSTREAM_IN_FLIGHT, UPSTREAM_RESPONSES, UPSTREAM_RETRIES
+
+logger = getLogger(__name__)
+
+
+@dataclass
+class HttpResponse:
+    """
+    A fully read upstream response.
+
+    The body is kept as raw bytes so callers can decide how (and how much of it)
+    to decode.
+    """
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        """
+        Decodes the response body as JSON.
+
+        Returns:
+            Any: The decoded JSON document, or an empty dict for an empty body.
+        """
+        if not self.body:
+            return {}
+        return loads(self.body)
+
+    def retry_after(self) -> Optional[float]:
+        """
+        Returns the seconds the ``Retry-After`` header asks to wait, if any.
+        """
+        value = next((value for name, value in self.headers.items() if name.lower() == "retry-after"), None)
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+# Closes of replaced sessions, referenced so they are not collected.
+_closing: Set[asyncio.Future] = set()
+
+
+def discard_session(session: Optional[aiohttp.ClientSession], loop: Optional[asyncio.AbstractEventLoop], name: str):
+    """
+    Closes a session bound to another event loop before it is replaced.
+
+    Connections opened on a loop that is already closed can no longer be shut
+    down cleanly and are left to the garbage collector, so processes running
+    several loops should still close their sessions before each loop ends.
+
+    Args:
+        session (aiohttp.ClientSession): The session being replaced, if any.
+        loop (asyncio.AbstractEventLoop): The loop the session was created on.
+        name (str): Name of the session's upstream, used in logs.
+    """
+    if session is None or session.closed:
+        return
+    if loop is not None and loop.is_running():
+        # Still serving another thread: close it there.
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+        return
+    # The loop is stopped or closed: the close runs on the current loop,
+    # where the connector drops the connections of the old one.
+    task = asyncio.ensure_future(session.close())
+    _closing.add(task)
+    task.add_done_callback(lambda task: _close_done(task, name))
+
+
+def _close_done(task: asyncio.Future, name: str):
+    _closing.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Failed to close the previous {name} session: {task.exception()}")
+
+
+class HttpClient:
+    """
+    Keep-alive HTTP client for a single upstream API.
+
+    Wraps one lazily created ``aiohttp.ClientSession`` whose connector is shared by
+    every request to the upstream, so TCP and TLS connections are reused instead
+    of being re-established on every call.
+
+    Transient failures (429 and 5xx responses, connection errors and timeouts)
+    are retried with capped exponential backoff and full jitter, waiting at least
+    as long as ``Retry-After`` asks. Every attempt, and every wait, is bounded by
+    the deadline of the current request context: a retry that could not complete
+    before it is not made.
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    BACKOFF_BASE = 0.2
+    BACKOFF_MAX = 5
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        timeout: float = 10,
+        keepalive_timeout: float = 30,
+        name: Optional[str] = None,
+        max_attempts: int = 3,
+    ):
+        """
+        Initializes the client without opening any connection.
+
+        Args:
+            base_url (str): Base URL every request path is appended to.
+            headers (dict): Default headers sent with every request.
+            limit (int): Maximum number of open connections in the pool.
+            limit_per_host (int): Maximum number of open connections per host.
+            timeout (float): Default total timeout of a request, in seconds.
+            keepalive_timeout (float): Seconds an idle connection is kept open.
+            name (str): Name of the upstream in metrics, defaults to the base URL.
+            max_attempts (int): Attempts made per request, including the first one.
+        """
+        self.base_url = base_url
+        self.headers = dict(headers or {})
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.name = name or base_url
+        self.max_attempts = max_attempts
+        self._in_flight = UPSTREAM_IN_FLIGHT.labels(self.name)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Returns the pooled session, creating it on first use.
+
+        Sessions are bound to the event loop they were created on, so a new one is
+        opened if the client is used from a different loop (e.g. one ``asyncio.run``
+        per script invocation).
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._discard_session()
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._loop = loop
+        return self._session
+
+    def _discard_session(self):
+        session, loop = self._session, self._loop
+        self._session = None
+        self._loop = None
+        discard_session(session, loop, self.name)
+
+    async def get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> HttpResponse:
+        """
+        Performs a GET request against the upstream, retrying transient failures.
+
+        Args:
+            path (str): Path relative to the base URL.
+            params (dict): Query string parameters.
+            timeout (float): Timeout of each attempt in seconds, overriding the default.
+
+        Returns:
+            HttpResponse: The status, headers and raw body of the response. A
+            retryable status is returned once no retry is left.
+
+        Raises:
+            aiohttp.ClientError: If the request could not be completed.
+            asyncio.TimeoutError: If the request exceeded its timeout.
+            DeadlineExceeded: If the deadline of the request context passed first.
+        """
+        timeout = timeout or self.timeout
+        attempt = 0
+        while True:
+            attempt += 1
+            attempt_timeout = bound_timeout(timeout)
+            if attempt_timeout <= 0:
+                raise DeadlineExceeded(f"Deadline reached before calling {self.name}{path}")
+            try:
+                response = await self._get_once(path, params, attempt_timeout)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if isinstance(e, asyncio.TimeoutError) and attempt_timeout < timeout:
+                    # Cut short by the deadline rather than by a slow upstream.
+                    raise DeadlineExceeded(f"Deadline reached while calling {self.name}{path}") from e
+                cause = "timeout" if isinstance(e, asyncio.TimeoutError) else "error"
+                delay = self._retry_delay(attempt)
+                if delay is None:
+                    raise
+            else:
+                if response.status not in self.RETRY_STATUSES:
+                    return response
+                cause = str(response.status)
+                delay = self._retry_delay(attempt, response.retry_after())
+                if delay is None:
+                    return response
+            UPSTREAM_RETRIES.labels(self.name, cause).inc()
+            logger.warning(f"{self.name}{path} failed ({cause}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Returns how long to wait before the next attempt, or None if there should
+        not be one: no attempt is left, ``Retry-After`` asks for longer than
+        ``BACKOFF_MAX``, or the wait would leave no time before the deadline.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        delay = random.uniform(0, min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2 ** (attempt - 1)))
+        if retry_after is not None:
+            if retry_after > self.BACKOFF_MAX:
+                return None
+            delay = max(delay, retry_after)
+        remaining = time_remaining()
+        if remaining is not None and delay >= remaining:
+            return None
+        return delay
+
+    async def _get_once(self, path: str, params: Optional[Dict[str, Any]], timeout: float) -> HttpResponse:
+        session = self._get_session()
+        request_timeout = aiohttp.ClientTimeout(total=timeout)
+        status = "error"
+        self._in_flight.inc()
+        try:
+            async with session.get(
+                f"{self.base_url}{path}", params=params, timeout=request_timeout
+            ) as response:
+                body = await response.read()
+                status = response.status
+                return HttpResponse(
+                    status=response.status, headers=dict(response.headers), body=body
+                )
+        except asyncio.TimeoutError:
+            status = "timeout"
+            raise
+        finally:
+            self._in_flight.dec()
+            UPSTREAM_RESPONSES.labels(self.name, status).inc()
+
+    async def close(self):
+        """
+        Closes the pooled session and every connection it holds.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+
+_clients: Dict[str, HttpClient] = {}
+
+
+def get_client(name: str, base_url: str, **kwargs) -> HttpClient:
+    """
+    Returns the shared client for an upstream, creating it on first use.
+
+    Every adapter instance talking to the same upstream gets the same client, so
+    the whole process uses one connection pool per upstream.
+
+    Args:
+        name (str): Name identifying the upstream, e.g. ``"coinmarketcap"``.
+        base_url (str): Base URL of the upstream API.
+        **kwargs: Extra arguments forwarded to ``HttpClient`` on creation.
+
+    Returns:
+        HttpClient: The shared client for the upstream.
+    """
+    client = _clients.get(name)
+    if client is None:
+        client = HttpClient(base_url, name=name, **kwargs)
+        _clients[name] = client
+    return client
+
+
+async def close_all():
+    """
+    Closes every shared upstream client. Meant to be awaited on shutdown.
+    """
+    for name, client in list(_clients.items()):
+        try:
+            await client.close()
+        except Exception as e:
+            logger.error(f"Failed to close HTTP client {name}: {e}")
+    _clients.clear()
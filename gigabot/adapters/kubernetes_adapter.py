@@ -1,27 +1,71 @@
 # file: gigabot/adapters/kubernetes_adapter.py
 
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+from typing import Optional
+
 from kubernetes import client, config
 from kubernetes.client.rest import ApiException
 from gigabot.bot.config import Config
 
+logger = getLogger(__name__)
+
+_api_client: Optional[client.ApiClient] = None
+_api_client_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_api_client() -> client.ApiClient:
+    """
+    Returns the process-wide Kubernetes API client, loading the cluster
+    configuration on first use.
+    """
+    global _api_client
+    with _api_client_lock:
+        if _api_client is None:
+            if Config().CLUSTER_AUTH_MODE == "local":
+                config.load_kube_config()
+            else:
+                config.load_incluster_config()
+            _api_client = client.ApiClient()
+        return _api_client
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Returns the bounded executor the blocking Kubernetes client calls run on.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=Config().KUBERNETES_MAX_WORKERS, thread_name_prefix="kubernetes"
+        )
+    return _executor
+
 
 class KubernetesAdapter:
     """
     A class to manage interactions with the Kubernetes API, specifically for creating, deleting, and listing cron jobs.
+
+    Every adapter shares one API client and connection pool. The ``*_async``
+    methods run the blocking client calls on a small dedicated executor so that
+    they never hold the event loop.
     """
 
     def __init__(self):
         """
         Initializes the adapter by setting up the API access configuration. This setup is designed to be run
-        within a Kubernetes cluster.
+        within a Kubernetes cluster, or against the local kubeconfig when ``CLUSTER_AUTH_MODE`` is ``local``.
         """
         self.config = Config()
+        self.batch_v1 = client.BatchV1Api(get_api_client())
 
-        if self.config.CLUSTER_AUTH_MODE == "local":
-            config.load_kube_config()
-        else:
-            config.load_incluster_config()
-        
+    async def _run(self, function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_executor(), functools.partial(function, *args, **kwargs))
 
     def create_cron_job(
         self,
@@ -33,12 +77,13 @@ class KubernetesAdapter:
         env_vars,
         secret_name,
         image_pull_secret=None,
-    ):
+    ) -> Optional[client.V1CronJob]:
         """
         Creates a Kubernetes CronJob resource within a specified namespace with provided environment variables and secrets.
-        """
-        batch_v1 = client.BatchV1Api()
 
+        Returns:
+            V1CronJob: The created CronJob, or None if the API rejected it.
+        """
         # Construct the schedule string from hours and minutes
         if hours == 0:
             schedule = f"*/{minutes} * * * *"
@@ -106,32 +151,52 @@ class KubernetesAdapter:
         )
 
         try:
-            api_response = batch_v1.create_namespaced_cron_job(namespace, cron_job)
-            print(f"CronJob created. status='{str(api_response.status)}'")
+            api_response = self.batch_v1.create_namespaced_cron_job(namespace, cron_job)
+            logger.info(f"CronJob {name} created in namespace {namespace}")
+            return api_response
         except ApiException as e:
-            print(f"An error occurred: {str(e)}")
+            logger.error(f"Failed to create CronJob {name}: {e}")
+            return None
+
+    async def create_cron_job_async(self, *args, **kwargs) -> Optional[client.V1CronJob]:
+        """
+        Non-blocking version of ``create_cron_job``.
+        """
+        return await self._run(self.create_cron_job, *args, **kwargs)
 
-    def delete_cron_job(self, namespace, name):
+    def delete_cron_job(self, namespace, name) -> bool:
         """
         Deletes a CronJob from a specified Kubernetes namespace.
+
+        Returns:
+            bool: Whether the CronJob was deleted.
         """
-        batch_v1 = client.BatchV1Api()
         try:
-            api_response = batch_v1.delete_namespaced_cron_job(name, namespace)
-            print(f"CronJob deleted. status='{str(api_response.status)}'")
+            self.batch_v1.delete_namespaced_cron_job(name, namespace)
+            logger.info(f"CronJob {name} deleted from namespace {namespace}")
+            return True
         except ApiException as e:
-            print(f"An error occurred: {str(e)}")
+            logger.error(f"Failed to delete CronJob {name}: {e}")
+            return False
+
+    async def delete_cron_job_async(self, namespace, name) -> bool:
+        """
+        Non-blocking version of ``delete_cron_job``.
+        """
+        return await self._run(self.delete_cron_job, namespace, name)
 
     def list_cron_jobs(self, namespace):
         """
         Lists all cronjobs in a specified Kubernetes namespace.
         """
-        batch_v1 = client.BatchV1Api()
         try:
-            cron_jobs = batch_v1.list_namespaced_cron_job(namespace)
-            for job in cron_jobs.items:
-                print(f"CronJob Name: {job.metadata.name}")
-            return cron_jobs.items
+            return self.batch_v1.list_namespaced_cron_job(namespace).items
         except ApiException as e:
-            print(f"Failed to list cronjobs: {str(e)}")
+            logger.error(f"Failed to list cronjobs: {e}")
             return []
+
+    async def list_cron_jobs_async(self, namespace):
+        """
+        Non-blocking version of ``list_cron_jobs``.
+        """
+        return await self._run(self.list_cron_jobs, namespace)
@@ -1,7 +1,10 @@
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 
-@dataclass
+from gigabot.adapters.decoding import JSON_KEY, decode
+from gigabot.adapters.models.lazy import UNPARSED, materialize
+
+@dataclass(slots=True)
 class Status:
     timestamp: str
     error_code: int
@@ -10,7 +13,7 @@ class Status:
     credit_count: int
     notice: Optional[str]
 
-@dataclass
+@dataclass(slots=True)
 class Platform:
     name: str
     id: str
@@ -18,24 +21,24 @@ class Platform:
     symbol: str
     token_address: str
 
-@dataclass
+@dataclass(slots=True)
 class Coin:
     id: str
     name: str
     symbol: str
     slug: str
 
-@dataclass
+@dataclass(slots=True)
 class CoinPlatform:
     name: str
     coin: Coin
 
-@dataclass
+@dataclass(slots=True)
 class ContractAddress:
     contract_address: str
-    platform: Platform
+    platform: CoinPlatform
 
-@dataclass
+@dataclass(slots=True)
 class URLs:
     website: List[str]
     twitter: List[str]
@@ -48,8 +51,25 @@ class URLs:
     source_code: List[str]
     announcement: List[str]
 
-@dataclass
+# The lazy sub-objects go through the same decoders as the eager fields, so
+# unknown upstream keys are ignored here too.
+
+def _parse_platform(data: Optional[Dict[str, Any]]) -> Optional[Platform]:
+    return decode(Platform, data) if data else None
+
+def _parse_contract_addresses(data: Optional[List[Dict[str, Any]]]) -> List[ContractAddress]:
+    return [decode(ContractAddress, ca) for ca in data or []]
+
+@dataclass(slots=True)
 class CoinInfo:
+    """
+    CoinMarketCap metadata of a coin.
+
+    ``platform`` and ``contract_address`` are optional and only built from their
+    ``*_data`` fields the first time they are read. ``urls`` is required, so it
+    is decoded with the other fields: a coin info missing it is rejected before
+    it can be cached.
+    """
     id: int
     name: str
     symbol: str
@@ -60,17 +80,29 @@ class CoinInfo:
     subreddit: str
     notice: str
     tags: List[str]
-    tag_names: List[str]
-    tag_groups: List[str]
-    urls: URLs
-    platform: Optional[Platform]  # Made optional to accommodate coins without a platform
     date_added: str
     twitter_username: str
     is_hidden: int
     date_launched: Optional[str]  # Made optional for coins that might not have this info
-    contract_address: List[ContractAddress]
     self_reported_circulating_supply: int
     self_reported_tags: Optional[List[str]]
     self_reported_market_cap: float
     infinite_supply: bool
+    urls: URLs
+    tag_names: List[str] = field(default_factory=list, metadata={JSON_KEY: "tag-names"})
+    tag_groups: List[str] = field(default_factory=list, metadata={JSON_KEY: "tag-groups"})
+    # Optional to accommodate coins without a platform
+    platform_data: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False, metadata={JSON_KEY: "platform"})
+    contract_address_data: Optional[List[Dict[str, Any]]] = field(
+        default=None, repr=False, compare=False, metadata={JSON_KEY: "contract_address"}
+    )
+    _platform: Any = field(default=UNPARSED, init=False, repr=False, compare=False)
+    _contract_address: Any = field(default=UNPARSED, init=False, repr=False, compare=False)
+
+    @property
+    def platform(self) -> Optional[Platform]:
+        return materialize(self, "_platform", self.platform_data, _parse_platform)
 
+    @property
+    def contract_address(self) -> List[ContractAddress]:
+        return materialize(self, "_contract_address", self.contract_address_data, _parse_contract_addresses)
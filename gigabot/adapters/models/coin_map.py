@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class CoinMapEntry:
+    id: int
+    symbol: str
+    name: str
+    slug: str
+    token_address: str
+    platform: Optional[str]
+    is_active: int
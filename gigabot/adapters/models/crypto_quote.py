@@ -1,13 +1,16 @@
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
-@dataclass
+from gigabot.adapters.decoding import JSON_KEY, decode
+from gigabot.adapters.models.lazy import UNPARSED, materialize
+
+@dataclass(slots=True)
 class Tag:
     slug: str
     name: str
     category: str
 
-@dataclass
+@dataclass(slots=True)
 class Platform:
     id: int
     name: str
@@ -15,7 +18,7 @@ class Platform:
     slug: str
     token_address: str
 
-@dataclass
+@dataclass(slots=True)
 class QuoteDetail:
     price: float
     volume_24h: float
@@ -32,23 +35,36 @@ class QuoteDetail:
     tvl: Optional[float]
     last_updated: str
 
-@dataclass
+@dataclass(slots=True)
 class Quote:
     USD: QuoteDetail
 
-@dataclass
+# The lazy sub-objects go through the same decoders as the eager fields, so
+# unknown upstream keys are ignored here too.
+
+def _parse_tags(data: Optional[List[Dict[str, Any]]]) -> List[Tag]:
+    return [decode(Tag, tag) for tag in data or []]
+
+def _parse_platform(data: Optional[Dict[str, Any]]) -> Optional[Platform]:
+    return decode(Platform, data) if data else None
+
+@dataclass(slots=True)
 class CryptocurrencyQuote:
+    """
+    A CoinMarketCap quote.
+
+    ``tags`` and ``platform`` are only built from ``tags_data`` and
+    ``platform_data`` the first time they are read.
+    """
     id: int
     name: str
     symbol: str
     slug: str
     num_market_pairs: int
     date_added: str
-    tags: List[Tag]
     max_supply: int
     circulating_supply: int
     total_supply: int
-    platform: Platform
     is_active: int
     infinite_supply: bool
     cmc_rank: int
@@ -57,4 +73,16 @@ class CryptocurrencyQuote:
     self_reported_market_cap: float
     tvl_ratio: Optional[float]
     last_updated: str
-    quote: Quote
\ No newline at end of file
+    quote: Quote
+    tags_data: Optional[List[Dict[str, Any]]] = field(default=None, repr=False, compare=False, metadata={JSON_KEY: "tags"})
+    platform_data: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False, metadata={JSON_KEY: "platform"})
+    _tags: Any = field(default=UNPARSED, init=False, repr=False, compare=False)
+    _platform: Any = field(default=UNPARSED, init=False, repr=False, compare=False)
+
+    @property
+    def tags(self) -> List[Tag]:
+        return materialize(self, "_tags", self.tags_data, _parse_tags)
+
+    @property
+    def platform(self) -> Optional[Platform]:
+        return materialize(self, "_platform", self.platform_data, _parse_platform)
@@ -1,32 +1,46 @@
 # file: gigabot/adapters/models/dex_screener_models.py
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
 
-@dataclass
+from gigabot.adapters.decoding import JSON_KEY, decode
+from gigabot.adapters.models.lazy import UNPARSED, materialize
+
+@dataclass(slots=True)
 class Token:
     address: str
     name: str
     symbol: str
 
-@dataclass
+@dataclass(slots=True)
 class Website:
     label: str
     url: str
 
-@dataclass
+@dataclass(slots=True)
 class Social:
     type: str
     url: str
 
-@dataclass
+@dataclass(slots=True)
 class Info:
-    imageUrl: str
-    websites: List[Website]
-    socials: List[Social]
+    imageUrl: Optional[str]
+    websites: List[Website] = field(default_factory=list)
+    socials: List[Social] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> Optional["Info"]:
+        return decode(cls, data) if data else None
 
-@dataclass
+@dataclass(slots=True)
 class Pair:
+    """
+    A DexScreener pair.
+
+    ``txns``, ``volume``, ``priceChange`` and ``liquidity`` reference the dicts of
+    the decoded response as is. ``info`` is only built from ``info_data`` the first
+    time it is read, since most lookups never look at it.
+    """
     chainId: str
     dexId: str
     url: str
@@ -41,19 +55,24 @@ class Pair:
     liquidity: Optional[Dict[str, float]]
     fdv: Optional[float]
     pairCreatedAt: Optional[int]
-    info: Optional[Info]
+    info_data: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False, metadata={JSON_KEY: "info"})
+    _info: Any = field(default=UNPARSED, init=False, repr=False, compare=False)
+
+    @property
+    def info(self) -> Optional[Info]:
+        return materialize(self, "_info", self.info_data, Info.from_dict)
 
-@dataclass
+@dataclass(slots=True)
 class PairsResponse:
     schemaVersion: str
     pairs: List[Pair]
 
-@dataclass
+@dataclass(slots=True)
 class TokensResponse:
     schemaVersion: str
     pairs: List[Pair]
 
-@dataclass
+@dataclass(slots=True)
 class SearchResponse:
     schemaVersion: str
     pairs: List[Pair]
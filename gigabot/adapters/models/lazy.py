@@ -0,0 +1,30 @@
+# file: gigabot/adapters/models/lazy.py
+
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Unparsed:
+    """
+    Marker held by a lazily parsed field until it is first accessed.
+    """
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "UNPARSED"
+
+
+UNPARSED: Any = _Unparsed()
+
+
+def materialize(instance: Any, name: str, raw: Any, parse: Callable[[Any], T]) -> T:
+    """
+    Returns the parsed value of a lazy field, parsing ``raw`` and storing the
+    result in ``name`` on first access.
+    """
+    value = getattr(instance, name)
+    if value is UNPARSED:
+        value = parse(raw)
+        setattr(instance, name, value)
+    return value
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class PriceAlert:
+    id: Optional[int]
+    symbol: str
+    token_address: str
+    direction: str
+    threshold: float
+    webhook_url: str
+    guild_id: Optional[int] = None
+    user_id: Optional[int] = None
@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class PriceSchedule:
+    name: str
+    symbol: str
+    minute: int
+    hour: int
+    webhook_url: str
+    token_address: Optional[str] = None
+    coin_id: Optional[int] = None
+
+    @property
+    def cron_expression(self) -> str:
+        if self.hour == 0:
+            return f"*/{self.minute} * * * *"
+        return f"{self.minute} */{self.hour} * * *"
+
+    def is_due(self, minute_of_hour: int, hour_of_day: int) -> bool:
+        """
+        Whether ``cron_expression`` fires at the given time. It is the same
+        expression the CronJob backend builds for a schedule.
+        """
+        if self.hour == 0:
+            return minute_of_hour % self.minute == 0
+        return minute_of_hour == self.minute and hour_of_day % self.hour == 0
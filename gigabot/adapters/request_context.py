@@ -0,0 +1,87 @@
+# file: gigabot/adapters/request_context.py
+
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from enum import IntEnum
+from typing import Iterator, Optional
+
+
+class Priority(IntEnum):
+    """
+    Priority of the work an upstream call is made for. Lower values win.
+    """
+    INTERACTIVE = 0
+    SCHEDULED = 1
+    BACKGROUND = 2
+
+
+@dataclass(frozen=True)
+class RequestContext:
+    """
+    Per-request metadata made available to the adapters without threading it
+    through every call signature.
+    """
+    priority: Priority = Priority.BACKGROUND
+    guild_id: Optional[int] = None
+    # Identifies one command invocation or tick across logs, traces and adapter calls.
+    correlation_id: Optional[str] = None
+    # ``time.monotonic()`` value by which the request must be answered, if any.
+    # Adapter calls derive their timeouts from the time left before it.
+    deadline: Optional[float] = None
+
+
+_current: ContextVar[RequestContext] = ContextVar("gigabot_request_context", default=RequestContext())
+
+
+def new_correlation_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def current_context() -> RequestContext:
+    """
+    Returns the context of the request being served.
+    """
+    return _current.get()
+
+
+def time_remaining() -> Optional[float]:
+    """
+    Returns the seconds left before the deadline of the current request (negative
+    once it passed), or None if it has no deadline.
+    """
+    deadline = _current.get().deadline
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def bound_timeout(timeout: Optional[float]) -> Optional[float]:
+    """
+    Caps a timeout by the time left before the deadline of the current request.
+
+    Args:
+        timeout (float): Timeout of the call in seconds, None for no timeout of its own.
+
+    Returns:
+        float: The timeout to use, never negative, or None if neither bounds the call.
+    """
+    remaining = time_remaining()
+    if remaining is None:
+        return timeout
+    remaining = max(0.0, remaining)
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+@contextmanager
+def request_context(**changes) -> Iterator[RequestContext]:
+    """
+    Runs the enclosed code with a copy of the current context with ``changes`` applied.
+
+    Tasks created inside the block inherit the new context.
+    """
+    token = _current.set(replace(_current.get(), **changes))
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
@@ -0,0 +1,65 @@
+# file: gigabot/adapters/schedule_store.py
+
+from typing import List, Optional
+
+from gigabot.adapters.models.price_schedule import PriceSchedule
+from gigabot.adapters.sqlite_store import SqliteStore
+
+
+class ScheduleStore(SqliteStore):
+    """
+    Durable store of the price schedules run by the in-process scheduler.
+    """
+
+    COLUMNS = "name, symbol, minute, hour, webhook_url, token_address, coin_id"
+
+    def _create_schema(self):
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS schedules ("
+                "name TEXT PRIMARY KEY, symbol TEXT NOT NULL, minute INTEGER NOT NULL, "
+                "hour INTEGER NOT NULL, webhook_url TEXT NOT NULL, token_address TEXT, coin_id INTEGER)"
+            )
+
+    def save(self, schedule: PriceSchedule):
+        """
+        Inserts a schedule, replacing any schedule with the same name.
+        """
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                f"INSERT OR REPLACE INTO schedules ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    schedule.name,
+                    schedule.symbol,
+                    schedule.minute,
+                    schedule.hour,
+                    schedule.webhook_url,
+                    schedule.token_address,
+                    schedule.coin_id,
+                ),
+            )
+
+    def delete(self, name: str) -> bool:
+        """
+        Deletes a schedule.
+
+        Returns:
+            bool: Whether a schedule with that name existed.
+        """
+        with self._lock, self._connect() as connection:
+            cursor = connection.execute("DELETE FROM schedules WHERE name = ?", (name,))
+            return cursor.rowcount > 0
+
+    def get(self, name: str) -> Optional[PriceSchedule]:
+        with self._connect() as connection:
+            row = connection.execute(
+                f"SELECT {self.COLUMNS} FROM schedules WHERE name = ?", (name,)
+            ).fetchone()
+        return PriceSchedule(*row) if row else None
+
+    def list(self) -> List[PriceSchedule]:
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT {self.COLUMNS} FROM schedules ORDER BY name"
+            ).fetchall()
+        return [PriceSchedule(*row) for row in rows]
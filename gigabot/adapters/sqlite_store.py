@@ -0,0 +1,46 @@
+# file: gigabot/adapters/sqlite_store.py
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class SqliteStore:
+    """
+    Base class for small durable stores backed by a single SQLite file.
+
+    Connections are short-lived and opened per operation, so a store can be used
+    from the event loop thread and from worker threads alike.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initializes the store, creating the file and its schema if needed.
+
+        Args:
+            path (str): Path of the SQLite file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._create_schema()
+
+    def _create_schema(self):
+        """
+        Creates the tables of the store. Implemented by subclasses.
+        """
+        raise NotImplementedError
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.path)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
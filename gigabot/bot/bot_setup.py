@@ -1,23 +1,56 @@
+import os
 import threading
 from http.server import SimpleHTTPRequestHandler, HTTPServer
 from socketserver import ThreadingMixIn
 import discord
 import logging
+import logging.config
+from gigabot.adapters import http_client
+from gigabot.adapters.cmc_id_index import get_id_index
+from gigabot.adapters.cron_job_cache import get_cron_job_cache
+from gigabot.adapters.coinmarketcap_adapter import CoinMarketCapAdapter
+from gigabot.bot.commands.alert_command import AlertCommand
+from gigabot.bot.commands.delete_alert_command import DeleteAlertCommand
 from gigabot.bot.commands.delete_cronjob_command import DeleteCronJobs
+from gigabot.bot.commands.list_alerts_command import ListAlertsCommand
 from gigabot.bot.commands.list_cronjobs import ListCronJobs
 from gigabot.bot.commands.price_command import PriceCommand
 from gigabot.bot.commands.price_cron_command import PriceCronCommand
+from gigabot.bot.commands.price_stats_command import PriceStatsCommand
 from gigabot.bot.config import Config
+from gigabot.observability.metrics import CONTENT_TYPE, REGISTRY, start_event_loop_monitor
+from gigabot.observability.watchdog import start_loop_watchdog
+from gigabot.services.alert_engine import get_alert_engine
+from gigabot.services.notification_service import get_notification_service
+from gigabot.services.price_scheduler import get_price_scheduler
 
 logger = logging.getLogger(__name__)
 
-bot = discord.Bot()
+
+class GigaBot(discord.Bot):
+    """Discord bot that releases the shared upstream connection pools on shutdown."""
+
+    async def close(self):
+        await http_client.close_all()
+        await get_notification_service().close()
+        await super().close()
+
+
+bot = GigaBot()
 
 class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
     """Handle requests in a separate thread."""
 
 class RequestHandler(SimpleHTTPRequestHandler):
     def do_GET(self):
+        if self.path.split('?', 1)[0] == '/metrics':
+            body = REGISTRY.render().encode()
+            self.send_response(200)
+            self.send_header('Content-type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
         self.send_response(200)
         self.send_header('Content-type', 'text/html')
         self.end_headers()
@@ -32,12 +65,30 @@ def start_server(port=3000):
 @bot.event
 async def on_ready():
     logger.info(f"{bot.user} is online and ready!")
+    conf = Config()
+    start_event_loop_monitor()
+    start_loop_watchdog(conf.LOOP_WATCHDOG_MS / 1000)
+    get_id_index().start_background_refresh(conf.CMC_ID_INDEX_REFRESH_SECONDS)
+    if conf.SCHEDULER_BACKEND == "inprocess":
+        get_price_scheduler().start()
+    else:
+        get_cron_job_cache('gigabot').start()
+    get_alert_engine().start(conf.ALERT_POLL_SECONDS)
+    try:
+        await CoinMarketCapAdapter().sync_credit_usage()
+    except Exception as e:
+        logger.error(f"Failed to sync CoinMarketCap credit usage: {e}")
 
 @bot.slash_command(name='price', help='Fetch the current price of a cryptocurrency')
 async def price(ctx, symbol: str):
     command = PriceCommand(ctx, symbol)
     await command.run()
 
+@bot.slash_command(name='price-stats', help='Show recent price statistics of a cryptocurrency')
+async def price_stats(ctx, symbol: str, minutes: int):
+    command = PriceStatsCommand(ctx, symbol, minutes)
+    await command.run()
+
 @bot.slash_command(name='price-cron', help='Fetch the current price of a cryptocurrency periodically')
 async def price_cron(ctx, symbol: str, minute: int, hour: int):
     command = PriceCronCommand(ctx, symbol, minute, hour)
@@ -53,8 +104,25 @@ async def delete_cron(ctx, name: str):
     command = DeleteCronJobs(ctx, 'gigabot', name)
     await command.run()
 
+@bot.slash_command(name='alert', help='Get notified when a cryptocurrency goes above or below a price')
+async def alert(ctx, symbol: str, direction: str, price: float):
+    command = AlertCommand(ctx, symbol, direction, price)
+    await command.run()
+
+@bot.slash_command(name='list-alerts', help='List the price alerts of this server')
+async def list_alerts(ctx):
+    command = ListAlertsCommand(ctx)
+    await command.run()
+
+@bot.slash_command(name='del-alert', help='Delete a price alert')
+async def delete_alert(ctx, alert_id: int):
+    command = DeleteAlertCommand(ctx, alert_id)
+    await command.run()
+
 def run_bot():
     conf = Config()
+    if os.path.exists(conf.LOGGING_CONFIG):
+        logging.config.fileConfig(conf.LOGGING_CONFIG, disable_existing_loggers=False)
 
     # Start the HTTP server on a separate thread
     server_thread = threading.Thread(target=start_server, args=(3000,), daemon=True)
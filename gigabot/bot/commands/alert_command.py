@@ -0,0 +1,51 @@
+from gigabot.bot.commands.base_command import BaseCommand
+from gigabot.bot.config import Config
+from gigabot.services.alert_engine import get_alert_engine
+
+
+class AlertCommand(BaseCommand):
+    """
+    Command to register a price alert for a specified cryptocurrency.
+
+    The alert fires once, when the token price goes above or below the requested
+    threshold, and is posted to the configured Discord webhook.
+    """
+
+    def __init__(self, context, symbol: str, direction: str, price: float):
+        """
+        Initialize the AlertCommand with necessary parameters.
+
+        Args:
+            context: The context in which the command is executed.
+            symbol (str): The cryptocurrency symbol to watch.
+            direction (str): ``above`` or ``below``.
+            price (float): The USD price threshold.
+        """
+        super().__init__(context)
+        self.symbol = symbol
+        self.direction = direction
+        self.price = price
+        self.config = Config()
+
+    async def execute(self):
+        """
+        Register the alert and confirm it to the user.
+        """
+        guild_id = getattr(self.context, "guild_id", None)
+        if guild_id is None:
+            # An alert set from a DM could never be listed nor deleted.
+            await self.context.respond(content="Alerts can only be managed from a server")
+            return
+
+        alert = await get_alert_engine().add_alert(
+            symbol=self.symbol,
+            direction=self.direction,
+            threshold=self.price,
+            webhook_url=self.config.DISCORD_WEBHOOK,
+            guild_id=guild_id,
+            user_id=getattr(self.context.author, "id", None),
+        )
+
+        await self.context.respond(
+            content=f"Alert #{alert.id} set: {alert.symbol} {alert.direction} {alert.threshold} USD"
+        )
@@ -1,4 +1,12 @@
+import time
 from abc import ABC, abstractmethod
+from logging import getLogger
+from gigabot.adapters.request_context import Priority, new_correlation_id, request_context
+from gigabot.bot.config import Config
+from gigabot.observability.metrics import COMMAND_ERRORS, COMMAND_LATENCY, COMMANDS_IN_FLIGHT
+from gigabot.observability.tracing import mark_failed, start_trace
+
+logger = getLogger(__name__)
 
 class BaseCommand(ABC):
     """
@@ -40,11 +48,41 @@ class BaseCommand(ABC):
 
         This could also handle common pre-execution and post-execution tasks if needed,
         such as logging, error handling, etc.
+
+        Upstream calls made by the command run with interactive priority and are
+        attributed to the guild the command was invoked from. They share a deadline
+        of ``COMMAND_DEADLINE_MS`` from invocation, so that the command can answer
+        within Discord's 3 second interaction window. The latency, errors
+        and concurrency of every command are recorded in the metrics, and its
+        stages are traced under a new correlation id.
+        """
+        name = type(self).__name__
+        guild_id = getattr(self.context, "guild_id", None)
+        in_flight = COMMANDS_IN_FLIGHT.labels(name)
+        in_flight.inc()
+        start = time.perf_counter()
+        with request_context(
+            priority=Priority.INTERACTIVE,
+            guild_id=guild_id,
+            correlation_id=new_correlation_id(),
+            deadline=time.monotonic() + Config().COMMAND_DEADLINE_MS / 1000,
+        ), start_trace(name, guild_id=guild_id):
+            try:
+                await self.execute()
+            except Exception as e:
+                self.count_error(f"{type(e).__name__}: {e}")
+                await self.handle_error(e)
+            finally:
+                in_flight.dec()
+                COMMAND_LATENCY.labels(name).observe(time.perf_counter() - start)
+
+    def count_error(self, error: str = "error"):
+        """
+        Counts the command as failed in the metrics and its trace, for commands
+        that answer with an error message instead of raising.
         """
-        try:
-            await self.execute()
-        except Exception as e:
-            await self.handle_error(e)
+        COMMAND_ERRORS.labels(type(self).__name__).inc()
+        mark_failed(error)
 
     async def handle_error(self, error):
         """
@@ -53,7 +91,5 @@ class BaseCommand(ABC):
         Args:
             error: The exception that was raised during command execution.
         """
-        # Log the error, alert the user, etc.
-        # Here you can log the error to a logging service or send a message to the user.
-        print(f"An error occurred: {error}")
+        logger.error(f"{type(self).__name__} failed: {error}", exc_info=error)
         await self.context.respond(f"An error occurred while executing the command: {error}")
@@ -0,0 +1,34 @@
+from gigabot.bot.commands.base_command import BaseCommand
+from gigabot.services.alert_engine import get_alert_engine
+
+
+class DeleteAlertCommand(BaseCommand):
+    """
+    Command to delete a price alert of the current guild.
+    """
+
+    def __init__(self, context, alert_id: int):
+        """
+        Initialize the DeleteAlertCommand with necessary parameters.
+
+        Args:
+            context: The context in which the command is executed.
+            alert_id (int): The id of the alert to delete.
+        """
+        super().__init__(context)
+        self.alert_id = alert_id
+
+    async def execute(self):
+        """
+        Delete the alert and confirm it to the user.
+        """
+        guild_id = getattr(self.context, "guild_id", None)
+        if guild_id is None:
+            await self.context.respond(content="Alerts can only be managed from a server")
+            return
+
+        if not get_alert_engine().remove_alert(self.alert_id, guild_id):
+            await self.context.respond(content=f"Alert #{self.alert_id} not found")
+            return
+
+        await self.context.respond(content=f"Deleted alert #{self.alert_id}")
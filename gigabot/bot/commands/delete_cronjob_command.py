@@ -1,6 +1,9 @@
 import discord
 from gigabot.bot.commands.base_command import BaseCommand
+from gigabot.adapters.cron_job_cache import get_cron_job_cache
 from gigabot.adapters.kubernetes_adapter import KubernetesAdapter
+from gigabot.bot.config import Config
+from gigabot.services.price_scheduler import get_price_scheduler
 
 from gigabot.adapters.errors import QuoteNotFound, SymbolAddressMismatch
 
@@ -25,7 +28,7 @@ class DeleteCronJobs(BaseCommand):
         super().__init__(context)
         self.namespace = namespace
         self.name = name
-        self.k8s_adapter = KubernetesAdapter()
+        self.config = Config()
 
     async def execute(self):
         """
@@ -34,14 +37,22 @@ class DeleteCronJobs(BaseCommand):
         This method will communicate with an external API to retrieve current price data
         and then send this information back to the user through the Discord context.
         """
-        print(f"Deleting cronjob {self.name} in namespace {self.namespace}")
+        if self.config.SCHEDULER_BACKEND == "inprocess":
+            if not get_price_scheduler().remove(self.name):
+                await self.context.respond(content=f"Schedule {self.name} not found")
+                return
 
-        cronjobs = self.k8s_adapter.list_cron_jobs(self.namespace)
+            await self.context.respond(content=f"Deleted schedule {self.name}")
+            return
 
-        if self.name not in [cronjob.metadata.name for cronjob in cronjobs]:
+        cache = get_cron_job_cache(self.namespace)
+        if not await cache.exists(self.name):
             await self.context.respond(content=f"Cronjob {self.name} not found in namespace {self.namespace}")
             return
 
-        self.k8s_adapter.delete_cron_job(self.namespace, self.name)
+        if not await KubernetesAdapter().delete_cron_job_async(self.namespace, self.name):
+            await self.context.respond(content=f"Failed to delete cronjob {self.name} in namespace {self.namespace}")
+            return
+        cache.discard(self.name)
 
         await self.context.respond(content=f"Deleted cronjob {self.name} in namespace {self.namespace}")
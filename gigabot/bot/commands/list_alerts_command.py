@@ -0,0 +1,34 @@
+import discord
+from gigabot.bot.commands.base_command import BaseCommand
+from gigabot.services.alert_engine import get_alert_engine
+
+
+class ListAlertsCommand(BaseCommand):
+    """
+    Command to list the price alerts registered in the current guild.
+    """
+
+    # Discord allows at most 25 fields per embed.
+    MAX_FIELDS = 25
+
+    async def execute(self):
+        """
+        Respond with the pending alerts of the guild.
+        """
+        guild_id = getattr(self.context, "guild_id", None)
+        if guild_id is None:
+            await self.context.respond(content="Alerts can only be managed from a server")
+            return
+
+        alerts = get_alert_engine().list_alerts(guild_id)
+
+        embed = discord.Embed(title=f"Price alerts ({len(alerts)})", color=discord.Color.green())
+
+        for alert in alerts[:self.MAX_FIELDS]:
+            embed.add_field(
+                name=f"#{alert.id} {alert.symbol}",
+                value=f"{alert.direction} {alert.threshold} USD",
+                inline=False,
+            )
+
+        await self.context.respond(embed=embed)
@@ -1,6 +1,8 @@
 import discord
 from gigabot.bot.commands.base_command import BaseCommand
-from gigabot.adapters.kubernetes_adapter import KubernetesAdapter
+from gigabot.adapters.cron_job_cache import get_cron_job_cache
+from gigabot.bot.config import Config
+from gigabot.services.price_scheduler import get_price_scheduler
 
 from gigabot.adapters.errors import QuoteNotFound, SymbolAddressMismatch
 
@@ -24,7 +26,7 @@ class ListCronJobs(BaseCommand):
         """
         super().__init__(context)
         self.namespace = namespace
-        self.k8s_adapter = KubernetesAdapter()
+        self.config = Config()
 
     async def execute(self):
         """
@@ -33,9 +35,16 @@ class ListCronJobs(BaseCommand):
         This method will communicate with an external API to retrieve current price data
         and then send this information back to the user through the Discord context.
         """
-        print(f"Gathering cronjobs for {self.namespace} ns")
-                
-        cronjobs = self.k8s_adapter.list_cron_jobs(self.namespace)
+        if self.config.SCHEDULER_BACKEND == "inprocess":
+            embed = discord.Embed(title="Scheduled price posts", color=discord.Color.green())
+
+            for schedule in get_price_scheduler().list():
+                embed.add_field(name=schedule.name, value=f"Schedule: {schedule.cron_expression}", inline=False)
+
+            await self.context.respond(embed=embed)
+            return
+
+        cronjobs = await get_cron_job_cache(self.namespace).list_cron_jobs()
 
         embed = discord.Embed(title=f"CronJobs in Namespace: {self.namespace}", color=discord.Color.green())
 
@@ -1,11 +1,14 @@
+import asyncio
+from logging import getLogger
+
 import discord
 from gigabot.bot.commands.base_command import BaseCommand
-from gigabot.adapters.models.crypto_quote import CryptocurrencyQuote
-from gigabot.adapters.models.coin_info import CoinInfo
-from gigabot.adapters.coinmarketcap_adapter import CoinMarketCapAdapter
+from gigabot.bot.config import Config
+from gigabot.observability.tracing import annotate, span
+from gigabot.services.models.price_lookup import DEXSCREENER
 from gigabot.services.price_service import PriceService
 
-from gigabot.adapters.errors import QuoteNotFound, SymbolAddressMismatch
+logger = getLogger(__name__)
 
 
 
@@ -15,8 +18,18 @@ class PriceCommand(BaseCommand):
 
     This command allows users to query real-time price information for any supported
     cryptocurrency by interfacing with an external API, such as CoinMarketCap.
+
+    With ``PRICE_RESOLUTION=hedged``, a reply built from DexScreener is sent when
+    CoinMarketCap misses the hedge budget, and edited into the full CoinMarketCap
+    embed once that lookup completes.
     """
 
+    # Seconds a DexScreener reply waits for the CoinMarketCap lookup to fill it in.
+    FILL_IN_TIMEOUT = 15
+
+    # Fill-in tasks outliving their command, referenced so they are not collected.
+    _fill_ins = set()
+
     def __init__(self, context, symbol: str):
         """
         Initialize the PriceCommand with necessary parameters.
@@ -27,8 +40,8 @@ class PriceCommand(BaseCommand):
         """
         super().__init__(context)
         self.symbol = symbol
-        self.cmc_adapter = CoinMarketCapAdapter()
         self.price_service = PriceService()
+        self.hedged = Config().PRICE_RESOLUTION == "hedged"
 
     async def execute(self):
         """
@@ -37,8 +50,46 @@ class PriceCommand(BaseCommand):
         This method will communicate with an external API to retrieve current price data
         and then send this information back to the user through the Discord context.
         """
-        print(f"Querying price for {self.symbol} symbol")
-                
-        _, embed = await self.price_service.fetch_cryptocurrency_data(self.symbol)
-        
-        await self.context.respond(embed=embed)
+        annotate(symbol=self.symbol.upper())
+
+        if self.hedged:
+            lookup = await self.price_service.fetch_price_hedged(self.symbol)
+        else:
+            lookup = await self.price_service.fetch_cryptocurrency_data(self.symbol)
+
+        if not lookup.ok:
+            self.count_error(lookup.error)
+            with span("respond"):
+                await self.context.respond(content=lookup.error)
+            return
+
+        if lookup.source == DEXSCREENER:
+            with span("format_response"):
+                embed = self.price_service.format_dex_response(lookup)
+            with span("respond"):
+                await self.context.respond(embed=embed)
+            if lookup.pending is not None:
+                task = asyncio.ensure_future(self.fill_in(lookup))
+                self._fill_ins.add(task)
+                task.add_done_callback(self._fill_ins.discard)
+            return
+
+        with span("format_response"):
+            embed = self.price_service.format_response(lookup.coin_info, lookup.quote, lookup.stale)
+        with span("respond"):
+            await self.context.respond(embed=embed)
+
+    async def fill_in(self, lookup):
+        """
+        Replaces a DexScreener reply with the CoinMarketCap embed once the
+        CoinMarketCap lookup completes. The DexScreener reply stays if it fails.
+        """
+        try:
+            lookup.coin_id, lookup.quote, lookup.coin_info = await asyncio.wait_for(
+                lookup.pending, self.FILL_IN_TIMEOUT
+            )
+            lookup.stale = self.price_service.quote_cache.is_stale(lookup.coin_id)
+            embed = self.price_service.format_response(lookup.coin_info, lookup.quote, lookup.stale)
+            await self.context.edit(embed=embed)
+        except Exception as e:
+            logger.info(f"CoinMarketCap data of {self.symbol} not filled in: {e}")
@@ -1,10 +1,10 @@
+from gigabot.adapters.cron_job_cache import get_cron_job_cache
 from gigabot.adapters.kubernetes_adapter import KubernetesAdapter
+from gigabot.adapters.models.price_schedule import PriceSchedule
 from gigabot.bot.commands.base_command import BaseCommand
-from gigabot.adapters.coinmarketcap_adapter import CoinMarketCapAdapter
 from gigabot.bot.config import Config
-from gigabot.services.price_service import PriceService
+from gigabot.services.price_scheduler import get_price_scheduler
 import logging
-import os
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -15,6 +15,9 @@ class PriceCronCommand(BaseCommand):
 
     This command allows users to query real-time price information for any supported
     cryptocurrency by interfacing with an external API, such as CoinMarketCap.
+
+    Depending on ``SCHEDULER_BACKEND`` the schedule is either run by the in-process
+    scheduler or by a dedicated Kubernetes CronJob.
     """
 
     def __init__(self, context, symbol: str, minute: int, hour: int):
@@ -24,7 +27,6 @@ class PriceCronCommand(BaseCommand):
         Args:
             context: The context in which the command is executed.
             symbol (str): The cryptocurrency symbol to fetch the price for.
-            token_address (str): The token address to fetch the price for.
             minute (int): Minute scheduling for cron.
             hour (int): Hour scheduling for cron.
         """
@@ -32,12 +34,28 @@ class PriceCronCommand(BaseCommand):
         self.symbol = symbol
         self.minute = minute
         self.hour = hour
-        self.cmc_adapter = CoinMarketCapAdapter()
-        self.k8s_adapter = KubernetesAdapter()
-        self.price_service = PriceService()
         self.config = Config()
 
     async def execute(self):
+        """
+        Schedule the periodic price post on the configured backend.
+        """
+        name = f"price-cron-{self.symbol}".lower()
+
+        if self.config.SCHEDULER_BACKEND == "inprocess":
+            get_price_scheduler().add(PriceSchedule(
+                name=name,
+                symbol=self.symbol,
+                minute=self.minute,
+                hour=self.hour,
+                webhook_url=self.config.DISCORD_WEBHOOK,
+            ))
+        else:
+            await self.create_cron_job(name)
+        
+        await self.context.send(f'Cron job for {self.symbol} scheduled to run every {self.hour} hour(s) at minute {self.minute}.')
+
+    async def create_cron_job(self, name: str):
         """
         Set up a cron job to run a script that fetches and displays cryptocurrency prices.
         """
@@ -48,9 +66,9 @@ class PriceCronCommand(BaseCommand):
         discord_webhook = self.config.DISCORD_WEBHOOK
 
         # Create a Kubernetes CronJob to run the price fetching script
-        self.k8s_adapter.create_cron_job(
+        cron_job = await KubernetesAdapter().create_cron_job_async(
             namespace="gigabot",
-            name=f"price-cron-{self.symbol}".lower(),
+            name=name,
             hours=self.hour,
             minutes=self.minute,
             image="registry.digitalocean.com/gigabot/gigabot-task:latest",
@@ -62,5 +80,5 @@ class PriceCronCommand(BaseCommand):
             secret_name="gigabot-secret",
             image_pull_secret="gigabot"
         )
-        
-        await self.context.send(f'Cron job for {self.symbol} scheduled to run every {self.hour} hour(s) at minute {self.minute}.')
+        if cron_job is not None:
+            get_cron_job_cache("gigabot").put(cron_job)
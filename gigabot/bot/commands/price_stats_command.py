@@ -0,0 +1,49 @@
+import discord
+from gigabot.bot.commands.base_command import BaseCommand
+from gigabot.services.price_history import get_price_history
+
+
+class PriceStatsCommand(BaseCommand):
+    """
+    Command to display windowed price statistics of a cryptocurrency.
+
+    Statistics are computed from the rolling price history the bot records from
+    /price, scheduled posts and alerts, without any upstream call.
+    """
+
+    def __init__(self, context, symbol: str, minutes: int):
+        """
+        Initialize the PriceStatsCommand with necessary parameters.
+
+        Args:
+            context: The context in which the command is executed.
+            symbol (str): The cryptocurrency symbol.
+            minutes (int): Size of the window, in minutes.
+        """
+        super().__init__(context)
+        self.symbol = symbol
+        self.minutes = minutes
+
+    async def execute(self):
+        """
+        Respond with the min, max, change and volatility of the price over the window.
+        """
+        stats = get_price_history().stats(self.symbol, self.minutes * 60)
+
+        if stats is None:
+            await self.context.respond(content=f"No price history for {self.symbol} in the last {self.minutes} minutes")
+            return
+
+        embed = discord.Embed(
+            title=f"{self.symbol.upper()} over the last {self.minutes} minutes",
+            description=f"Computed from {stats.count} recorded prices.",
+            color=discord.Colour.blurple(),
+        )
+        embed.add_field(name="Last", value=f"`{stats.last} USD`", inline=True)
+        embed.add_field(name="Min", value=f"`{stats.min} USD`", inline=True)
+        embed.add_field(name="Max", value=f"`{stats.max} USD`", inline=True)
+        embed.add_field(name="% Change", value=f"`{stats.percent_change:.4f}%`", inline=True)
+        if stats.volatility is not None:
+            embed.add_field(name="Volatility", value=f"`{stats.volatility:.4f}%`", inline=True)
+
+        await self.context.respond(embed=embed)
@@ -40,6 +40,38 @@ class Config:
         cls._COINMARKETCAP_URL = os.getenv('COINMARKETCAP_URL')
         cls._DISCORD_WEBHOOK = os.getenv('DISCORD_WEBHOOK')
         cls._CLUSTER_AUTH_MODE = os.getenv('CLUSTER_AUTH_MODE')
+        cls._HTTP_LIMIT_PER_HOST = int(os.getenv('HTTP_LIMIT_PER_HOST', '20'))
+        cls._CMC_ID_INDEX_PATH = os.getenv('CMC_ID_INDEX_PATH')
+        cls._CMC_ID_INDEX_REFRESH_SECONDS = int(os.getenv('CMC_ID_INDEX_REFRESH_SECONDS', '3600'))
+        cls._COIN_INFO_CACHE_TTL = int(os.getenv('COIN_INFO_CACHE_TTL', '86400'))
+        cls._COIN_INFO_CACHE_SIZE = int(os.getenv('COIN_INFO_CACHE_SIZE', '2048'))
+        cls._QUOTE_REFRESH_INTERVAL = int(os.getenv('QUOTE_REFRESH_INTERVAL', '60'))
+        cls._QUOTE_CACHE_MAX_TTL = int(os.getenv('QUOTE_CACHE_MAX_TTL', '60'))
+        cls._QUOTE_BATCH_WINDOW_MS = int(os.getenv('QUOTE_BATCH_WINDOW_MS', '5'))
+        cls._SCHEDULER_BACKEND = os.getenv('SCHEDULER_BACKEND', 'cronjob')
+        cls._SCHEDULE_STORE_PATH = os.getenv('SCHEDULE_STORE_PATH', 'data/schedules.sqlite3')
+        cls._ALERT_STORE_PATH = os.getenv('ALERT_STORE_PATH', 'data/alerts.sqlite3')
+        cls._ALERT_POLL_SECONDS = int(os.getenv('ALERT_POLL_SECONDS', '30'))
+        cls._PRICE_HISTORY_CAPACITY = int(os.getenv('PRICE_HISTORY_CAPACITY', '2880'))
+        cls._PRICE_HISTORY_MAX_SYMBOLS = int(os.getenv('PRICE_HISTORY_MAX_SYMBOLS', '1000'))
+        cls._CMC_CREDITS_PER_MINUTE = int(os.getenv('CMC_CREDITS_PER_MINUTE', '30'))
+        cls._CMC_CREDITS_PER_DAY = int(os.getenv('CMC_CREDITS_PER_DAY', '333'))
+        cls._CMC_CREDITS_PER_MONTH = int(os.getenv('CMC_CREDITS_PER_MONTH', '10000'))
+        cls._CMC_GUILD_SHARE = float(os.getenv('CMC_GUILD_SHARE', '0.25'))
+        cls._TRACE_SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', '0.1'))
+        cls._TRACE_SLOW_MS = float(os.getenv('TRACE_SLOW_MS', '2000'))
+        cls._LOGGING_CONFIG = os.getenv('LOGGING_CONFIG', 'logging.ini')
+        cls._DEXSCREENER_URL = os.getenv('DEXSCREENER_URL', 'https://api.dexscreener.com/latest/dex')
+        cls._LOOP_WATCHDOG_MS = float(os.getenv('LOOP_WATCHDOG_MS', '0'))
+        cls._KUBERNETES_MAX_WORKERS = int(os.getenv('KUBERNETES_MAX_WORKERS', '4'))
+        cls._PRICE_RESOLUTION = os.getenv('PRICE_RESOLUTION', 'coinmarketcap')
+        cls._PRICE_HEDGE_BUDGET_MS = float(os.getenv('PRICE_HEDGE_BUDGET_MS', '300'))
+        cls._CIRCUIT_BREAKER_FAILURE_RATE = float(os.getenv('CIRCUIT_BREAKER_FAILURE_RATE', '0.5'))
+        cls._CIRCUIT_BREAKER_MIN_CALLS = int(os.getenv('CIRCUIT_BREAKER_MIN_CALLS', '5'))
+        cls._CIRCUIT_BREAKER_WINDOW = float(os.getenv('CIRCUIT_BREAKER_WINDOW', '60'))
+        cls._CIRCUIT_BREAKER_OPEN_SECONDS = float(os.getenv('CIRCUIT_BREAKER_OPEN_SECONDS', '30'))
+        cls._CIRCUIT_BREAKER_SLOW_CALL_MS = float(os.getenv('CIRCUIT_BREAKER_SLOW_CALL_MS', '5000'))
+        cls._COMMAND_DEADLINE_MS = float(os.getenv('COMMAND_DEADLINE_MS', '2500'))
 
     @property
     def DISCORD_TOKEN(self):
@@ -89,4 +121,330 @@ class Config:
         Returns:
             str: The cluster authentication mode.
         """
-        return self._CLUSTER_AUTH_MODE
\ No newline at end of file
+        return self._CLUSTER_AUTH_MODE
+
+    @property
+    def HTTP_LIMIT_PER_HOST(self):
+        """
+        Get the maximum number of pooled connections kept per upstream host.
+
+        Returns:
+            int: The per-host connection limit.
+        """
+        return self._HTTP_LIMIT_PER_HOST
+
+    @property
+    def CMC_ID_INDEX_PATH(self):
+        """
+        Get the path of the SQLite file backing the CoinMarketCap id index. When unset,
+        the index is kept in memory only.
+
+        Returns:
+            str: The index file path, or None.
+        """
+        return self._CMC_ID_INDEX_PATH
+
+    @property
+    def CMC_ID_INDEX_REFRESH_SECONDS(self):
+        """
+        Get the interval between background refreshes of the CoinMarketCap id index.
+
+        Returns:
+            int: The refresh interval in seconds.
+        """
+        return self._CMC_ID_INDEX_REFRESH_SECONDS
+
+    @property
+    def COIN_INFO_CACHE_TTL(self):
+        """
+        Get how long coin metadata is cached.
+
+        Returns:
+            int: The time to live of a cached coin info, in seconds.
+        """
+        return self._COIN_INFO_CACHE_TTL
+
+    @property
+    def COIN_INFO_CACHE_SIZE(self):
+        """
+        Get the maximum number of coins whose metadata is cached.
+
+        Returns:
+            int: The coin info cache size.
+        """
+        return self._COIN_INFO_CACHE_SIZE
+
+    @property
+    def QUOTE_REFRESH_INTERVAL(self):
+        """
+        Get how often CoinMarketCap refreshes its quotes.
+
+        Returns:
+            int: The upstream quote refresh interval, in seconds.
+        """
+        return self._QUOTE_REFRESH_INTERVAL
+
+    @property
+    def QUOTE_CACHE_MAX_TTL(self):
+        """
+        Get the maximum time a quote is served from the cache.
+
+        Returns:
+            int: The maximum time to live of a cached quote, in seconds.
+        """
+        return self._QUOTE_CACHE_MAX_TTL
+
+    @property
+    def QUOTE_BATCH_WINDOW_MS(self):
+        """
+        Get how long quote lookups are collected before being sent as one request.
+
+        Returns:
+            int: The quote micro-batching window, in milliseconds.
+        """
+        return self._QUOTE_BATCH_WINDOW_MS
+
+    @property
+    def SCHEDULER_BACKEND(self):
+        """
+        Get the backend running scheduled price posts: ``cronjob`` (one Kubernetes
+        CronJob per symbol) or ``inprocess`` (batched scheduler inside the bot).
+
+        Returns:
+            str: The scheduler backend.
+        """
+        return self._SCHEDULER_BACKEND
+
+    @property
+    def SCHEDULE_STORE_PATH(self):
+        """
+        Get the path of the SQLite file storing the in-process schedules.
+
+        Returns:
+            str: The schedule store file path.
+        """
+        return self._SCHEDULE_STORE_PATH
+
+    @property
+    def ALERT_STORE_PATH(self):
+        """
+        Get the path of the SQLite file storing the price alerts.
+
+        Returns:
+            str: The alert store file path.
+        """
+        return self._ALERT_STORE_PATH
+
+    @property
+    def ALERT_POLL_SECONDS(self):
+        """
+        Get the interval between two evaluations of the price alerts.
+
+        Returns:
+            int: The alert polling interval, in seconds.
+        """
+        return self._ALERT_POLL_SECONDS
+
+    @property
+    def PRICE_HISTORY_CAPACITY(self):
+        """
+        Get the number of price points kept per symbol in the rolling history.
+
+        Returns:
+            int: The per-symbol history capacity.
+        """
+        return self._PRICE_HISTORY_CAPACITY
+
+    @property
+    def PRICE_HISTORY_MAX_SYMBOLS(self):
+        """
+        Get the maximum number of symbols tracked in the rolling price history.
+
+        Returns:
+            int: The maximum number of tracked symbols.
+        """
+        return self._PRICE_HISTORY_MAX_SYMBOLS
+
+    @property
+    def CMC_CREDITS_PER_MINUTE(self):
+        """
+        Get the CoinMarketCap credits the plan allows per minute.
+
+        Returns:
+            int: The per-minute credit limit.
+        """
+        return self._CMC_CREDITS_PER_MINUTE
+
+    @property
+    def CMC_CREDITS_PER_DAY(self):
+        """
+        Get the CoinMarketCap credits the plan allows per day.
+
+        Returns:
+            int: The daily credit limit.
+        """
+        return self._CMC_CREDITS_PER_DAY
+
+    @property
+    def CMC_CREDITS_PER_MONTH(self):
+        """
+        Get the CoinMarketCap credits the plan allows per month.
+
+        Returns:
+            int: The monthly credit limit.
+        """
+        return self._CMC_CREDITS_PER_MONTH
+
+    @property
+    def CMC_GUILD_SHARE(self):
+        """
+        Get the fraction of the per-minute CoinMarketCap credits a single guild may use.
+
+        Returns:
+            float: The per-guild share.
+        """
+        return self._CMC_GUILD_SHARE
+
+    @property
+    def TRACE_SAMPLE_RATE(self):
+        """
+        Get the fraction of commands whose stage trace is logged.
+
+        Returns:
+            float: The trace sample rate, 0 to 1.
+        """
+        return self._TRACE_SAMPLE_RATE
+
+    @property
+    def TRACE_SLOW_MS(self):
+        """
+        Get the duration above which a command trace is always logged, 0 to disable.
+
+        Returns:
+            float: The slow command threshold, in milliseconds.
+        """
+        return self._TRACE_SLOW_MS
+
+    @property
+    def LOGGING_CONFIG(self):
+        """
+        Get the path of the logging configuration file.
+
+        Returns:
+            str: The logging.ini path.
+        """
+        return self._LOGGING_CONFIG
+
+    @property
+    def DEXSCREENER_URL(self):
+        """
+        Get the base URL of the DexScreener API.
+
+        Returns:
+            str: The DexScreener base URL.
+        """
+        return self._DEXSCREENER_URL
+
+    @property
+    def LOOP_WATCHDOG_MS(self):
+        """
+        Get the time the event loop may be held before the watchdog logs the
+        blocking code, 0 to disable.
+
+        Returns:
+            float: The watchdog threshold, in milliseconds.
+        """
+        return self._LOOP_WATCHDOG_MS
+
+    @property
+    def KUBERNETES_MAX_WORKERS(self):
+        """
+        Get the number of threads running blocking Kubernetes API calls.
+
+        Returns:
+            int: The Kubernetes executor size.
+        """
+        return self._KUBERNETES_MAX_WORKERS
+
+    @property
+    def PRICE_RESOLUTION(self):
+        """
+        Get how /price resolves prices: ``coinmarketcap`` waits for CoinMarketCap, ``hedged``
+        answers from DexScreener when CoinMarketCap misses the hedge budget.
+
+        Returns:
+            str: The price resolution mode.
+        """
+        return self._PRICE_RESOLUTION
+
+    @property
+    def PRICE_HEDGE_BUDGET_MS(self):
+        """
+        Get the time hedged /price lookups wait for CoinMarketCap before answering
+        from DexScreener.
+
+        Returns:
+            float: The hedge budget, in milliseconds.
+        """
+        return self._PRICE_HEDGE_BUDGET_MS
+
+    @property
+    def CIRCUIT_BREAKER_FAILURE_RATE(self):
+        """
+        Get the share of failed or slow upstream calls opening a circuit breaker.
+
+        Returns:
+            float: The failure rate threshold, between 0 and 1.
+        """
+        return self._CIRCUIT_BREAKER_FAILURE_RATE
+
+    @property
+    def CIRCUIT_BREAKER_MIN_CALLS(self):
+        """
+        Get the number of calls an endpoint must get in the window before its breaker may open.
+
+        Returns:
+            int: The minimum number of calls.
+        """
+        return self._CIRCUIT_BREAKER_MIN_CALLS
+
+    @property
+    def CIRCUIT_BREAKER_WINDOW(self):
+        """
+        Get the time the outcome of an upstream call counts towards its breaker.
+
+        Returns:
+            float: The breaker window, in seconds.
+        """
+        return self._CIRCUIT_BREAKER_WINDOW
+
+    @property
+    def CIRCUIT_BREAKER_OPEN_SECONDS(self):
+        """
+        Get the time an open breaker fails calls fast before letting a probe through.
+
+        Returns:
+            float: The open duration, in seconds.
+        """
+        return self._CIRCUIT_BREAKER_OPEN_SECONDS
+
+    @property
+    def CIRCUIT_BREAKER_SLOW_CALL_MS(self):
+        """
+        Get the duration past which an upstream call counts as failed.
+
+        Returns:
+            float: The slow call threshold, in milliseconds.
+        """
+        return self._CIRCUIT_BREAKER_SLOW_CALL_MS
+
+    @property
+    def COMMAND_DEADLINE_MS(self):
+        """
+        Get the time a slash command has to answer, which its upstream calls derive
+        their timeouts from.
+
+        Returns:
+            float: The command deadline, in milliseconds.
+        """
+        return self._COMMAND_DEADLINE_MS
\ No newline at end of file
@@ -0,0 +1,388 @@
+# file: gigabot/observability/metrics.py
+
+import asyncio
+import functools
+import inspect
+import math
+import threading
+import time
+from bisect import bisect_left
+from logging import getLogger
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from gigabot.observability.tracing import span
+
+logger = getLogger(__name__)
+
+# Latency buckets, in seconds, shared by every histogram unless overridden.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """
+    A metric family with optional labels, in the Prometheus data model.
+
+    Children are created on first use of a label combination and updated in place;
+    updates are plain attribute writes made from the event loop thread, so they
+    cost no more than a dict lookup and an addition.
+    """
+
+    type = "untyped"
+    suffix = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def labels(self, *values) -> object:
+        """
+        Returns the child of a label combination, creating it if needed.
+        """
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self) -> object:
+        raise NotImplementedError
+
+    def _child_samples(self, labels: Dict[str, str], child) -> Iterable[Sample]:
+        raise NotImplementedError
+
+    def samples(self) -> Iterable[Sample]:
+        # list() snapshots the dict, which may grow while another thread renders it.
+        for key, child in list(self._children.items()):
+            yield from self._child_samples(dict(zip(self.labelnames, key)), child)
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class Counter(Metric):
+    """
+    A monotonically increasing value.
+    """
+
+    type = "counter"
+    suffix = "_total"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def _child_samples(self, labels, child):
+        yield f"{self.name}_total", labels, child.value
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+
+class Gauge(Metric):
+    """
+    A value that can go up and down.
+    """
+
+    type = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def _child_samples(self, labels, child):
+        yield self.name, labels, child.value
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values over fixed buckets.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def _child_samples(self, labels, child):
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), list(child.counts)):
+            cumulative += count
+            yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+        yield f"{self.name}_count", labels, cumulative
+        yield f"{self.name}_sum", labels, child.sum
+
+
+class CallbackMetric(Metric):
+    """
+    Gauge or counter whose samples are read from a callback when the metrics are
+    rendered, for values other components already keep track of.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        callback: Callable[[], Iterable[Tuple[Sequence[str], float]]],
+        type: str = "gauge",
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+        self.type = type
+        self.suffix = "_total" if type == "counter" else ""
+
+    def samples(self):
+        try:
+            values = list(self.callback())
+        except Exception:
+            logger.exception(f"Failed to collect {self.name}")
+            return
+        for key, value in values:
+            yield self.name + self.suffix, dict(zip(self.labelnames, (str(label) for label in key))), value
+
+
+class Registry:
+    """
+    Set of metrics rendered together in the Prometheus text format.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        callback: Callable[[], Iterable[Tuple[Sequence[str], float]]],
+        type: str = "gauge",
+    ) -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, labelnames, callback, type))
+
+    def render(self) -> str:
+        """
+        Renders every metric in the Prometheus text exposition format (0.0.4).
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            name = metric.name + metric.suffix
+            lines.append(f"# HELP {name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    "gigabot_upstream_call_seconds",
+    "Latency of adapter methods calling an upstream API.",
+    ("upstream", "method"),
+)
+UPSTREAM_ERRORS = REGISTRY.counter(
+    "gigabot_upstream_call_errors",
+    "Adapter method calls that raised an exception.",
+    ("upstream", "method"),
+)
+UPSTREAM_RESPONSES = REGISTRY.counter(
+    "gigabot_upstream_responses",
+    "HTTP responses received from upstream APIs, by status code.",
+    ("upstream", "status"),
+)
+UPSTREAM_RETRIES = REGISTRY.counter(
+    "gigabot_upstream_retries",
+    "HTTP requests to upstream APIs retried after a transient failure, by cause.",
+    ("upstream", "cause"),
+)
+UPSTREAM_IN_FLIGHT = REGISTRY.gauge(
+    "gigabot_upstream_requests_in_flight",
+    "HTTP requests to upstream APIs currently in flight.",
+    ("upstream",),
+)
+COMMAND_LATENCY = REGISTRY.histogram(
+    "gigabot_command_seconds",
+    "Latency of slash commands, from invocation to response.",
+    ("command",),
+)
+COMMAND_ERRORS = REGISTRY.counter(
+    "gigabot_command_errors",
+    "Slash commands that failed or answered with an error.",
+    ("command",),
+)
+COMMANDS_IN_FLIGHT = REGISTRY.gauge(
+    "gigabot_commands_in_flight",
+    "Slash commands currently executing.",
+    ("command",),
+)
+EVENT_LOOP_LAG = REGISTRY.histogram(
+    "gigabot_event_loop_lag_seconds",
+    "Delay between when a loop callback was due and when it ran.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+EVENT_LOOP_LAG_LAST = REGISTRY.gauge(
+    "gigabot_event_loop_lag_last_seconds",
+    "Most recently measured event loop lag.",
+)
+
+
+def timed(upstream: str, method: Optional[str] = None):
+    """
+    Decorator recording the latency and errors of an adapter method.
+
+    Works on both blocking methods and coroutines. The method label defaults to
+    the function name without its ``_async`` suffix, so both variants of an
+    endpoint share one series. Calls made during a traced command are also
+    recorded as ``<upstream>.<method>`` spans.
+    """
+
+    def decorator(function):
+        label = method or function.__name__.removesuffix("_async")
+        span_name = f"{upstream}.{label}"
+        latency = UPSTREAM_LATENCY.labels(upstream, label)
+        errors = UPSTREAM_ERRORS.labels(upstream, label)
+
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    with span(span_name):
+                        return await function(*args, **kwargs)
+                except BaseException:
+                    errors.inc()
+                    raise
+                finally:
+                    latency.observe(time.perf_counter() - start)
+        else:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    with span(span_name):
+                        return function(*args, **kwargs)
+                except BaseException:
+                    errors.inc()
+                    raise
+                finally:
+                    latency.observe(time.perf_counter() - start)
+        return wrapper
+
+    return decorator
+
+
+async def monitor_event_loop_lag(interval: float = 0.5):
+    """
+    Measures how late the event loop wakes up from a sleep of ``interval`` seconds.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - start - interval)
+        EVENT_LOOP_LAG.labels().observe(lag)
+        EVENT_LOOP_LAG_LAST.labels().set(lag)
+
+
+_lag_monitor: Optional[asyncio.Task] = None
+
+
+def start_event_loop_monitor(interval: float = 0.5):
+    """
+    Starts the event loop lag monitor on the running loop, unless already running.
+    """
+    global _lag_monitor
+    if _lag_monitor is None or _lag_monitor.done():
+        _lag_monitor = asyncio.get_running_loop().create_task(monitor_event_loop_lag(interval))
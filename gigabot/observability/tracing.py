@@ -0,0 +1,174 @@
+# file: gigabot/observability/tracing.py
+
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Dict, Iterator, List, Optional, TypeVar
+
+from gigabot.adapters.request_context import current_context
+from gigabot.bot.config import Config
+
+# Finished traces are logged here; logging.ini routes this logger to the JSON handler.
+trace_logger = logging.getLogger("gigabot.trace")
+
+
+class Trace:
+    """
+    Timings of the stages of one command invocation.
+
+    Spans are recorded as offsets from the start of the trace. A trace is written
+    out when it was sampled, when it was slower than the slow threshold, or when
+    it failed, so p99 outliers are always captured.
+    """
+
+    __slots__ = ("trace_id", "name", "sampled", "attributes", "spans", "start", "error")
+
+    def __init__(self, trace_id: str, name: str, sampled: bool, attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.name = name
+        self.sampled = sampled
+        self.attributes = attributes
+        self.spans: List[Dict[str, Any]] = []
+        self.start = time.perf_counter()
+        self.error: Optional[str] = None
+
+    def add_span(self, name: str, start: float, end: float, error: Optional[BaseException] = None):
+        span = {
+            "name": name,
+            "start_ms": round((start - self.start) * 1000, 3),
+            "duration_ms": round((end - start) * 1000, 3),
+        }
+        if error is not None:
+            span["error"] = type(error).__name__
+        self.spans.append(span)
+
+    def to_dict(self, duration: float) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "duration_ms": round(duration * 1000, 3),
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+            "sampled": self.sampled,
+            "attributes": self.attributes,
+            "spans": self.spans,
+        }
+
+
+_current: ContextVar[Optional[Trace]] = ContextVar("gigabot_trace", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+@contextmanager
+def start_trace(name: str, **attributes) -> Iterator[Optional[Trace]]:
+    """
+    Traces the enclosed block as one command invocation.
+
+    The trace id is the correlation id of the current request context. Nothing is
+    recorded when tracing is disabled (``TRACE_SAMPLE_RATE`` and ``TRACE_SLOW_MS``
+    both 0).
+    """
+    config = Config()
+    rate, slow_ms = config.TRACE_SAMPLE_RATE, config.TRACE_SLOW_MS
+    if rate <= 0 and slow_ms <= 0:
+        yield None
+        return
+
+    trace = Trace(
+        current_context().correlation_id or "-",
+        name,
+        random.random() < rate,
+        {key: value for key, value in attributes.items() if value is not None},
+    )
+    token = _current.set(trace)
+    try:
+        yield trace
+    except BaseException as e:
+        trace.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        duration = time.perf_counter() - trace.start
+        if trace.sampled or trace.error or (slow_ms > 0 and duration * 1000 >= slow_ms):
+            trace_logger.info(f"{name} took {duration * 1000:.1f} ms", extra={"trace": trace.to_dict(duration)})
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Records the duration of the enclosed block as a stage of the current trace.
+
+    A no-op outside of a trace.
+    """
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        trace.add_span(name, start, time.perf_counter(), e)
+        raise
+    trace.add_span(name, start, time.perf_counter())
+
+
+T = TypeVar("T")
+
+
+async def traced(name: str, awaitable: Awaitable[T]) -> T:
+    """
+    Awaits ``awaitable`` inside a span.
+    """
+    with span(name):
+        return await awaitable
+
+
+def annotate(**attributes):
+    """
+    Adds attributes (symbol, coin id...) to the current trace, if any.
+    """
+    trace = _current.get()
+    if trace is not None:
+        trace.attributes.update({key: value for key, value in attributes.items() if value is not None})
+
+
+def mark_failed(error: str):
+    """
+    Marks the current trace as failed, for commands that answer with an error
+    message instead of raising.
+    """
+    trace = _current.get()
+    if trace is not None:
+        trace.error = error
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats log records as one JSON object per line.
+
+    The correlation id of the request being served is added to every record, and
+    traces attached with ``extra={"trace": ...}`` are embedded as is.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        document = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "correlation_id": current_context().correlation_id,
+        }
+        trace = getattr(record, "trace", None)
+        if trace is not None:
+            document["trace"] = trace
+        if record.exc_info:
+            document["exception"] = self.formatException(record.exc_info)
+        return json.dumps(document, default=str)
@@ -0,0 +1,140 @@
+# file: gigabot/observability/watchdog.py
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from logging import getLogger
+from typing import List, Optional
+
+from gigabot.observability.metrics import REGISTRY
+
+logger = getLogger(__name__)
+
+# Root of the package, used to attribute a stall to the innermost frame of our own code.
+_PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOOP_BLOCKED = REGISTRY.counter(
+    "gigabot_event_loop_blocked",
+    "Times the event loop was held longer than the watchdog threshold, by blocking code location.",
+    ("location",),
+)
+LOOP_BLOCKED_SECONDS = REGISTRY.histogram(
+    "gigabot_event_loop_blocked_seconds",
+    "Duration of the event loop stalls caught by the watchdog.",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+def blocking_location(stack: List[traceback.FrameSummary]) -> str:
+    """
+    Returns ``file:function`` of the innermost frame in the gigabot package, or of
+    the innermost frame if none is.
+    """
+    for frame in reversed(stack):
+        if frame.filename.startswith(_PACKAGE_ROOT):
+            return f"{os.path.relpath(frame.filename, os.path.dirname(_PACKAGE_ROOT))}:{frame.name}"
+    if not stack:
+        return "unknown"
+    return f"{os.path.basename(stack[-1].filename)}:{stack[-1].name}"
+
+
+class LoopWatchdog:
+    """
+    Catches callbacks holding the event loop longer than a threshold.
+
+    A heartbeat coroutine stamps the time on every loop iteration it gets, and a
+    daemon thread checks the stamp. When the loop has not come back for longer
+    than ``threshold``, the thread captures the stack of the loop thread, which is
+    the code blocking it, logs it and counts it by code location. The duration of
+    the stall is recorded once the loop runs again.
+    """
+
+    def __init__(self, threshold: float, max_frames: int = 25):
+        """
+        Args:
+            threshold (float): Seconds the loop may be held before a stall is reported.
+            max_frames (int): Number of innermost frames logged with a stall.
+        """
+        self.threshold = threshold
+        self.interval = threshold / 4
+        self.max_frames = max_frames
+        self.stalls = 0
+        self._beat = time.monotonic()
+        self._stalled_since: Optional[float] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    async def _heartbeat(self):
+        while True:
+            self._beat = time.monotonic()
+            stalled_since = self._stalled_since
+            if stalled_since is not None:
+                self._stalled_since = None
+                duration = self._beat - stalled_since
+                LOOP_BLOCKED_SECONDS.labels().observe(duration)
+                logger.warning(f"Event loop was blocked for {duration:.3f}s")
+            await asyncio.sleep(self.interval)
+
+    def _watch(self):
+        while not self._stopped.wait(self.interval):
+            # Allow for the heartbeat sleep itself before calling the loop blocked.
+            held = time.monotonic() - self._beat - self.interval
+            if held < self.threshold or self._stalled_since is not None:
+                continue
+            self._stalled_since = self._beat + self.interval
+            self.report(held)
+
+    def report(self, held: float):
+        """
+        Logs and counts a stall with the current stack of the loop thread.
+        """
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.extract_stack(frame)[-self.max_frames:] if frame is not None else []
+        location = blocking_location(stack)
+        self.stalls += 1
+        LOOP_BLOCKED.labels(location).inc()
+        logger.warning(
+            f"Event loop blocked for more than {held:.3f}s in {location}:\n"
+            + "".join(traceback.format_list(stack))
+        )
+
+    def start(self):
+        """
+        Starts the watchdog on the running event loop, unless already running.
+        """
+        if self._task is not None and not self._task.done():
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="gigabot-loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+_watchdog: Optional[LoopWatchdog] = None
+
+
+def start_loop_watchdog(threshold: float) -> Optional[LoopWatchdog]:
+    """
+    Starts the process-wide loop watchdog on the running loop. A threshold of 0
+    leaves it disabled.
+    """
+    global _watchdog
+    if threshold <= 0:
+        return None
+    if _watchdog is None:
+        _watchdog = LoopWatchdog(threshold)
+    _watchdog.start()
+    return _watchdog
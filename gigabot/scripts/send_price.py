@@ -1,29 +1,46 @@
-import aiohttp
-from discord import Webhook
-import sys
+"""
+Entrypoint of the gigabot-task job: posts the price of ``SYMBOL`` to ``DISCORD_WEBHOOK``.
+
+The job runs once per CronJob tick, so its start-up time is paid on every run.
+Nothing is constructed at import time, and the imports stay clear of py-cord,
+requests and NumPy: the embed is posted as a plain payload through the
+webhook dispatcher.
+"""
+
+import asyncio
 import os
+from typing import Optional
+
+from gigabot.adapters import http_client
+from gigabot.adapters.request_context import Priority, request_context
 from gigabot.bot.config import Config
+from gigabot.services.notification_service import get_notification_service
 from gigabot.services.price_service import PriceService
 
-conf = Config()
-price_service = PriceService()
 
-async def send_message_via_webhook(symbol):
+async def send_message_via_webhook(symbol, price_service: Optional[PriceService] = None):
     print(f"Querying price for {symbol} symbol")
-                
-    _, embed = await price_service.fetch_cryptocurrency_data(symbol)
-    # Create an aiohttp session
-    async with aiohttp.ClientSession() as session:
-        # Create a webhook instance from the URL stored in your config
-        webhook = Webhook.from_url(conf.DISCORD_WEBHOOK, session=session)
-        # Send a message using the webhook
-        await webhook.send(embed=embed, username="GIGABOT")
+    price_service = price_service or PriceService()
+
+    lookup = await price_service.fetch_cryptocurrency_data(symbol)
+    if not lookup.ok:
+        print(f"Failed to fetch price for {symbol}: {lookup.error}")
+        return
+
+    embed = price_service.format_embed(lookup.coin_info, lookup.quote, lookup.stale)
+    await get_notification_service().send(Config().DISCORD_WEBHOOK, [embed])
+
 
 async def main():
     symbol = os.getenv('SYMBOL')
-    await send_message_via_webhook(symbol)
+    try:
+        with request_context(priority=Priority.SCHEDULED):
+            await send_message_via_webhook(symbol)
+    finally:
+        await http_client.close_all()
+        await get_notification_service().close()
 
 
-import asyncio
-# Run the main function in an asyncio event loop
-asyncio.run(main())
+if __name__ == "__main__":
+    # Run the main function in an asyncio event loop
+    asyncio.run(main())
@@ -0,0 +1,331 @@
+import asyncio
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from logging import getLogger
+from typing import Dict, List, Optional, Tuple
+
+import discord
+
+from gigabot.adapters.alert_store import AlertStore
+from gigabot.adapters.batching import DexScreenerBatcher, get_dex_screener_batcher
+from gigabot.adapters.errors import UpstreamTimeout, UpstreamUnavailable
+from gigabot.adapters.models.dex_screener_models import Pair
+from gigabot.adapters.models.price_alert import PriceAlert
+from gigabot.bot.config import Config
+from gigabot.services.notification_service import NotificationService, get_notification_service
+from gigabot.services.price_history import PriceHistory, get_price_history
+from gigabot.services.price_service import PriceService
+
+logger = getLogger(__name__)
+
+ABOVE = "above"
+BELOW = "below"
+
+
+class SortedThresholds:
+    """
+    Thresholds of one token and direction, kept sorted so that the alerts crossed
+    by a price are always at the end of the lists: they are found by bisection
+    and removed without shifting the others, in O(log n + k).
+
+    "above" thresholds fire once the price rises to them, so they are kept in
+    descending order (stored negated, to bisect an ascending list); "below"
+    thresholds are kept in ascending order.
+    """
+
+    def __init__(self, direction: str):
+        self.direction = direction
+        self._sign = -1 if direction == ABOVE else 1
+        self._keys: List[float] = []
+        self.alert_ids: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def thresholds(self) -> List[float]:
+        return [key * self._sign for key in self._keys]
+
+    def add(self, threshold: float, alert_id: int):
+        key = threshold * self._sign
+        index = bisect_right(self._keys, key)
+        self._keys.insert(index, key)
+        self.alert_ids.insert(index, alert_id)
+
+    def remove(self, threshold: float, alert_id: int) -> bool:
+        key = threshold * self._sign
+        index = bisect_left(self._keys, key)
+        while index < len(self._keys) and self._keys[index] == key:
+            if self.alert_ids[index] == alert_id:
+                del self._keys[index]
+                del self.alert_ids[index]
+                return True
+            index += 1
+        return False
+
+    def pop_crossed(self, price: float) -> List[int]:
+        """
+        Removes and returns the alerts crossed by ``price``: the "above" alerts
+        whose threshold is lower than or equal to it, or the "below" alerts whose
+        threshold is greater than or equal to it.
+        """
+        index = bisect_left(self._keys, price * self._sign)
+        alert_ids = self.alert_ids[index:]
+        del self._keys[index:]
+        del self.alert_ids[index:]
+        return alert_ids
+
+
+class ThresholdIndex:
+    """
+    Per-token sorted threshold structures for "above" and "below" alerts.
+
+    Tokens are matched on their normalized address (see ``DexScreenerBatcher._key``)
+    but the address the first alert was created with is kept, since Solana
+    addresses must be sent upstream in their original case.
+    """
+
+    def __init__(self):
+        self._tokens: Dict[str, Tuple[str, SortedThresholds, SortedThresholds]] = {}
+
+    _key = staticmethod(DexScreenerBatcher._key)
+
+    def add(self, alert: PriceAlert):
+        _, above, below = self._tokens.setdefault(
+            self._key(alert.token_address), (alert.token_address, SortedThresholds(ABOVE), SortedThresholds(BELOW))
+        )
+        (above if alert.direction == ABOVE else below).add(alert.threshold, alert.id)
+
+    def remove(self, alert: PriceAlert):
+        key = self._key(alert.token_address)
+        thresholds = self._tokens.get(key)
+        if thresholds is None:
+            return
+        _, above, below = thresholds
+        (above if alert.direction == ABOVE else below).remove(alert.threshold, alert.id)
+        if not above and not below:
+            del self._tokens[key]
+
+    def tokens(self) -> List[str]:
+        """
+        Returns the address of every watched token, in its original case.
+        """
+        return [address for address, _, _ in self._tokens.values()]
+
+    def crossed(self, token_address: str, price: float) -> List[int]:
+        """
+        Removes and returns every alert of a token triggered by ``price``.
+        """
+        key = self._key(token_address)
+        thresholds = self._tokens.get(key)
+        if thresholds is None:
+            return []
+        _, above, below = thresholds
+        alert_ids = above.pop_crossed(price) + below.pop_crossed(price)
+        if not above and not below:
+            del self._tokens[key]
+        return alert_ids
+
+
+class AlertEngine:
+    """
+    Evaluates price alerts against batched DexScreener prices.
+
+    On every tick the prices of all watched tokens are fetched with as few
+    multi-address requests as possible, the crossed alerts of each token are found
+    in its threshold index, and the notifications are posted grouped by webhook.
+    Alerts are one-shot: they are removed once triggered.
+    """
+
+    def __init__(
+        self,
+        store: AlertStore,
+        batcher: Optional[DexScreenerBatcher] = None,
+        price_service: Optional[PriceService] = None,
+        notifications: Optional[NotificationService] = None,
+        price_history: Optional[PriceHistory] = None,
+    ):
+        """
+        Args:
+            store (AlertStore): Durable store of the alerts.
+            batcher (DexScreenerBatcher): Batcher used to fetch token prices.
+            price_service (PriceService): Service used to resolve symbols.
+            notifications (NotificationService): Service used to post the alerts.
+            price_history (PriceHistory): History every fetched price is recorded in.
+        """
+        self.store = store
+        self.batcher = batcher or get_dex_screener_batcher()
+        self.price_service = price_service or PriceService()
+        self.notifications = notifications or get_notification_service()
+        self.price_history = price_history or get_price_history()
+        self.index = ThresholdIndex()
+        self._symbols: Dict[str, str] = {}
+        self._alerts: Dict[int, PriceAlert] = {}
+        self._task: Optional[asyncio.Task] = None
+        for alert in store.list():
+            self._register(alert)
+
+    def _register(self, alert: PriceAlert):
+        self._alerts[alert.id] = alert
+        self._symbols[self.index._key(alert.token_address)] = alert.symbol
+        self.index.add(alert)
+
+    async def add_alert(
+        self,
+        symbol: str,
+        direction: str,
+        threshold: float,
+        webhook_url: str,
+        guild_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+    ) -> PriceAlert:
+        """
+        Registers an alert for a symbol.
+
+        Raises:
+            ValueError: If the direction or threshold is invalid.
+            TokenNotFound: If no supported DEX pair was found for the symbol.
+        """
+        direction = direction.lower()
+        if direction not in (ABOVE, BELOW):
+            raise ValueError(f"direction must be '{ABOVE}' or '{BELOW}'")
+        if threshold <= 0:
+            raise ValueError("price must be greater than 0")
+
+        token_address = await self.price_service.find_token_address(symbol)
+        alert = self.store.add(PriceAlert(
+            id=None,
+            symbol=symbol.upper(),
+            token_address=token_address,
+            direction=direction,
+            threshold=threshold,
+            webhook_url=webhook_url,
+            guild_id=guild_id,
+            user_id=user_id,
+        ))
+        self._register(alert)
+        return alert
+
+    def remove_alert(self, alert_id: int, guild_id: int) -> bool:
+        """
+        Removes an alert if it belongs to ``guild_id``.
+
+        Returns:
+            bool: Whether the alert existed in the guild and was removed.
+        """
+        alert = self._alerts.get(alert_id)
+        if alert is None or alert.guild_id != guild_id:
+            return False
+        del self._alerts[alert_id]
+        self.index.remove(alert)
+        self.store.delete_many([alert_id])
+        return True
+
+    def list_alerts(self, guild_id: int) -> List[PriceAlert]:
+        return [alert for alert in self._alerts.values() if alert.guild_id == guild_id]
+
+    @staticmethod
+    def best_price(pairs: List[Pair]) -> Optional[Tuple[float, Pair]]:
+        """
+        Returns the USD price of the most liquid pair with a USD price.
+        """
+        priced = [pair for pair in pairs if pair.priceUsd]
+        if not priced:
+            return None
+        pair = max(priced, key=lambda pair: (pair.liquidity or {}).get("usd") or 0)
+        return float(pair.priceUsd), pair
+
+    async def run_tick(self):
+        """
+        Fetches the prices of every watched token and fires the crossed alerts.
+        """
+        tokens = self.index.tokens()
+        if not tokens:
+            return
+
+        try:
+            pairs_by_token = await self.batcher.get_tokens(tokens)
+        except (UpstreamTimeout, UpstreamUnavailable) as e:
+            logger.warning(f"Skipped price alert tick: {e}")
+            return
+
+        fired_by_webhook = defaultdict(list)
+        for token_address, pairs in pairs_by_token.items():
+            best = self.best_price(pairs)
+            if best is None:
+                continue
+            price, pair = best
+            self.price_history.record(
+                self._symbols.get(self.index._key(token_address), pair.baseToken.symbol), price
+            )
+            for alert_id in self.index.crossed(token_address, price):
+                alert = self._alerts.pop(alert_id)
+                fired_by_webhook[alert.webhook_url].append((alert, self.format_alert(alert, price, pair)))
+
+        if not fired_by_webhook:
+            return
+
+        webhook_urls = list(fired_by_webhook)
+        posted = await asyncio.gather(*(
+            self.notifications.send(webhook_url, [embed for _, embed in fired_by_webhook[webhook_url]])
+            for webhook_url in webhook_urls
+        ), return_exceptions=True)
+
+        # Alerts are only deleted once posted; the others fire again on the next tick.
+        fired = []
+        for webhook_url, sent in zip(webhook_urls, posted):
+            alerts = [alert for alert, _ in fired_by_webhook[webhook_url]]
+            if sent is True:
+                fired.extend(alert.id for alert in alerts)
+                continue
+            logger.warning(f"Failed to post {len(alerts)} price alerts, keeping them for the next tick")
+            for alert in alerts:
+                self._register(alert)
+        if fired:
+            await asyncio.to_thread(self.store.delete_many, fired)
+        logger.info(f"Fired {len(fired)} price alerts over {len(tokens)} tokens")
+
+    def format_alert(self, alert: PriceAlert, price: float, pair: Pair) -> discord.Embed:
+        embed = discord.Embed(
+            title=f"{alert.symbol} is {alert.direction} {alert.threshold} USD",
+            description=f"Alert #{alert.id} was triggered.",
+            color=discord.Colour.green() if alert.direction == ABOVE else discord.Colour.red(),
+            url=pair.url,
+        )
+        embed.add_field(name="Price", value=f"`{price} USD`", inline=True)
+        embed.add_field(name="Threshold", value=f"`{alert.threshold} USD`", inline=True)
+        if alert.user_id:
+            embed.add_field(name="Requested by", value=f"<@{alert.user_id}>", inline=True)
+        embed.set_footer(text="Thanks for using our bot.")
+        return embed
+
+    async def run_forever(self, interval: float):
+        """
+        Runs a tick every ``interval`` seconds.
+        """
+        while True:
+            try:
+                await self.run_tick()
+            except Exception:
+                logger.exception("Price alert tick failed")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float):
+        """
+        Starts the engine on the running event loop, unless already running.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run_forever(interval))
+
+
+_alert_engine: Optional[AlertEngine] = None
+
+
+def get_alert_engine() -> AlertEngine:
+    """
+    Returns the process-wide alert engine.
+    """
+    global _alert_engine
+    if _alert_engine is None:
+        _alert_engine = AlertEngine(AlertStore(Config().ALERT_STORE_PATH))
+    return _alert_engine
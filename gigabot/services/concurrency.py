@@ -0,0 +1,68 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from gigabot.adapters.errors import UpstreamTimeout
+from gigabot.adapters.request_context import bound_timeout
+
+
+async def run_with_deadline(name: str, call: Awaitable, timeout: Optional[float]) -> Any:
+    """
+    Awaits a single upstream call, bounding it by its own deadline and by the
+    deadline of the current request, whichever comes first. The call is
+    cancelled when it misses it.
+
+    Args:
+        name (str): Name of the call, used in the timeout error.
+        call (Awaitable): The call to await.
+        timeout (float): Deadline in seconds, None to only use the request deadline.
+
+    Returns:
+        Any: The result of the call.
+
+    Raises:
+        UpstreamTimeout: If the call did not complete before the deadline.
+    """
+    bounded = bound_timeout(timeout)
+    try:
+        return await asyncio.wait_for(call, bounded)
+    except asyncio.TimeoutError:
+        if timeout is not None and bounded >= timeout:
+            raise UpstreamTimeout(f"{name} did not complete within {timeout}s")
+        raise UpstreamTimeout(f"{name} did not complete in time")
+
+
+async def run_concurrently(
+    calls: Dict[str, Tuple[Callable[[], Awaitable], float]]
+) -> Dict[str, Any]:
+    """
+    Runs independent upstream calls at the same time.
+
+    Each call gets its own deadline. As soon as one of them fails (or misses its
+    deadline) every other call still in flight is cancelled and the failure is
+    re-raised.
+
+    Args:
+        calls (dict): Maps a call name to a ``(factory, timeout)`` tuple, where
+            ``factory`` returns the awaitable to run.
+
+    Returns:
+        dict: Maps each call name to its result.
+    """
+    tasks = {
+        name: asyncio.ensure_future(run_with_deadline(name, factory(), timeout))
+        for name, (factory, timeout) in calls.items()
+    }
+    try:
+        done, _ = await asyncio.wait(
+            tasks.values(), return_when=asyncio.FIRST_EXCEPTION
+        )
+        for task in done:
+            if task.exception() is not None:
+                raise task.exception()
+        return {name: task.result() for name, task in tasks.items()}
+    finally:
+        pending = [task for task in tasks.values() if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
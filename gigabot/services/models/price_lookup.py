@@ -0,0 +1,30 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+from gigabot.adapters.models.coin_info import CoinInfo
+from gigabot.adapters.models.crypto_quote import CryptocurrencyQuote
+from gigabot.adapters.models.dex_screener_models import Pair
+
+COINMARKETCAP = "coinmarketcap"
+DEXSCREENER = "dexscreener"
+
+@dataclass
+class PriceLookup:
+    symbol: str
+    token_address: Optional[str] = None
+    coin_id: Optional[int] = None
+    quote: Optional[CryptocurrencyQuote] = None
+    coin_info: Optional[CoinInfo] = None
+    error: Optional[str] = None
+    # Whether the quote is the last known one, served because CoinMarketCap is unavailable.
+    stale: bool = False
+    # Hedged lookups answered by DexScreener: the pair, the CoinMarketCap lookup
+    # still running (resolving to ``(coin_id, quote, coin_info)``), or why it failed.
+    source: str = COINMARKETCAP
+    pair: Optional[Pair] = None
+    pending: Optional[asyncio.Future] = None
+    coinmarketcap_error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
@@ -0,0 +1,292 @@
+import asyncio
+import random
+import time
+from collections import deque
+from logging import getLogger
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple, Union
+
+import aiohttp
+
+from gigabot.adapters.http_client import discard_session
+from gigabot.observability.metrics import REGISTRY, UPSTREAM_LATENCY, UPSTREAM_RESPONSES
+
+if TYPE_CHECKING:
+    import discord
+
+logger = getLogger(__name__)
+
+# A discord.Embed, or its payload as a dict. Accepting plain payloads lets the
+# gigabot-task job post without importing py-cord.
+Embed = Union["discord.Embed", dict]
+
+
+def embed_to_dict(embed: Embed) -> dict:
+    return embed if isinstance(embed, dict) else embed.to_dict()
+
+
+def embed_size(embed: Embed) -> int:
+    """
+    Returns the number of characters Discord counts against the per-message limit.
+    """
+    if not isinstance(embed, dict):
+        return len(embed)
+    return (
+        len(embed.get("title") or "")
+        + len(embed.get("description") or "")
+        + sum(len(field.get("name") or "") + len(field.get("value") or "") for field in embed.get("fields") or ())
+        + len((embed.get("footer") or {}).get("text") or "")
+        + len((embed.get("author") or {}).get("name") or "")
+    )
+
+
+class WebhookRateLimited(Exception):
+    def __init__(self, retry_after: float, is_global: bool):
+        super().__init__(f"Rate limited for {retry_after:.2f}s")
+        self.retry_after = retry_after
+        self.is_global = is_global
+
+
+class WebhookRejected(Exception):
+    """
+    Raised when Discord refuses a message for good (bad payload, deleted webhook).
+    """
+
+
+class NotificationService:
+    """
+    Posts embeds to Discord webhooks over one long-lived HTTP session.
+
+    Every webhook has its own queue drained by one worker. The worker packs the
+    queued embeds into as few messages as Discord allows, paces its sends from
+    the ``X-RateLimit-*`` headers of the previous response so that the bucket is
+    never exceeded, and retries failed sends with exponential backoff. Embeds
+    sent to the same webhook by concurrent callers (scheduled posts and alerts
+    of the same minute) therefore share messages.
+    """
+
+    # Discord accepts at most 10 embeds, totalling 6000 characters, per webhook message.
+    MAX_EMBEDS_PER_MESSAGE = 10
+    MAX_EMBED_CHARACTERS = 6000
+
+    MAX_ATTEMPTS = 5
+    BACKOFF_BASE = 0.5
+    BACKOFF_MAX = 30
+    # Seconds an idle webhook worker waits for new embeds before exiting.
+    IDLE_TIMEOUT = 60
+
+    def __init__(self, username: str = "GIGABOT", timeout: float = 10):
+        self.username = username
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queues: Dict[str, Deque[Tuple[Embed, asyncio.Future]]] = {}
+        self._wakeups: Dict[str, asyncio.Event] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        # Monotonic time before which a webhook, or every webhook, must not be called.
+        self._paused_until: Dict[str, float] = {}
+        self._global_paused_until = 0.0
+        self.messages = 0
+        self.embeds = 0
+        # Embeds given up on after the retries, or rejected by Discord.
+        self.dropped = 0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            discard_session(self._session, self._loop, "discord")
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=10, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._loop = loop
+            # Queues and workers are bound to the loop they were created on.
+            self._queues.clear()
+            self._wakeups.clear()
+            self._workers.clear()
+        return self._session
+
+    async def send(self, webhook_url: str, embeds: List[Embed]) -> bool:
+        """
+        Queues embeds for a webhook and waits until they were posted, packing them
+        with the other embeds queued for it into as few messages as allowed.
+
+        Args:
+            webhook_url (str): The Discord webhook URL.
+            embeds (list): The embeds to post, as discord.Embed or payload dicts.
+
+        Returns:
+            bool: Whether every embed was posted. Embeds that could not be posted
+            are dropped, and it is up to the caller to send them again.
+        """
+        if not embeds:
+            return True
+        self._get_session()
+        queue = self._queues.setdefault(webhook_url, deque())
+        wakeup = self._wakeups.setdefault(webhook_url, asyncio.Event())
+        loop = asyncio.get_running_loop()
+        futures = []
+        for embed in embeds:
+            future = loop.create_future()
+            queue.append((embed, future))
+            futures.append(future)
+        wakeup.set()
+        worker = self._workers.get(webhook_url)
+        if worker is None or worker.done():
+            self._workers[webhook_url] = loop.create_task(self._drain(webhook_url, queue, wakeup))
+        return all(await asyncio.gather(*futures))
+
+    def _next_message(self, queue: Deque) -> List[Tuple[Embed, asyncio.Future]]:
+        message = []
+        characters = 0
+        while queue and len(message) < self.MAX_EMBEDS_PER_MESSAGE:
+            size = embed_size(queue[0][0])
+            if message and characters + size > self.MAX_EMBED_CHARACTERS:
+                break
+            message.append(queue.popleft())
+            characters += size
+        return message
+
+    async def _drain(self, webhook_url: str, queue: Deque, wakeup: asyncio.Event):
+        while True:
+            if not queue:
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), self.IDLE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    if not queue:
+                        self._queues.pop(webhook_url, None)
+                        self._wakeups.pop(webhook_url, None)
+                        self._workers.pop(webhook_url, None)
+                        self._paused_until.pop(webhook_url, None)
+                        return
+            # Let the callers of this loop iteration queue their embeds too.
+            await asyncio.sleep(0)
+            message = self._next_message(queue)
+            posted = False
+            try:
+                await self._post_with_retries(webhook_url, [embed for embed, _ in message])
+                posted = True
+            except Exception as e:
+                self.dropped += len(message)
+                logger.error(f"Failed to post {len(message)} embeds to webhook: {e}")
+            finally:
+                # Callers are not failed, only told whether their embeds were posted.
+                for _, future in message:
+                    if not future.done():
+                        future.set_result(posted)
+
+    async def _post_with_retries(self, webhook_url: str, embeds: List[Embed]):
+        attempt = 0
+        while True:
+            await self._wait_for_bucket(webhook_url)
+            try:
+                await self._post(webhook_url, embeds)
+                self.messages += 1
+                self.embeds += len(embeds)
+                return
+            except WebhookRateLimited as e:
+                # Waiting out a 429 is not a failed attempt.
+                logger.warning(f"Webhook rate limited, retrying in {e.retry_after:.2f}s")
+                continue
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                attempt += 1
+                if attempt >= self.MAX_ATTEMPTS:
+                    raise
+                delay = min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2 ** (attempt - 1))
+                delay = random.uniform(delay / 2, delay)
+                logger.warning(f"Webhook post failed ({e}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def _wait_for_bucket(self, webhook_url: str):
+        while True:
+            delay = max(self._paused_until.get(webhook_url, 0.0), self._global_paused_until) - time.monotonic()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    async def _post(self, webhook_url: str, embeds: List[Embed]):
+        payload = {"username": self.username, "embeds": [embed_to_dict(embed) for embed in embeds]}
+        status = "error"
+        start = time.perf_counter()
+        try:
+            async with self._get_session().post(webhook_url, json=payload) as response:
+                status = response.status
+                body = await response.read()
+                self._update_bucket(webhook_url, response)
+                if response.status == 429:
+                    retry_after, is_global = self._retry_after(webhook_url, response)
+                    raise WebhookRateLimited(retry_after, is_global)
+                if response.status >= 500:
+                    raise aiohttp.ClientResponseError(
+                        response.request_info,
+                        response.history,
+                        status=response.status,
+                        message=body[:200].decode(errors="replace"),
+                    )
+                if response.status >= 400:
+                    # Client errors (bad payload, deleted webhook) are not retried.
+                    raise WebhookRejected(f"Webhook rejected the message with {response.status}: {body[:200]!r}")
+        except asyncio.TimeoutError:
+            status = "timeout"
+            raise
+        finally:
+            UPSTREAM_RESPONSES.labels("discord", status).inc()
+            UPSTREAM_LATENCY.labels("discord", "webhook").observe(time.perf_counter() - start)
+
+    def _update_bucket(self, webhook_url: str, response: aiohttp.ClientResponse):
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset_after = response.headers.get("X-RateLimit-Reset-After")
+        if remaining is not None and reset_after is not None and int(remaining) == 0:
+            self._paused_until[webhook_url] = time.monotonic() + float(reset_after)
+
+    def _retry_after(self, webhook_url: str, response: aiohttp.ClientResponse) -> Tuple[float, bool]:
+        retry_after = float(
+            response.headers.get("X-RateLimit-Reset-After") or response.headers.get("Retry-After") or 1
+        )
+        is_global = response.headers.get("X-RateLimit-Global", "").lower() == "true"
+        until = time.monotonic() + retry_after
+        if is_global:
+            self._global_paused_until = until
+        else:
+            self._paused_until[webhook_url] = until
+        return retry_after, is_global
+
+    async def close(self):
+        for worker in self._workers.values():
+            worker.cancel()
+        for queue in self._queues.values():
+            for _, future in queue:
+                if not future.done():
+                    future.set_result(False)
+        self._workers.clear()
+        self._queues.clear()
+        self._wakeups.clear()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+
+_notification_service: Optional[NotificationService] = None
+
+
+REGISTRY.callback(
+    "gigabot_webhook_embeds",
+    "Embeds handed to Discord webhooks, by result.",
+    ("result",),
+    lambda: [] if _notification_service is None else [
+        (("sent",), _notification_service.embeds),
+        (("dropped",), _notification_service.dropped),
+    ],
+    type="counter",
+)
+
+
+def get_notification_service() -> NotificationService:
+    """
+    Returns the process-wide notification service.
+    """
+    global _notification_service
+    if _notification_service is None:
+        _notification_service = NotificationService()
+    return _notification_service
@@ -0,0 +1,232 @@
+import math
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+from gigabot.bot.config import Config
+
+_numpy = None
+_numpy_loaded = False
+
+
+def load_numpy():
+    """
+    Imports NumPy on first use rather than at import time, which processes that
+    never compute statistics (such as the gigabot-task job) would pay for.
+
+    Returns:
+        module: NumPy, or None if it is not installed. NumPy is optional, the
+        pure Python path gives the same results.
+    """
+    global _numpy, _numpy_loaded
+    if not _numpy_loaded:
+        try:
+            import numpy as _numpy
+        except ImportError:
+            _numpy = None
+        _numpy_loaded = True
+    return _numpy
+
+
+@dataclass
+class WindowStats:
+    count: int
+    first: float
+    last: float
+    min: float
+    max: float
+    percent_change: float
+    volatility: Optional[float]
+
+
+class PriceRingBuffer:
+    """
+    Fixed-memory rolling price history of one symbol.
+
+    Timestamps and prices are stored in two preallocated ``array('d')`` columns
+    used as a ring buffer: once ``capacity`` points are held, every new point
+    overwrites the oldest one. Window statistics are computed over memoryview
+    slices of the columns (wrapped by NumPy without copying when it is
+    installed); only a window wrapping around the end of the buffer is copied.
+    """
+
+    __slots__ = ("capacity", "timestamps", "prices", "_start", "_size")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.prices = array("d", bytes(8 * capacity))
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_timestamp(self) -> Optional[float]:
+        if not self._size:
+            return None
+        return self.timestamps[(self._start + self._size - 1) % self.capacity]
+
+    def append(self, timestamp: float, price: float) -> bool:
+        """
+        Appends a point, ignoring points not newer than the last one.
+
+        Returns:
+            bool: Whether the point was appended.
+        """
+        last_timestamp = self.last_timestamp
+        if last_timestamp is not None and timestamp <= last_timestamp:
+            return False
+        index = (self._start + self._size) % self.capacity
+        self.timestamps[index] = timestamp
+        self.prices[index] = price
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+        return True
+
+    def columns(self) -> Tuple[Sequence[float], Sequence[float]]:
+        """
+        Returns the timestamp and price columns in chronological order, as views
+        of the buffer unless they wrap around its end.
+        """
+        end = self._start + self._size
+        if end <= self.capacity:
+            return memoryview(self.timestamps)[self._start:end], memoryview(self.prices)[self._start:end]
+        wrapped = end - self.capacity
+        return (
+            self.timestamps[self._start:] + self.timestamps[:wrapped],
+            self.prices[self._start:] + self.prices[:wrapped],
+        )
+
+    def window(self, seconds: float, now: Optional[float] = None) -> Tuple[Sequence[float], Sequence[float]]:
+        """
+        Returns the timestamps and prices of the last ``seconds`` seconds.
+        """
+        now = time.time() if now is None else now
+        timestamps, prices = self.columns()
+        start = bisect_left(timestamps, now - seconds)
+        return timestamps[start:], prices[start:]
+
+    def stats(self, seconds: float, now: Optional[float] = None) -> Optional[WindowStats]:
+        """
+        Computes min, max, percent change and volatility over the last ``seconds``.
+
+        Volatility is the sample standard deviation of the point-to-point returns,
+        in percent. Returns from a zero price are skipped, and volatility is None
+        with fewer than two returns.
+
+        Returns:
+            WindowStats: The statistics, or None if the window holds no point.
+        """
+        _, prices = self.window(seconds, now)
+        if not prices:
+            return None
+
+        first, last = prices[0], prices[-1]
+        percent_change = (last - first) / first * 100 if first else 0.0
+
+        volatility = None
+        np = load_numpy()
+        if np is not None:
+            values = np.frombuffer(prices, dtype=np.float64)
+            low, high = float(values.min()), float(values.max())
+            previous = values[:-1]
+            nonzero = previous != 0
+            returns = np.diff(values)[nonzero] / previous[nonzero]
+            if len(returns) >= 2:
+                volatility = float(returns.std(ddof=1) * 100)
+        else:
+            low, high = min(prices), max(prices)
+            returns = [(b - a) / a for a, b in zip(prices, prices[1:]) if a]
+            if len(returns) >= 2:
+                mean = sum(returns) / len(returns)
+                volatility = math.sqrt(sum((r - mean) ** 2 for r in returns) / (len(returns) - 1)) * 100
+
+        return WindowStats(
+            count=len(prices),
+            first=first,
+            last=last,
+            min=low,
+            max=high,
+            percent_change=percent_change,
+            volatility=volatility,
+        )
+
+
+class PriceHistory:
+    """
+    Rolling price histories of every tracked symbol.
+
+    At most ``max_symbols`` symbols are tracked; the least recently updated one is
+    dropped when a new symbol comes in.
+    """
+
+    def __init__(self, capacity: int, max_symbols: int):
+        """
+        Args:
+            capacity (int): Number of points kept per symbol.
+            max_symbols (int): Maximum number of symbols tracked.
+        """
+        self.capacity = capacity
+        self.max_symbols = max_symbols
+        self._buffers: "OrderedDict[str, PriceRingBuffer]" = OrderedDict()
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._buffers
+
+    def record(self, symbol: str, price: Optional[float], timestamp: Optional[float] = None) -> bool:
+        """
+        Appends a price point to the history of a symbol.
+
+        Args:
+            symbol (str): The symbol.
+            price (float): The USD price; ignored if None.
+            timestamp (float): Unix time of the price, defaults to now.
+
+        Returns:
+            bool: Whether the point was appended.
+        """
+        if price is None:
+            return False
+        key = symbol.upper()
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = PriceRingBuffer(self.capacity)
+            self._buffers[key] = buffer
+            while len(self._buffers) > self.max_symbols:
+                self._buffers.popitem(last=False)
+        else:
+            self._buffers.move_to_end(key)
+        return buffer.append(time.time() if timestamp is None else timestamp, float(price))
+
+    def get(self, symbol: str) -> Optional[PriceRingBuffer]:
+        return self._buffers.get(symbol.upper())
+
+    def stats(self, symbol: str, seconds: float, now: Optional[float] = None) -> Optional[WindowStats]:
+        """
+        Computes window statistics for a symbol from its local history.
+        """
+        buffer = self.get(symbol)
+        if buffer is None:
+            return None
+        return buffer.stats(seconds, now)
+
+
+_price_history: Optional[PriceHistory] = None
+
+
+def get_price_history() -> PriceHistory:
+    """
+    Returns the process-wide price history.
+    """
+    global _price_history
+    if _price_history is None:
+        config = Config()
+        _price_history = PriceHistory(config.PRICE_HISTORY_CAPACITY, config.PRICE_HISTORY_MAX_SYMBOLS)
+    return _price_history
@@ -0,0 +1,181 @@
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from logging import getLogger
+from typing import Dict, List, Optional
+
+from gigabot.adapters.models.price_schedule import PriceSchedule
+from gigabot.adapters.request_context import Priority, new_correlation_id, request_context
+from gigabot.adapters.schedule_store import ScheduleStore
+from gigabot.bot.config import Config
+from gigabot.services.notification_service import NotificationService, get_notification_service
+from gigabot.services.price_service import PriceService
+
+logger = getLogger(__name__)
+
+
+class PriceScheduler:
+    """
+    Posts scheduled price updates from inside the bot process.
+
+    Schedules are stored durably and kept in memory. Once a minute, every schedule
+    due in that minute is collected and all of their quotes and coin infos are
+    fetched together through the batched caches, then the embeds are posted
+    grouped by webhook. This replaces one Kubernetes CronJob (and one pod start)
+    per symbol and tick.
+    """
+
+    def __init__(
+        self,
+        store: ScheduleStore,
+        price_service: Optional[PriceService] = None,
+        notifications: Optional[NotificationService] = None,
+    ):
+        """
+        Args:
+            store (ScheduleStore): Durable store of the schedules.
+            price_service (PriceService): Service used to resolve and render prices.
+            notifications (NotificationService): Service used to post the embeds.
+        """
+        self.store = store
+        self.price_service = price_service or PriceService()
+        self.notifications = notifications or get_notification_service()
+        self._schedules: Dict[str, PriceSchedule] = {
+            schedule.name: schedule for schedule in store.list()
+        }
+        self._task: Optional[asyncio.Task] = None
+        self._ticks = set()
+
+    def add(self, schedule: PriceSchedule):
+        """
+        Adds or replaces a schedule.
+
+        Raises:
+            ValueError: If the schedule would never fire.
+        """
+        if not 0 <= schedule.hour < 24 or not 0 <= schedule.minute < 60:
+            raise ValueError("minute must be between 0 and 59 and hour between 0 and 23")
+        if schedule.hour == 0 and schedule.minute == 0:
+            raise ValueError("minute must be greater than 0 when hour is 0")
+        self.store.save(schedule)
+        self._schedules[schedule.name] = schedule
+
+    def remove(self, name: str) -> bool:
+        """
+        Removes a schedule.
+
+        Returns:
+            bool: Whether the schedule existed.
+        """
+        self._schedules.pop(name, None)
+        return self.store.delete(name)
+
+    def list(self) -> List[PriceSchedule]:
+        return sorted(self._schedules.values(), key=lambda schedule: schedule.name)
+
+    def due(self, now: datetime) -> List[PriceSchedule]:
+        return [
+            schedule
+            for schedule in self._schedules.values()
+            if schedule.is_due(now.minute, now.hour)
+        ]
+
+    async def run_tick(self, now: datetime):
+        """
+        Posts the prices of every schedule due at ``now``.
+        """
+        due = self.due(now)
+        if not due:
+            return
+
+        await self._resolve_coin_ids(due)
+        due = [schedule for schedule in due if schedule.coin_id is not None]
+        coin_ids = [schedule.coin_id for schedule in due]
+
+        quotes, coin_infos = await asyncio.gather(
+            self.price_service.quote_cache.get_many(coin_ids),
+            self.price_service.coin_info_cache.warm(coin_ids),
+        )
+
+        embeds_by_webhook = defaultdict(list)
+        for schedule in due:
+            quote = quotes.get(schedule.coin_id)
+            coin_info = coin_infos.get(schedule.coin_id)
+            if quote is None or coin_info is None:
+                logger.error(f"No price available for scheduled symbol {schedule.symbol}")
+                continue
+            self.price_service.record_quote(schedule.symbol, quote)
+            embeds_by_webhook[schedule.webhook_url].append(
+                self.price_service.format_embed(
+                    coin_info, quote, self.price_service.quote_cache.is_stale(schedule.coin_id)
+                )
+            )
+
+        await asyncio.gather(*(
+            self.notifications.send(webhook_url, embeds)
+            for webhook_url, embeds in embeds_by_webhook.items()
+        ))
+        logger.info(f"Posted {len(due)} scheduled prices at {now:%H:%M}")
+
+    async def _resolve_coin_ids(self, schedules: List[PriceSchedule]):
+        await asyncio.gather(*(
+            self._resolve_coin_id(schedule)
+            for schedule in schedules
+            if schedule.coin_id is None
+        ))
+
+    async def _resolve_coin_id(self, schedule: PriceSchedule):
+        try:
+            schedule.token_address = await self.price_service.find_token_address(schedule.symbol)
+            schedule.coin_id = await self.price_service.resolve_coin_id(
+                schedule.symbol, schedule.token_address
+            )
+        except Exception as e:
+            logger.error(f"Failed to resolve scheduled symbol {schedule.symbol}: {e}")
+            return
+        self.store.save(schedule)
+
+    async def run_forever(self):
+        """
+        Runs a tick at the start of every minute (UTC, like the CronJob controller).
+        """
+        last_minute = None
+        while True:
+            now = datetime.now(timezone.utc)
+            next_minute = (now + timedelta(minutes=1)).replace(second=0, microsecond=0)
+            if next_minute == last_minute:
+                # Woken up just before the boundary by the monotonic sleep: that
+                # minute already ran.
+                next_minute += timedelta(minutes=1)
+            await asyncio.sleep((next_minute - now).total_seconds())
+            last_minute = next_minute
+            tick = asyncio.ensure_future(self._safe_tick(next_minute))
+            self._ticks.add(tick)
+            tick.add_done_callback(self._ticks.discard)
+
+    async def _safe_tick(self, now: datetime):
+        try:
+            with request_context(priority=Priority.SCHEDULED, correlation_id=new_correlation_id()):
+                await self.run_tick(now)
+        except Exception:
+            logger.exception(f"Scheduled price tick at {now:%H:%M} failed")
+
+    def start(self):
+        """
+        Starts the scheduler on the running event loop, unless already running.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run_forever())
+
+
+_price_scheduler: Optional[PriceScheduler] = None
+
+
+def get_price_scheduler() -> PriceScheduler:
+    """
+    Returns the process-wide price scheduler.
+    """
+    global _price_scheduler
+    if _price_scheduler is None:
+        _price_scheduler = PriceScheduler(ScheduleStore(Config().SCHEDULE_STORE_PATH))
+    return _price_scheduler
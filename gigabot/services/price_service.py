@@ -1,73 +1,390 @@
-import discord
+import asyncio
+from typing import Optional, Tuple
+
+from gigabot.adapters.batching import get_dex_screener_batcher
+from gigabot.adapters.cache import STALE_IF_ERROR, SingleFlight, TTLCache, get_coin_info_cache, get_quote_cache
+from gigabot.adapters.cmc_id_index import get_id_index
 from gigabot.adapters.coinmarketcap_adapter import CoinMarketCapAdapter
 from gigabot.adapters.dex_screener_adapter import DexScreenerAdapter
-from gigabot.adapters.errors import SymbolAddressMismatch
+from gigabot.adapters.models.coin_info import CoinInfo
+from gigabot.adapters.models.crypto_quote import CryptocurrencyQuote
+from gigabot.adapters.request_context import request_context
+from gigabot.adapters.errors import (
+    CoinInfoNotFound,
+    CreditBudgetExceeded,
+    QuoteNotFound,
+    SymbolAddressMismatch,
+    TokenNotFound,
+    UpstreamTimeout,
+    UpstreamUnavailable,
+)
+from gigabot.observability.tracing import annotate, traced
+from gigabot.services.concurrency import run_concurrently, run_with_deadline
+from gigabot.adapters.utils import parse_timestamp
+from gigabot.services.models.price_lookup import DEXSCREENER, PriceLookup
+from gigabot.services.price_history import get_price_history
+from gigabot.bot.config import Config
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+# Token addresses found by DexScreener search, shared by every PriceService, and
+# the searches currently in flight, so concurrent lookups of a symbol share one.
+_token_addresses: TTLCache[str] = TTLCache(ttl=300, max_size=4096)
+_searches = SingleFlight()
+# Pairs returned by those searches, which hedged lookups answer from while fresh.
+_dex_pairs: TTLCache = TTLCache(ttl=30, max_size=4096)
+
+# Errors ending a lookup with a message for the user rather than a stack trace.
+LOOKUP_ERRORS = (
+    TokenNotFound,
+    SymbolAddressMismatch,
+    QuoteNotFound,
+    CoinInfoNotFound,
+    UpstreamTimeout,
+    CreditBudgetExceeded,
+    UpstreamUnavailable,
+)
+
+
+def _consume_exception(task: asyncio.Future):
+    # The CoinMarketCap half of a hedged lookup may fail after nobody awaits it.
+    if not task.cancelled():
+        task.exception()
 
 
 class PriceService:
+    """
+    Resolves a symbol into its CoinMarketCap quote and metadata.
+
+    The lookup runs as a small dependency graph: DexScreener search gives the token
+    address, the address gives the CoinMarketCap id, and the quote and coin info,
+    which only need the id, are fetched concurrently. Every stage has its own
+    deadline and a failure in one concurrent call cancels the others.
+
+    Hedged lookups (``fetch_price_hedged``) also fetch the DexScreener price of the
+    token, and answer from it when CoinMarketCap is slow, rate limited or does
+    not list the token.
+    """
+
+    SUPPORTED_DEXES = ("raydium", "uniswap")
+
+    SEARCH_TIMEOUT = 5
+    MAP_TIMEOUT = 5
+    QUOTE_TIMEOUT = 5
+    INFO_TIMEOUT = 5
+
     def __init__(self):
         self.cmc_adapter = CoinMarketCapAdapter()
         self.dex_screener_adapter = DexScreenerAdapter()
+        self.id_index = get_id_index()
+        self.coin_info_cache = get_coin_info_cache()
+        self.quote_cache = get_quote_cache()
+        self.price_history = get_price_history()
+        self.dex_screener_batcher = get_dex_screener_batcher()
+        self.hedge_budget = Config().PRICE_HEDGE_BUDGET_MS / 1000
+
+    async def fetch_cryptocurrency_data(self, symbol) -> PriceLookup:
+        """
+        Fetches the quote and coin info for a symbol.
 
-    async def fetch_cryptocurrency_data(self, symbol):
+        Args:
+            symbol (str): The cryptocurrency symbol to look up.
 
-        token_address: str = None
+        Returns:
+            PriceLookup: The lookup result. ``error`` is set if any stage failed.
+        """
+        lookup = PriceLookup(symbol=symbol)
 
         try:
-            search = self.dex_screener_adapter.search_pairs(symbol)
-            for pair in search.pairs:
-                if pair.dexId == "raydium" or pair.dexId == "uniswap":
-                    token_address = pair.baseToken.address
-                    break
-                else:
-                    return "Token not found"
+            lookup.token_address = await traced("search", self.find_token_address(symbol))
+            lookup.coin_id, lookup.quote, lookup.coin_info = await self._resolve_coinmarketcap(
+                symbol, lookup.token_address
+            )
+            lookup.stale = self.quote_cache.is_stale(lookup.coin_id)
+        except LOOKUP_ERRORS as e:
+            lookup.error = f"{e}"
         except Exception as e:
-            return f"{e}", None
+            logger.exception(f"Unexpected error while looking up {symbol}")
+            lookup.error = f"{e}"
 
-        try:
-            token_id = self.cmc_adapter.map_to_id(token_address, symbol)
-        except SymbolAddressMismatch as e:
-            return f"{e}", None
+        return lookup
+
+    async def fetch_price_hedged(self, symbol) -> PriceLookup:
+        """
+        Fetches the price of a symbol from CoinMarketCap and DexScreener concurrently.
+
+        The CoinMarketCap lookup is given ``PRICE_HEDGE_BUDGET_MS`` to complete.
+        Past that budget, or as soon as it fails, the lookup is answered from the
+        DexScreener pair of the token if it has a USD price: ``source`` is then
+        ``dexscreener`` and ``pending`` holds the CoinMarketCap lookup if it is
+        still running, so that the caller can fill the other fields in later.
+        That lookup is therefore not bound by the request deadline, unless the
+        lookup has to wait for it to answer.
+
+        Args:
+            symbol (str): The cryptocurrency symbol to look up.
+
+        Returns:
+            PriceLookup: The lookup result. ``error`` is set if neither source answered.
+        """
+        lookup = PriceLookup(symbol=symbol)
+        coinmarketcap: Optional[asyncio.Future] = None
+        dex: Optional[asyncio.Future] = None
 
         try:
-            quote = self.cmc_adapter.get_quote(token_id, symbol)
-            c_info = self.cmc_adapter.get_coin_info(token_id)
+            lookup.token_address = await traced("search", self.find_token_address(symbol))
+            with request_context(deadline=None):
+                coinmarketcap = asyncio.ensure_future(self._resolve_coinmarketcap(symbol, lookup.token_address))
+            coinmarketcap.add_done_callback(_consume_exception)
+            dex = asyncio.ensure_future(traced("dex_price", self._find_dex_pair(symbol, lookup.token_address)))
+
+            await asyncio.wait({coinmarketcap}, timeout=self.hedge_budget)
+            if not coinmarketcap.done() or coinmarketcap.exception() is not None:
+                try:
+                    pair = await dex
+                except Exception as e:
+                    logger.warning(f"DexScreener price of {symbol} unavailable: {e}")
+                    pair = None
+                if pair is not None:
+                    lookup.source = DEXSCREENER
+                    lookup.pair = pair
+                    annotate(source=DEXSCREENER)
+                    if not coinmarketcap.done():
+                        lookup.pending = coinmarketcap
+                    else:
+                        lookup.coinmarketcap_error = f"{coinmarketcap.exception()}"
+                    return lookup
+
+            lookup.coin_id, lookup.quote, lookup.coin_info = await run_with_deadline(
+                "coinmarketcap", coinmarketcap, None
+            )
+            lookup.stale = self.quote_cache.is_stale(lookup.coin_id)
+        except LOOKUP_ERRORS as e:
+            lookup.error = f"{e}"
         except Exception as e:
-            return f"{e}", None
+            logger.exception(f"Unexpected error while looking up {symbol}")
+            lookup.error = f"{e}"
+        finally:
+            for task in (coinmarketcap, dex):
+                if task is not None and task is not lookup.pending and not task.done():
+                    task.cancel()
 
-        return None, self.format_response(c_info, quote)
+        return lookup
 
-    def format_response(self, coin_info, quote):
-        embed = discord.Embed(
-            title=f"{coin_info.name} coin info and price",
-            description="Here's your info!",
-            color=discord.Colour.blurple(),
-        )
-        embed.add_field(
-            name="Coin price and info", value=f"`{quote.quote.USD.price} USD`"
-        )
-        embed.add_field(
-            name="Market Cap",
-            value=f"`{quote.self_reported_market_cap:,} USD`",
-            inline=True,
-        )
-        embed.add_field(
-            name="% Change in 1h",
-            value=f"`{quote.quote.USD.percent_change_1h:.4f}%`",
-            inline=True,
+    async def _resolve_coinmarketcap(self, symbol: str, token_address: str) -> Tuple[int, CryptocurrencyQuote, CoinInfo]:
+        """
+        Resolves the CoinMarketCap id of a token, then fetches its quote and coin
+        info concurrently.
+
+        Returns:
+            tuple: The coin id, quote and coin info.
+        """
+        coin_id = await traced("map", self.resolve_coin_id(symbol, token_address))
+        annotate(coin_id=coin_id)
+
+        results = await run_concurrently({
+            "get_quote": (
+                lambda: traced("quote", self.quote_cache.get(coin_id)),
+                self.QUOTE_TIMEOUT,
+            ),
+            "get_coin_info": (
+                lambda: traced("info", self.coin_info_cache.get(coin_id)),
+                self.INFO_TIMEOUT,
+            ),
+        })
+        quote = results["get_quote"]
+        coin_info = results["get_coin_info"]
+
+        if quote is None:
+            raise QuoteNotFound(f"Quote for {symbol} was not found")
+        self.record_quote(symbol, quote)
+        if coin_info is None:
+            raise CoinInfoNotFound(f"Coin info for {symbol} was not found")
+        return coin_id, quote, coin_info
+
+    async def _find_dex_pair(self, symbol: str, token_address: str):
+        """
+        Returns the most liquid supported pair of a token with a USD price, from
+        the last search when recent enough and from a batched token lookup otherwise.
+        """
+        pair = _dex_pairs.get(symbol.upper())
+        if pair is not None and pair.priceUsd:
+            return pair
+        pairs = await run_with_deadline(
+            "token_pairs", self.dex_screener_batcher.get_token_pairs(token_address), self.SEARCH_TIMEOUT
         )
-        embed.add_field(
-            name="% Change in 24h",
-            value=f"`{quote.quote.USD.percent_change_24h:.4f}%`",
-            inline=True,
+        priced = [pair for pair in pairs if pair.dexId in self.SUPPORTED_DEXES and pair.priceUsd]
+        if not priced:
+            return None
+        return max(priced, key=lambda pair: (pair.liquidity or {}).get("usd") or 0)
+
+    def record_quote(self, symbol: str, quote):
+        """
+        Appends a quote to the rolling price history of its symbol.
+        """
+        usd = quote.quote.USD
+        self.price_history.record(symbol, usd.price, parse_timestamp(usd.last_updated))
+
+    async def find_token_address(self, symbol: str) -> str:
+        """
+        Finds the base token address of the most liquid supported DEX pair whose
+        base token is the symbol.
+
+        Recently found addresses are served from memory and concurrent searches
+        for the same symbol share one upstream call. The last address found is
+        served when DexScreener search is down or too slow.
+
+        Raises:
+            TokenNotFound: If no supported pair was found.
+            UpstreamTimeout: If the search timed out and no address is known.
+            UpstreamUnavailable: If the search failed and no address is known.
+        """
+        key = symbol.upper()
+        token_address = _token_addresses.get(key)
+        if token_address is None:
+            try:
+                token_address, _ = await _searches.do(key, lambda: self._search_token_address(symbol))
+            except STALE_IF_ERROR:
+                token_address = _token_addresses.get_stale(key)
+                if token_address is None:
+                    raise
+        if token_address is None:
+            raise TokenNotFound("Token not found")
+        return token_address
+
+    async def _search_token_address(self, symbol: str):
+        # Only the most liquid supported pair whose base token is the symbol is decoded.
+        pair = await run_with_deadline(
+            "search_pairs",
+            self.dex_screener_adapter.find_pair_async(
+                symbol, dex_ids=self.SUPPORTED_DEXES, base_symbol=symbol
+            ),
+            self.SEARCH_TIMEOUT,
         )
+        if pair is None:
+            return None
+        _token_addresses.set(symbol.upper(), pair.baseToken.address)
+        _dex_pairs.set(symbol.upper(), pair)
+        return pair.baseToken.address
+
+    async def resolve_coin_id(self, symbol: str, token_address: str) -> int:
+        """
+        Resolves the CoinMarketCap id of a token from the local id index, falling
+        back to ``map_to_id`` for tokens the index does not know yet.
+
+        Raises:
+            SymbolAddressMismatch: If the token address does not match the symbol.
+        """
+        coin_id = self.id_index.lookup(symbol, token_address)
+        if coin_id is not None:
+            return coin_id
 
-        embed.set_footer(text="Thanks for using our bot.")
-        embed.set_author(
-            name="GIGABOT",
-            icon_url="https://w0.peakpx.com/wallpaper/927/822/HD-wallpaper-triplechad-gigachad.jpg",
-            url=coin_info.urls.website[0],
+        coin_id = await run_with_deadline(
+            "map_to_id",
+            self.cmc_adapter.map_to_id_async(token_address, symbol),
+            self.MAP_TIMEOUT,
         )
-        embed.set_image(url=coin_info.logo)
+        if coin_id is None:
+            raise SymbolAddressMismatch("Token Address does not match with any symbol.")
+
+        self.id_index.remember(symbol, token_address, coin_id)
+        return coin_id
+
+    def format_response(self, coin_info, quote, stale: bool = False):
+        """
+        Renders a quote and its coin info as a Discord embed.
+        """
+        # Imported on use: py-cord is slow to import and the gigabot-task job
+        # posts the plain payload from ``format_embed`` instead.
+        import discord
+
+        return discord.Embed.from_dict(self.format_embed(coin_info, quote, stale))
+
+    def format_embed(self, coin_info, quote, stale: bool = False) -> dict:
+        """
+        Renders a quote and its coin info as a Discord embed payload.
+
+        A ``stale`` quote, served because CoinMarketCap is unavailable, is
+        described as the last known price.
+        """
+        if stale:
+            description = (
+                "CoinMarketCap is unavailable, this is the last known price "
+                f"(updated {quote.quote.USD.last_updated})."
+            )
+        else:
+            description = "Here's your info!"
+        return {
+            "type": "rich",
+            "title": f"{coin_info.name} coin info and price",
+            "description": description,
+            # discord.Colour.blurple()
+            "color": 0x5865F2,
+            "fields": [
+                {"name": "Coin price and info", "value": f"`{quote.quote.USD.price} USD`", "inline": True},
+                {
+                    "name": "Market Cap",
+                    "value": f"`{quote.self_reported_market_cap:,} USD`",
+                    "inline": True,
+                },
+                {
+                    "name": "% Change in 1h",
+                    "value": f"`{quote.quote.USD.percent_change_1h:.4f}%`",
+                    "inline": True,
+                },
+                {
+                    "name": "% Change in 24h",
+                    "value": f"`{quote.quote.USD.percent_change_24h:.4f}%`",
+                    "inline": True,
+                },
+            ],
+            "footer": {"text": "Thanks for using our bot."},
+            "author": {
+                "name": "GIGABOT",
+                "icon_url": "https://w0.peakpx.com/wallpaper/927/822/HD-wallpaper-triplechad-gigachad.jpg",
+                "url": coin_info.urls.website[0],
+            },
+            "image": {"url": coin_info.logo},
+        }
+
+    def format_dex_response(self, lookup: PriceLookup):
+        """
+        Renders a lookup answered by DexScreener as a Discord embed.
+        """
+        import discord
+
+        return discord.Embed.from_dict(self.format_dex_embed(lookup))
 
-        return embed
+    def format_dex_embed(self, lookup: PriceLookup) -> dict:
+        """
+        Renders a lookup answered by DexScreener as a Discord embed payload,
+        noting that the CoinMarketCap data is pending or missing.
+        """
+        pair = lookup.pair
+        price_change = pair.priceChange or {}
+        liquidity = (pair.liquidity or {}).get("usd")
+        fields = [
+            {"name": "Price", "value": f"`{pair.priceUsd} USD`", "inline": True},
+            {"name": "% Change in 1h", "value": f"`{price_change.get('h1', 0):.4f}%`", "inline": True},
+            {"name": "% Change in 24h", "value": f"`{price_change.get('h24', 0):.4f}%`", "inline": True},
+            {"name": "Volume 24h", "value": f"`{(pair.volume or {}).get('h24', 0):,} USD`", "inline": True},
+        ]
+        if liquidity is not None:
+            fields.append({"name": "Liquidity", "value": f"`{liquidity:,} USD`", "inline": True})
+        if pair.fdv is not None:
+            fields.append({"name": "FDV", "value": f"`{pair.fdv:,} USD`", "inline": True})
+        if lookup.pending is not None:
+            coinmarketcap = "CoinMarketCap data is on its way."
+        else:
+            coinmarketcap = f"CoinMarketCap data unavailable: {lookup.coinmarketcap_error}"
+        return {
+            "type": "rich",
+            "title": f"{pair.baseToken.name} price on {pair.dexId}",
+            "description": coinmarketcap,
+            "url": pair.url,
+            # discord.Colour.blurple()
+            "color": 0x5865F2,
+            "fields": fields,
+            "footer": {"text": "Market data from DexScreener. Thanks for using our bot."},
+        }
@@ -0,0 +1,18 @@
+import pytest
+
+
+class FakeClock:
+    """
+    Monotonic clock standing still until a test moves ``now``.
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
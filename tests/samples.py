@@ -0,0 +1,80 @@
+"""
+Synthetic DexScreener and CoinMarketCap payloads, shaped like the real responses.
+"""
+
+from typing import Any, Dict
+
+
+def sample_pair(index: int) -> Dict[str, Any]:
+    return {
+        "chainId": "solana",
+        "dexId": "raydium",
+        "url": f"https://dexscreener.com/solana/pair{index}",
+        "pairAddress": f"pair{index:040d}",
+        "baseToken": {"address": f"token{index:039d}", "name": "Giga Chad", "symbol": "GIGA"},
+        "quoteToken": {"address": "So11111111111111111111111111111111111111112", "name": "Wrapped SOL", "symbol": "SOL"},
+        "priceNative": "0.0001234",
+        "priceUsd": "0.02345",
+        "txns": {window: {"buys": 120, "sells": 98} for window in ("m5", "h1", "h6", "h24")},
+        "volume": {"h24": 123456.7, "h6": 23456.7, "h1": 3456.7, "m5": 456.7},
+        "priceChange": {"m5": 0.1, "h1": -1.2, "h6": 3.4, "h24": 12.5},
+        "liquidity": {"usd": 456789.1, "base": 1234567, "quote": 2345.6},
+        "fdv": 23450000,
+        "pairCreatedAt": 1700000000000,
+        "info": {
+            "imageUrl": f"https://dd.dexscreener.com/ds-data/tokens/solana/token{index}.png",
+            "websites": [{"label": "Website", "url": "https://gigachad.example"}],
+            "socials": [
+                {"type": "twitter", "url": "https://x.com/gigachad"},
+                {"type": "telegram", "url": "https://t.me/gigachad"},
+            ],
+        },
+    }
+
+
+def sample_quote(index: int) -> Dict[str, Any]:
+    return {
+        "id": index, "name": "Giga Chad", "symbol": "GIGA", "slug": "gigachad",
+        "num_market_pairs": 12, "date_added": "2024-01-01T00:00:00.000Z",
+        "tags": [{"slug": f"tag-{n}", "name": f"Tag {n}", "category": "INDUSTRY"} for n in range(6)],
+        "max_supply": None, "circulating_supply": 9600000000, "total_supply": 9600000000,
+        "platform": {"id": 5426, "name": "Solana", "symbol": "SOL", "slug": "solana",
+                     "token_address": f"token{index:039d}"},
+        "is_active": 1, "infinite_supply": False, "cmc_rank": 500, "is_fiat": 0,
+        "self_reported_circulating_supply": None, "self_reported_market_cap": None,
+        "tvl_ratio": None, "last_updated": "2024-05-01T12:34:00.000Z",
+        "quote": {"USD": {
+            "price": 0.02345, "volume_24h": 123456.7, "volume_change_24h": 3.2,
+            "percent_change_1h": -1.2, "percent_change_24h": 12.5, "percent_change_7d": 30.1,
+            "percent_change_30d": 80.0, "percent_change_60d": 120.0, "percent_change_90d": 150.0,
+            "market_cap": 225000000, "market_cap_dominance": 0.01,
+            "fully_diluted_market_cap": 225000000, "tvl": None,
+            "last_updated": "2024-05-01T12:34:00.000Z",
+        }},
+    }
+
+
+def sample_coin_info(index: int) -> Dict[str, Any]:
+    return {
+        "id": index, "name": "Giga Chad", "symbol": "GIGA", "category": "token",
+        "description": "Giga Chad is a meme token. " * 10, "slug": "gigachad",
+        "logo": f"https://s2.coinmarketcap.com/static/img/coins/64x64/{index}.png",
+        "subreddit": "", "notice": "", "tags": ["memes", "solana-ecosystem"],
+        "tag-names": ["Memes", "Solana Ecosystem"], "tag-groups": ["OTHERS", "PLATFORM"],
+        "urls": {
+            "website": ["https://gigachad.example"], "twitter": ["https://x.com/gigachad"],
+            "message_board": [], "chat": ["https://t.me/gigachad"], "facebook": [],
+            "explorer": ["https://solscan.io/token/giga"], "reddit": [], "technical_doc": [],
+            "source_code": [], "announcement": [],
+        },
+        "platform": {"id": "5426", "name": "Solana", "symbol": "SOL", "slug": "solana",
+                     "token_address": f"token{index:039d}"},
+        "date_added": "2024-01-01T00:00:00.000Z", "twitter_username": "gigachad",
+        "is_hidden": 0, "date_launched": None,
+        "contract_address": [{
+            "contract_address": f"token{index:039d}",
+            "platform": {"name": "Solana", "coin": {"id": "5426", "name": "Solana", "symbol": "SOL", "slug": "solana"}},
+        }],
+        "self_reported_circulating_supply": None, "self_reported_tags": None,
+        "self_reported_market_cap": None, "infinite_supply": False,
+    }
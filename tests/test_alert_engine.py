@@ -0,0 +1,163 @@
+import asyncio
+
+from gigabot.adapters.alert_store import AlertStore
+from gigabot.adapters.decoding import decode
+from gigabot.adapters.models.dex_screener_models import Pair
+from gigabot.adapters.models.price_alert import PriceAlert
+from gigabot.services.alert_engine import ABOVE, BELOW, AlertEngine, SortedThresholds, ThresholdIndex
+from gigabot.services.price_history import PriceHistory
+from tests.samples import sample_pair
+
+SOLANA_TOKEN = "GiGa11111111111111111111111111111111111pump"
+EVM_TOKEN = "0xAbC0000000000000000000000000000000000001"
+
+
+def alert(alert_id, direction, threshold, token_address=SOLANA_TOKEN, guild_id=1, webhook_url="https://hook/1"):
+    return PriceAlert(alert_id, "GIGA", token_address, direction, threshold, webhook_url, guild_id)
+
+
+def pair(token_address: str, price: str) -> Pair:
+    data = sample_pair(0)
+    data["baseToken"] = {**data["baseToken"], "address": token_address}
+    data["priceUsd"] = price
+    return decode(Pair, data)
+
+
+class FakeBatcher:
+    def __init__(self, prices):
+        self.prices = prices
+        self.requests = []
+
+    async def get_tokens(self, token_addresses):
+        self.requests.append(list(token_addresses))
+        return {
+            address: [pair(address, self.prices[address])] if address in self.prices else []
+            for address in token_addresses
+        }
+
+
+class FakeNotifications:
+    def __init__(self):
+        self.sent = []
+        self.failing = set()
+
+    async def send(self, webhook_url, embeds):
+        if webhook_url in self.failing:
+            return False
+        self.sent.append((webhook_url, len(embeds)))
+        return True
+
+
+def engine(tmp_path, prices=None):
+    return AlertEngine(
+        AlertStore(str(tmp_path / "alerts.sqlite3")),
+        batcher=FakeBatcher(prices or {}),
+        price_service=object(),
+        notifications=FakeNotifications(),
+        price_history=PriceHistory(capacity=10, max_symbols=10),
+    )
+
+
+def test_sorted_thresholds_pop_crossed_alerts():
+    above = SortedThresholds(ABOVE)
+    below = SortedThresholds(BELOW)
+    for alert_id, threshold in enumerate([3.0, 1.0, 2.0, 2.0, 5.0]):
+        above.add(threshold, alert_id)
+        below.add(threshold, alert_id)
+
+    assert sorted(above.pop_crossed(2.0)) == [1, 2, 3]
+    assert above.thresholds == [5.0, 3.0]
+    assert below.pop_crossed(4.0) == [4]
+    assert below.thresholds == [1.0, 2.0, 2.0, 3.0]
+    assert below.pop_crossed(6.0) == []
+
+
+def test_sorted_thresholds_keep_the_crossed_alerts_at_the_end():
+    above = SortedThresholds(ABOVE)
+    below = SortedThresholds(BELOW)
+    for alert_id in range(100):
+        above.add(float(alert_id), alert_id)
+        below.add(float(alert_id), alert_id)
+
+    assert sorted(above.pop_crossed(1.0)) == [0, 1]
+    assert above.alert_ids == list(range(99, 1, -1))
+    assert below.pop_crossed(98.0) == [98, 99]
+    assert below.alert_ids == list(range(98))
+
+
+def test_sorted_thresholds_remove_only_the_given_alert():
+    thresholds = SortedThresholds(ABOVE)
+    thresholds.add(2.0, 1)
+    thresholds.add(2.0, 2)
+
+    assert thresholds.remove(2.0, 2)
+    assert not thresholds.remove(2.0, 2)
+    assert thresholds.alert_ids == [1]
+
+
+def test_threshold_index_fires_each_direction():
+    index = ThresholdIndex()
+    index.add(alert(1, ABOVE, 2.0))
+    index.add(alert(2, BELOW, 1.0))
+    index.add(alert(3, ABOVE, 4.0))
+
+    assert index.crossed(SOLANA_TOKEN, 1.5) == []
+    assert index.crossed(SOLANA_TOKEN, 2.5) == [1]
+    assert index.crossed(SOLANA_TOKEN, 0.5) == [2]
+    assert index.tokens() == [SOLANA_TOKEN]
+    index.remove(alert(3, ABOVE, 4.0))
+    assert index.tokens() == []
+
+
+def test_threshold_index_keeps_the_original_address_case():
+    index = ThresholdIndex()
+    index.add(alert(1, ABOVE, 2.0, SOLANA_TOKEN))
+    index.add(alert(2, ABOVE, 2.0, EVM_TOKEN))
+    index.add(alert(3, ABOVE, 3.0, EVM_TOKEN.lower()))
+
+    assert sorted(index.tokens()) == sorted([SOLANA_TOKEN, EVM_TOKEN])
+    assert index.crossed(SOLANA_TOKEN.lower(), 5.0) == []
+    assert sorted(index.crossed(EVM_TOKEN.lower(), 5.0)) == [2, 3]
+
+
+def test_run_tick_fires_crossed_alerts_once(tmp_path):
+    alert_engine = engine(tmp_path, {SOLANA_TOKEN: "2.5"})
+    for threshold, webhook_url in [(2.0, "https://hook/1"), (2.2, "https://hook/1"), (3.0, "https://hook/2")]:
+        alert_engine._register(alert_engine.store.add(alert(None, ABOVE, threshold, webhook_url=webhook_url)))
+
+    asyncio.run(alert_engine.run_tick())
+    asyncio.run(alert_engine.run_tick())
+
+    assert alert_engine.batcher.requests == [[SOLANA_TOKEN], [SOLANA_TOKEN]]
+    assert alert_engine.notifications.sent == [("https://hook/1", 2)]
+    assert [a.threshold for a in alert_engine.store.list()] == [3.0]
+    assert "GIGA" in alert_engine.price_history
+
+
+def test_alerts_that_could_not_be_posted_fire_again(tmp_path):
+    alert_engine = engine(tmp_path, {SOLANA_TOKEN: "2.5"})
+    for webhook_url in ("https://hook/1", "https://hook/2"):
+        alert_engine._register(alert_engine.store.add(alert(None, ABOVE, 2.0, webhook_url=webhook_url)))
+    alert_engine.notifications.failing.add("https://hook/2")
+
+    asyncio.run(alert_engine.run_tick())
+    assert [a.webhook_url for a in alert_engine.store.list()] == ["https://hook/2"]
+    assert [a.webhook_url for a in alert_engine.list_alerts(1)] == ["https://hook/2"]
+
+    alert_engine.notifications.failing.clear()
+    asyncio.run(alert_engine.run_tick())
+    assert alert_engine.notifications.sent == [("https://hook/1", 1), ("https://hook/2", 1)]
+    assert alert_engine.store.list() == []
+
+
+def test_alerts_are_managed_within_their_guild(tmp_path):
+    alert_engine = engine(tmp_path)
+    created = alert_engine.store.add(alert(None, ABOVE, 2.0, guild_id=1))
+    alert_engine._register(created)
+
+    assert alert_engine.list_alerts(2) == []
+    assert not alert_engine.remove_alert(created.id, 2)
+    assert not alert_engine.remove_alert(created.id, None)
+    assert alert_engine.list_alerts(1) == [created]
+    assert alert_engine.remove_alert(created.id, 1)
+    assert alert_engine.store.list() == []
@@ -0,0 +1,116 @@
+import asyncio
+
+from gigabot.adapters.batching import MicroBatcher
+from gigabot.adapters.request_context import Priority, current_context, request_context
+
+
+class RecordingFetch:
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.batches = []
+        self.contexts = []
+
+    async def __call__(self, keys):
+        self.batches.append(keys)
+        self.contexts.append(current_context())
+        await asyncio.sleep(self.delay)
+        return {key: key * 10 for key in keys if key >= 0}
+
+
+def test_micro_batcher_packs_lookups_of_a_window():
+    fetch = RecordingFetch()
+    batcher = MicroBatcher(fetch, window=0.01)
+
+    async def main():
+        return await asyncio.gather(batcher.load(1), batcher.load(2), batcher.load(1), batcher.load(-1))
+
+    assert asyncio.run(main()) == [10, 20, 10, None]
+    assert fetch.batches == [[1, 2, -1]]
+    assert (batcher.batches, batcher.keys) == (1, 3)
+
+
+def test_micro_batcher_flushes_full_batches():
+    fetch = RecordingFetch()
+    batcher = MicroBatcher(fetch, window=10, max_batch_size=2)
+
+    async def main():
+        return await batcher.load_many([1, 2, 3, 4])
+
+    assert asyncio.run(asyncio.wait_for(main(), 1)) == {1: 10, 2: 20, 3: 30, 4: 40}
+    assert fetch.batches == [[1, 2], [3, 4]]
+
+
+def test_micro_batcher_fails_every_caller_of_a_failed_batch():
+    async def fetch(keys):
+        raise RuntimeError("upstream down")
+
+    batcher = MicroBatcher(fetch, window=0.001)
+
+    async def main():
+        return await asyncio.gather(batcher.load(1), batcher.load(2), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_micro_batcher_cancels_callers_of_a_cancelled_batch():
+    fetch = RecordingFetch(delay=10)
+    batcher = MicroBatcher(fetch, window=0.001)
+
+    async def main():
+        callers = [asyncio.ensure_future(batcher.load(key)) for key in (1, 2)]
+        while not fetch.batches:
+            await asyncio.sleep(0.001)
+        for task in asyncio.all_tasks():
+            if task is not asyncio.current_task() and task not in callers:
+                task.cancel()
+        return await asyncio.wait_for(asyncio.gather(*callers, return_exceptions=True), 1)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+
+
+def test_micro_batcher_holds_batches_until_they_are_resolved():
+    fetch = RecordingFetch(delay=0.01)
+    batcher = MicroBatcher(fetch, window=10)
+
+    async def main():
+        caller = asyncio.ensure_future(batcher.load(1))
+        await asyncio.sleep(0)
+        batcher.flush()
+        assert len(batcher._resolving) == 1
+        return await caller
+
+    assert asyncio.run(main()) == 10
+    assert batcher._resolving == set()
+
+
+def test_micro_batcher_runs_the_batch_with_the_most_urgent_context():
+    fetch = RecordingFetch()
+    batcher = MicroBatcher(fetch, window=0.01)
+
+    async def load(key, priority, guild_id):
+        with request_context(priority=priority, guild_id=guild_id):
+            return await batcher.load(key)
+
+    async def main():
+        await asyncio.gather(load(1, Priority.BACKGROUND, 7), load(2, Priority.INTERACTIVE, 7))
+        await asyncio.gather(load(3, Priority.SCHEDULED, 7), load(4, Priority.SCHEDULED, 8))
+
+    asyncio.run(main())
+    first, second = fetch.contexts
+    assert (first.priority, first.guild_id) == (Priority.INTERACTIVE, 7)
+    assert (second.priority, second.guild_id) == (Priority.SCHEDULED, None)
+
+
+def test_micro_batcher_opens_a_new_batch_after_a_flush():
+    fetch = RecordingFetch()
+    batcher = MicroBatcher(fetch, window=0.001)
+
+    async def main():
+        first = await batcher.load(1)
+        second = await batcher.load(2)
+        return first, second
+
+    assert asyncio.run(main()) == (10, 20)
+    assert fetch.batches == [[1], [2]]
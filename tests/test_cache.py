@@ -0,0 +1,184 @@
+import asyncio
+
+import pytest
+
+from gigabot.adapters.cache import CoinInfoCache, QuoteCache, SingleFlight, TTLCache
+from gigabot.adapters.errors import CircuitOpen, UpstreamTimeout
+from gigabot.adapters.utils import create_coin_info, create_cryptocurrency_quote
+from tests.samples import sample_coin_info, sample_quote
+
+
+class FakeCoinInfoAdapter:
+    def __init__(self):
+        self.single_calls = []
+        self.batch_calls = []
+        self.error = None
+
+    async def get_coin_info_async(self, coin_id):
+        self.single_calls.append(coin_id)
+        if self.error is not None:
+            raise self.error
+        return create_coin_info(sample_coin_info(coin_id))
+
+    async def get_coin_infos_async(self, coin_ids):
+        self.batch_calls.append(list(coin_ids))
+        if self.error is not None:
+            raise self.error
+        return {coin_id: create_coin_info(sample_coin_info(coin_id)) for coin_id in coin_ids}
+
+
+class FakeQuoteAdapter:
+    def __init__(self):
+        self.calls = []
+        self.error = None
+
+    async def get_quotes_async(self, ids):
+        self.calls.append(sorted(ids))
+        await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+        return {coin_id: create_cryptocurrency_quote(sample_quote(coin_id)) for coin_id in ids}
+
+
+def test_ttl_cache_expires_entries(clock):
+    cache = TTLCache(ttl=10, max_size=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=30)
+
+    clock.now += 10
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+
+def test_ttl_cache_evicts_least_recently_used(clock):
+    cache = TTLCache(ttl=10, max_size=2, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_coin_info_cache_fetches_on_miss_only():
+    adapter = FakeCoinInfoAdapter()
+    cache = CoinInfoCache(adapter, ttl=60, max_size=10)
+
+    async def main():
+        first = await cache.get(1)
+        second = await cache.get(1)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first is second
+    assert adapter.single_calls == [1]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_coin_info_cache_warms_missing_ids_in_batches():
+    adapter = FakeCoinInfoAdapter()
+    cache = CoinInfoCache(adapter, ttl=60, max_size=500)
+    cache.BATCH_SIZE = 2
+    cache.put(1, create_coin_info(sample_coin_info(1)))
+
+    cached = asyncio.run(cache.warm([1, 2, 3, 4, 2]))
+
+    assert sorted(cached) == [1, 2, 3, 4]
+    assert adapter.batch_calls == [[2, 3], [4]]
+
+
+def test_coin_info_cache_only_holds_parsed_objects():
+    cache = CoinInfoCache(FakeCoinInfoAdapter(), ttl=60, max_size=10)
+    with pytest.raises(TypeError):
+        cache.put(1, sample_coin_info(1))
+
+
+def test_single_flight_shares_in_flight_calls():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def main():
+        return await asyncio.gather(*(single_flight.do("key", fetch) for _ in range(3)))
+
+    results = asyncio.run(main())
+    assert results == [("value", False), ("value", True), ("value", True)]
+    assert calls == [1]
+    assert len(single_flight) == 0
+
+
+def test_single_flight_keeps_the_call_when_a_caller_gives_up():
+    single_flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "value"
+
+    async def main():
+        impatient = asyncio.ensure_future(single_flight.do("key", fetch))
+        await asyncio.sleep(0)
+        patient = asyncio.ensure_future(single_flight.do("key", fetch))
+        await asyncio.sleep(0)
+        impatient.cancel()
+        return await patient
+
+    assert asyncio.run(main()) == ("value", True)
+
+
+def test_quote_cache_coalesces_and_batches_misses():
+    adapter = FakeQuoteAdapter()
+    cache = QuoteCache(adapter, refresh_interval=60)
+
+    async def main():
+        return await asyncio.gather(cache.get(1), cache.get(1), cache.get(2))
+
+    first, same, other = asyncio.run(main())
+    assert first is same
+    assert other.id == 2
+    assert adapter.calls == [[1, 2]]
+    assert cache.stats()["coalesced"] == 1
+
+
+def test_quote_cache_serves_the_last_quote_when_the_upstream_fails():
+    adapter = FakeQuoteAdapter()
+    cache = QuoteCache(adapter, refresh_interval=60)
+    last_quote = create_cryptocurrency_quote(sample_quote(1))
+    cache._cache.set(1, last_quote, ttl=0)
+    adapter.error = CircuitOpen("CoinMarketCap is failing")
+
+    async def main():
+        return await cache.get(1)
+
+    assert asyncio.run(main()) is last_quote
+    assert cache.is_stale(1)
+    assert cache.stats()["stale_served"] == 1
+
+
+def test_quote_cache_raises_when_no_quote_was_ever_fetched():
+    adapter = FakeQuoteAdapter()
+    adapter.error = UpstreamTimeout("CoinMarketCap timed out")
+    cache = QuoteCache(adapter, refresh_interval=60)
+
+    async def main():
+        return await cache.get(1)
+
+    with pytest.raises(UpstreamTimeout):
+        asyncio.run(main())
+
+
+def test_coin_info_cache_serves_expired_entries_when_the_upstream_fails():
+    adapter = FakeCoinInfoAdapter()
+    cache = CoinInfoCache(adapter, ttl=60, max_size=10)
+    cache._cache.set(1, create_coin_info(sample_coin_info(1)), ttl=0)
+    adapter.error = CircuitOpen("CoinMarketCap is failing")
+
+    assert asyncio.run(cache.get(1)).id == 1
+    assert sorted(asyncio.run(cache.warm([1, 2]))) == [1]
+    assert cache.stale_served == 2
@@ -0,0 +1,117 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from gigabot.adapters.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, is_upstream_failure
+from gigabot.adapters.errors import CircuitOpen, DeadlineExceeded, UpstreamUnavailable
+
+
+def breaker(clock, **kwargs):
+    options = {"failure_rate": 0.5, "min_calls": 4, "window": 60, "open_seconds": 30, "slow_call_threshold": 5}
+    return CircuitBreaker("test", clock=clock, **{**options, **kwargs})
+
+
+def call(circuit_breaker, result=None, error=None, is_failure=None):
+    async def upstream():
+        if error is not None:
+            raise error
+        return result
+
+    return asyncio.run(circuit_breaker.call(upstream, is_failure))
+
+
+def fail(circuit_breaker):
+    with pytest.raises(UpstreamUnavailable):
+        call(circuit_breaker, error=UpstreamUnavailable("down"))
+
+
+def test_breaker_opens_once_enough_calls_failed(clock):
+    circuit_breaker = breaker(clock)
+    call(circuit_breaker, "ok")
+    call(circuit_breaker, "ok")
+    fail(circuit_breaker)
+    assert circuit_breaker.state == CLOSED
+
+    fail(circuit_breaker)
+    assert circuit_breaker.state == OPEN
+    with pytest.raises(CircuitOpen):
+        call(circuit_breaker, "ok")
+    with pytest.raises(CircuitOpen):
+        circuit_breaker.check()
+
+
+def test_failures_expire_with_the_window(clock):
+    circuit_breaker = breaker(clock)
+    fail(circuit_breaker)
+    fail(circuit_breaker)
+    clock.now += 61
+    call(circuit_breaker, "ok")
+    call(circuit_breaker, "ok")
+    fail(circuit_breaker)
+
+    assert circuit_breaker.state == CLOSED
+
+
+def test_a_probe_closes_or_reopens_the_breaker(clock):
+    circuit_breaker = breaker(clock, min_calls=1)
+    fail(circuit_breaker)
+    clock.now += 30
+
+    fail(circuit_breaker)
+    assert circuit_breaker.state == OPEN
+    clock.now += 30
+    assert call(circuit_breaker, "ok") == "ok"
+    assert circuit_breaker.state == CLOSED
+
+
+def test_only_one_probe_is_let_through(clock):
+    circuit_breaker = breaker(clock, min_calls=1)
+    fail(circuit_breaker)
+    clock.now += 30
+
+    async def main():
+        release = asyncio.Event()
+
+        async def probe():
+            await release.wait()
+            return "ok"
+
+        first = asyncio.ensure_future(circuit_breaker.call(probe))
+        await asyncio.sleep(0)
+        assert circuit_breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpen):
+            await circuit_breaker.call(probe)
+        release.set()
+        return await first
+
+    assert asyncio.run(main()) == "ok"
+    assert circuit_breaker.state == CLOSED
+
+
+def test_slow_and_failed_responses_count_as_failures(clock):
+    circuit_breaker = breaker(clock, min_calls=2, failure_rate=1)
+
+    async def slow():
+        clock.now += 6
+        return SimpleNamespace(status=200)
+
+    asyncio.run(circuit_breaker.call(slow))
+    call(circuit_breaker, SimpleNamespace(status=503), is_failure=is_upstream_failure)
+
+    assert circuit_breaker.state == OPEN
+
+
+def test_callers_giving_up_are_not_failures(clock):
+    circuit_breaker = breaker(clock, min_calls=1)
+    with pytest.raises(DeadlineExceeded):
+        call(circuit_breaker, error=DeadlineExceeded("too late"))
+
+    assert circuit_breaker.state == CLOSED
+
+
+def test_upstream_failures_are_server_errors_and_rate_limits():
+    assert is_upstream_failure(SimpleNamespace(status=500))
+    assert is_upstream_failure(SimpleNamespace(status=429))
+    assert not is_upstream_failure(SimpleNamespace(status=400))
+    assert not is_upstream_failure(SimpleNamespace(status=200))
@@ -0,0 +1,101 @@
+import asyncio
+
+from gigabot.adapters.cmc_id_index import CoinMarketCapIdIndex
+from gigabot.adapters.models.coin_map import CoinMapEntry
+
+
+def entry(coin_id: int) -> CoinMapEntry:
+    return CoinMapEntry(
+        id=coin_id,
+        symbol=f"COIN{coin_id}",
+        name=f"Coin {coin_id}",
+        slug=f"coin-{coin_id}",
+        token_address=f"address{coin_id}",
+        platform="Solana",
+        is_active=1,
+    )
+
+
+class FakeMapAdapter:
+    def __init__(self, size: int):
+        self.entries = [entry(coin_id) for coin_id in range(1, size + 1)]
+        self.calls = []
+        self.fail_at = None
+
+    async def list_map_async(self, start, limit):
+        self.calls.append(start)
+        if start == self.fail_at:
+            return None
+        return self.entries[start - 1:start - 1 + limit]
+
+
+def index_at(path, adapter) -> CoinMarketCapIdIndex:
+    index = CoinMarketCapIdIndex(path, adapter)
+    index.PAGE_SIZE = 2
+    index.PAGE_OVERLAP = 1
+    return index
+
+
+def test_the_index_file_is_only_created_on_first_use(tmp_path):
+    path = tmp_path / "data" / "cmc_id_index.sqlite3"
+    index = index_at(str(path), FakeMapAdapter(0))
+    assert not path.exists()
+
+    assert index.lookup("COIN1", "address1") is None
+    assert path.exists()
+
+
+def test_a_full_refresh_reads_every_page_and_persists_them(tmp_path):
+    path = str(tmp_path / "cmc_id_index.sqlite3")
+    adapter = FakeMapAdapter(5)
+    index = index_at(path, adapter)
+
+    asyncio.run(index.refresh())
+
+    assert adapter.calls == [1, 3, 5]
+    assert len(index) == 5
+    assert index.lookup("coin3", "ADDRESS3") == 3
+    assert index.lookup("COIN3", "address4") is None
+    assert index.get(4).slug == "coin-4"
+
+    reloaded = index_at(path, FakeMapAdapter(0))
+    assert reloaded.lookup("COIN5", "address5") == 5
+    assert reloaded._get_meta("map_size") == "5"
+
+
+def test_incremental_refreshes_only_read_the_tail_of_the_map(tmp_path):
+    adapter = FakeMapAdapter(4)
+    index = index_at(str(tmp_path / "cmc_id_index.sqlite3"), adapter)
+    asyncio.run(index.refresh())
+
+    adapter.entries += [entry(5), entry(6), entry(7)]
+    adapter.calls = []
+    asyncio.run(index.refresh())
+
+    assert adapter.calls == [3, 5, 7]
+    assert index.lookup("COIN7", "address7") == 7
+    assert index._get_meta("map_size") == "7"
+
+
+def test_a_failed_page_keeps_the_previous_map_size(tmp_path):
+    adapter = FakeMapAdapter(5)
+    adapter.fail_at = 3
+    index = index_at(str(tmp_path / "cmc_id_index.sqlite3"), adapter)
+
+    asyncio.run(index.refresh())
+
+    assert len(index) == 2
+    assert index._get_meta("map_size") is None
+
+
+def test_the_index_can_live_in_memory_only():
+    index = index_at(None, FakeMapAdapter(3))
+
+    asyncio.run(index.refresh())
+    index.remember("GIGA", "GiGaAddress", 42)
+    index.remember("ALIAS", "address1", 1)
+
+    assert index.lookup("giga", "gigaaddress") == 42
+    assert index.lookup("ALIAS", "ADDRESS1") == 1
+    assert index.get(1).symbol == "COIN1"
+    assert index._get_meta("map_size") == "3"
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from gigabot.adapters.credit_budget import CreditBudget, TokenBucket
+from gigabot.adapters.errors import CreditBudgetExceeded
+from gigabot.adapters.request_context import Priority
+
+
+def test_token_bucket_refills_continuously_up_to_its_capacity(clock):
+    bucket = TokenBucket(capacity=60, period=60, clock=clock)
+
+    assert bucket.try_take(60)
+    assert not bucket.try_take(1)
+    assert bucket.seconds_until(2) == 2
+
+    clock.now += 2
+    assert bucket.try_take(2)
+    clock.now += 600
+    bucket.give(10)
+    assert bucket.tokens == 60
+
+
+def test_token_bucket_may_go_negative_on_forced_takes(clock):
+    bucket = TokenBucket(capacity=10, period=10, clock=clock)
+    bucket.take(15)
+
+    assert bucket.seconds_until(1) == 6
+
+
+def test_lower_priorities_are_shed_first_when_the_quota_runs_low():
+    budget = CreditBudget(per_minute=100, per_day=100, per_month=10000)
+    budget.sync_usage(used_today=85, used_this_month=85)
+
+    async def main():
+        with pytest.raises(CreditBudgetExceeded):
+            await budget.acquire(1, Priority.BACKGROUND)
+        await budget.acquire(1, Priority.SCHEDULED)
+        await budget.acquire(1, Priority.INTERACTIVE)
+
+    asyncio.run(main())
+    assert budget.shed == 1
+    assert budget.used_today == 87
+
+
+def test_waiters_are_served_by_priority():
+    # 10 credits a second, all spent: each waiter is served 0.1 s after the previous one.
+    budget = CreditBudget(per_minute=600, per_day=10000, per_month=100000)
+    budget._minute.take(600)
+    served = []
+
+    async def acquire(priority):
+        await budget.acquire(1, priority)
+        served.append(priority)
+
+    async def main():
+        await asyncio.gather(
+            acquire(Priority.BACKGROUND), acquire(Priority.SCHEDULED), acquire(Priority.INTERACTIVE)
+        )
+
+    asyncio.run(main())
+    assert served == [Priority.INTERACTIVE, Priority.SCHEDULED, Priority.BACKGROUND]
+
+
+def test_a_guild_cannot_use_more_than_its_share():
+    budget = CreditBudget(per_minute=100, per_day=10000, per_month=100000, guild_share=0.1)
+
+    async def main():
+        for _ in range(10):
+            await budget.acquire(1, Priority.INTERACTIVE, guild_id=1)
+        with pytest.raises(CreditBudgetExceeded):
+            await budget.acquire(1, Priority.INTERACTIVE, guild_id=1)
+        await budget.acquire(1, Priority.INTERACTIVE, guild_id=2)
+
+    asyncio.run(main())
+
+
+def test_a_shed_wait_gives_the_guild_share_back():
+    budget = CreditBudget(per_minute=10, per_day=10000, per_month=100000, guild_share=0.5)
+    budget.MAX_WAIT = {**CreditBudget.MAX_WAIT, Priority.INTERACTIVE: 0.01}
+    budget._minute.take(10)
+
+    async def main():
+        with pytest.raises(CreditBudgetExceeded):
+            await budget.acquire(1, Priority.INTERACTIVE, guild_id=1)
+
+    asyncio.run(main())
+    assert budget._guilds[1].tokens == pytest.approx(5, abs=0.1)
+    assert budget.used_today == 0
+
+
+def test_overestimated_calls_are_refunded_up_to_the_capacity():
+    budget = CreditBudget(per_minute=10, per_day=10000, per_month=100000)
+
+    async def main():
+        await budget.acquire(3, Priority.BACKGROUND)
+
+    asyncio.run(main())
+    budget.record(estimated=3, actual=1)
+    assert budget._minute.tokens == pytest.approx(9, abs=0.1)
+    assert budget.used_today == 1
+
+    budget.record(estimated=5, actual=0)
+    assert budget._minute.tokens == 10
+    budget.record(estimated=1, actual=4)
+    assert budget._minute.tokens == pytest.approx(7, abs=0.1)
+
+
+def test_calls_costing_more_than_a_minute_of_credits_are_rejected():
+    budget = CreditBudget(per_minute=10, per_day=10000, per_month=100000)
+
+    async def main():
+        await asyncio.wait_for(budget.acquire(11, Priority.BACKGROUND), 1)
+
+    with pytest.raises(CreditBudgetExceeded):
+        asyncio.run(main())
+    assert budget.shed == 1
+    assert budget.stats()["waiting"] == 0
@@ -0,0 +1,118 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import pytest
+
+from gigabot.adapters.decoding import JSON_KEY, decode, decode_json
+from gigabot.adapters.errors import DecodeError
+from gigabot.adapters.models.coin_info import CoinInfo
+from gigabot.adapters.models.crypto_quote import CryptocurrencyQuote
+from gigabot.adapters.models.dex_screener_models import Pair
+from gigabot.adapters.models.lazy import UNPARSED
+from tests.samples import sample_coin_info, sample_pair, sample_quote
+
+
+@dataclass
+class Leaf:
+    name: str
+
+
+@dataclass
+class Tree:
+    id: int
+    leaf: Leaf
+    leaves: List[Leaf]
+    parent: Optional[Leaf]
+    note: Optional[str]
+    size: int = 1
+    tags: List[str] = field(default_factory=list)
+    kind: str = field(default="tree", metadata={JSON_KEY: "tree-kind"})
+
+
+def test_decode_builds_nested_models():
+    tree = decode(Tree, {
+        "id": 1,
+        "leaf": {"name": "a"},
+        "leaves": [{"name": "b"}, {"name": "c"}],
+        "parent": None,
+        "tree-kind": "oak",
+        "unknown": {"ignored": True},
+    })
+
+    assert tree == Tree(1, Leaf("a"), [Leaf("b"), Leaf("c")], None, None, 1, [], "oak")
+
+
+def test_decode_reports_schema_mismatches():
+    with pytest.raises(DecodeError, match="missing field 'leaf'"):
+        decode(Tree, {"id": 1, "leaves": []})
+    with pytest.raises(DecodeError, match="expected an object"):
+        decode(Tree, [])
+    with pytest.raises(DecodeError, match="Leaf"):
+        decode(Tree, {"id": 1, "leaf": "a", "leaves": []})
+
+
+def test_decode_json_rejects_invalid_documents():
+    with pytest.raises(DecodeError, match="Invalid JSON"):
+        decode_json(Leaf, b"{")
+    assert decode_json(Leaf, b'{"name": "a"}') == Leaf("a")
+
+
+def test_response_models_decode_sample_payloads():
+    assert decode(Pair, sample_pair(1)).baseToken.address == sample_pair(1)["baseToken"]["address"]
+    assert decode(CryptocurrencyQuote, sample_quote(1)).quote.USD.price == 0.02345
+    assert decode(CoinInfo, sample_coin_info(1)).tag_names == ["Memes", "Solana Ecosystem"]
+
+
+def test_lazy_sub_objects_ignore_unknown_keys():
+    data = sample_coin_info(1)
+    data["urls"]["new_kind_of_link"] = ["https://example.com"]
+    data["platform"]["new_field"] = 1
+    data["contract_address"][0]["new_field"] = 1
+
+    coin_info = decode(CoinInfo, data)
+
+    assert coin_info.urls.website == ["https://gigachad.example"]
+    assert coin_info.platform.name == "Solana"
+    assert coin_info.contract_address[0].platform.coin.symbol == "SOL"
+
+
+def test_lazy_sub_objects_are_built_once_on_first_read():
+    coin_info = decode(CoinInfo, sample_coin_info(1))
+    assert coin_info._platform is UNPARSED
+
+    platform = coin_info.platform
+    assert platform.symbol == "SOL"
+    assert coin_info.platform is platform
+
+    quote = decode(CryptocurrencyQuote, sample_quote(1))
+    assert [tag.slug for tag in quote.tags][:2] == ["tag-0", "tag-1"]
+    assert decode(Pair, sample_pair(1)).info.websites[0].label == "Website"
+
+
+def test_invalid_optional_sub_objects_only_fail_when_read():
+    data = sample_coin_info(1)
+    data["platform"] = {"name": "Solana"}
+    data["contract_address"] = None
+
+    coin_info = decode(CoinInfo, data)
+
+    assert coin_info.contract_address == []
+    with pytest.raises(DecodeError, match="Platform"):
+        coin_info.platform
+
+
+@pytest.mark.parametrize("urls", [None, "https://gigachad.example", {"website": []}])
+def test_required_sub_objects_are_checked_when_decoding(urls):
+    data = sample_coin_info(1)
+    data["urls"] = urls
+
+    with pytest.raises(DecodeError):
+        decode(CoinInfo, data)
+
+
+def test_missing_required_sub_objects_are_rejected_when_decoding():
+    data = sample_coin_info(1)
+    del data["urls"]
+
+    with pytest.raises(DecodeError, match="urls"):
+        decode(CoinInfo, data)
@@ -0,0 +1,80 @@
+from gigabot.adapters.dex_screener_adapter import DexScreenerAdapter
+from tests.samples import sample_pair
+
+
+def pair(index: int, liquidity=None, dex_id="raydium", chain_id="solana", symbol="GIGA") -> dict:
+    data = sample_pair(index)
+    data.update(dexId=dex_id, chainId=chain_id)
+    data["baseToken"]["symbol"] = symbol
+    if liquidity is None:
+        del data["liquidity"]
+    else:
+        data["liquidity"] = {"usd": liquidity}
+    return data
+
+
+def selected(data, **filters):
+    selected_pair = DexScreenerAdapter().select_pair(data, **filters)
+    return None if selected_pair is None else selected_pair.pairAddress
+
+
+def address(index: int) -> str:
+    return sample_pair(index)["pairAddress"]
+
+
+def test_the_most_liquid_pair_is_selected():
+    data = {"pairs": [pair(1, 10), pair(2, 300), pair(3, 20)]}
+
+    assert selected(data) == address(2)
+
+
+def test_equally_liquid_pairs_keep_their_order():
+    data = {"pairs": [pair(1, 10), pair(2, 300), pair(3, 300)]}
+
+    assert selected(data) == address(2)
+
+
+def test_pairs_without_usd_liquidity_rank_last():
+    without_usd = pair(2, 1)
+    without_usd["liquidity"] = {"base": 1000000}
+    data = {"pairs": [pair(1), without_usd, pair(3, 5)]}
+
+    assert selected(data) == address(3)
+    assert selected({"pairs": [pair(1), without_usd]}) == address(1)
+
+
+def test_the_first_match_is_selected_without_ranking():
+    data = {"pairs": [pair(1, 10, dex_id="orca"), pair(2, 20), pair(3, 300)]}
+
+    assert selected(data, dex_ids=["raydium"], rank_by_liquidity=False) == address(2)
+
+
+def test_pairs_failing_to_decode_are_skipped():
+    broken = pair(2, 300)
+    del broken["baseToken"]
+    data = {"pairs": [pair(1, 10), broken]}
+
+    assert selected(data) == address(1)
+    assert selected(data, rank_by_liquidity=False) == address(1)
+    assert selected({"pairs": [broken]}) is None
+
+
+def test_pairs_are_filtered_by_dex_chain_and_symbol():
+    data = {"pairs": [
+        pair(1, 400, dex_id="orca"),
+        pair(2, 300, chain_id="ethereum"),
+        pair(3, 200, symbol="WIF"),
+        pair(4, 100, symbol="giga"),
+    ]}
+
+    assert selected(data, dex_ids=["raydium", "uniswap"]) == address(2)
+    assert selected(data, chain_ids=["solana"]) == address(1)
+    assert selected(data, base_symbol="wif") == address(3)
+    assert selected(data, dex_ids=["raydium"], chain_ids=["solana"], base_symbol="GIGA") == address(4)
+    assert selected(data, dex_ids=[]) is None
+
+
+def test_empty_payloads_select_nothing():
+    assert selected(None) is None
+    assert selected({}) is None
+    assert selected({"pairs": None}) is None
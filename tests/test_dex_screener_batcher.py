@@ -0,0 +1,89 @@
+import asyncio
+
+from gigabot.adapters.batching import DexScreenerBatcher
+from gigabot.adapters.dex_screener_adapter import DexScreenerAdapter
+from tests.samples import sample_pair
+
+EVM_TOKEN = "0xAbC0000000000000000000000000000000000001"
+SOLANA_TOKEN = "GiGa11111111111111111111111111111111111pump"
+
+
+def pair(pair_address: str, token_address: str):
+    data = sample_pair(0)
+    data["pairAddress"] = pair_address
+    data["baseToken"] = {**data["baseToken"], "address": token_address}
+    return data
+
+
+class FakeDexScreenerAdapter(DexScreenerAdapter):
+    """
+    Answers from a fixed set of pairs, recording the addresses it was asked for.
+    Addresses are matched regardless of case, like DexScreener does for EVM ones.
+    """
+
+    def __init__(self, pairs):
+        super().__init__()
+        self.pairs = pairs
+        self.requests = []
+
+    async def get_tokens_async(self, token_addresses: str):
+        self.requests.append(token_addresses)
+        wanted = set(token_addresses.lower().split(","))
+        return self.parse_pairs_response({"pairs": [p for p in self.pairs if p["baseToken"]["address"].lower() in wanted]})
+
+    async def get_pairs_async(self, chain_id: str, pair_addresses: str):
+        self.requests.append(pair_addresses)
+        wanted = set(pair_addresses.lower().split(","))
+        return self.parse_pairs_response({"pairs": [p for p in self.pairs if p["pairAddress"].lower() in wanted]})
+
+
+def test_token_lookups_are_sent_in_one_request_and_demultiplexed():
+    adapter = FakeDexScreenerAdapter([pair("pair1", "token1"), pair("pair2", "token1"), pair("pair3", "token2")])
+    batcher = DexScreenerBatcher(adapter, window=0.001)
+
+    async def main():
+        return await asyncio.gather(
+            batcher.get_token_pairs("token1"), batcher.get_token_pairs("token2"), batcher.get_token_pairs("token3")
+        )
+
+    first, second, missing = asyncio.run(main())
+    assert adapter.requests == ["token1,token2,token3"]
+    assert [p.pairAddress for p in first] == ["pair1", "pair2"]
+    assert [p.pairAddress for p in second] == ["pair3"]
+    assert missing == []
+
+
+def test_solana_addresses_are_sent_with_their_case():
+    adapter = FakeDexScreenerAdapter([pair("pair1", SOLANA_TOKEN)])
+    batcher = DexScreenerBatcher(adapter, window=0.001)
+
+    pairs = asyncio.run(batcher.get_tokens([SOLANA_TOKEN]))
+
+    assert adapter.requests == [SOLANA_TOKEN]
+    assert [p.pairAddress for p in pairs[SOLANA_TOKEN]] == ["pair1"]
+
+
+def test_evm_addresses_match_whatever_case_comes_back():
+    # The upstream answers with the checksummed address.
+    adapter = FakeDexScreenerAdapter([pair("0xPAIR1", EVM_TOKEN)])
+    batcher = DexScreenerBatcher(adapter, window=0.001)
+
+    pairs = asyncio.run(batcher.get_tokens([EVM_TOKEN.lower()]))
+
+    assert adapter.requests == [EVM_TOKEN.lower()]
+    assert [p.pairAddress for p in pairs[EVM_TOKEN.lower()]] == ["0xPAIR1"]
+
+
+def test_pair_lookups_are_batched_per_chain_and_keyed_by_the_requested_address():
+    adapter = FakeDexScreenerAdapter([pair("0xPAIR1", EVM_TOKEN), pair(SOLANA_TOKEN, "token1")])
+    batcher = DexScreenerBatcher(adapter, window=0.001)
+
+    async def main():
+        return await asyncio.gather(
+            batcher.get_pairs("ethereum", ["0xPAIR1", "0xPAIR2"]), batcher.get_pair("solana", SOLANA_TOKEN)
+        )
+
+    pairs, solana_pair = asyncio.run(main())
+    assert sorted(adapter.requests) == sorted(["0xPAIR1,0xPAIR2", SOLANA_TOKEN])
+    assert list(pairs) == ["0xPAIR1"]
+    assert solana_pair.pairAddress == SOLANA_TOKEN
@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import pytest
+
+from gigabot.adapters.errors import DeadlineExceeded
+from gigabot.adapters.http_client import HttpClient, HttpResponse
+from gigabot.adapters.request_context import request_context
+
+
+class ScriptedHttpClient(HttpClient):
+    """
+    Answers each attempt with the next scripted response, or raises it.
+    """
+
+    BACKOFF_BASE = 0.001
+
+    def __init__(self, *outcomes, **kwargs):
+        super().__init__("https://upstream.example", name="test", **kwargs)
+        self.outcomes = list(outcomes)
+        self.timeouts = []
+
+    async def _get_once(self, path, params, timeout):
+        self.timeouts.append(timeout)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+def response(status, **headers):
+    return HttpResponse(status=status, headers=headers, body=b"{}")
+
+
+def test_transient_failures_are_retried():
+    client = ScriptedHttpClient(response(503), asyncio.TimeoutError(), response(200))
+
+    assert asyncio.run(client.get("/quotes")).status == 200
+    assert client.outcomes == []
+
+
+def test_the_last_retryable_response_is_returned_once_no_attempt_is_left():
+    client = ScriptedHttpClient(response(502), response(502), response(502), response(200))
+
+    assert asyncio.run(client.get("/quotes")).status == 502
+    assert len(client.outcomes) == 1
+
+
+def test_client_errors_are_not_retried():
+    client = ScriptedHttpClient(response(400), response(200))
+
+    assert asyncio.run(client.get("/quotes")).status == 400
+
+
+def test_long_retry_after_is_not_waited_for():
+    client = ScriptedHttpClient(response(429, **{"retry-after": "60"}), response(200))
+
+    assert asyncio.run(client.get("/quotes")).status == 429
+
+
+def test_retry_after_is_honoured():
+    client = ScriptedHttpClient(response(429, **{"Retry-After": "0.05"}), response(200))
+
+    started = time.monotonic()
+    assert asyncio.run(client.get("/quotes")).status == 200
+    assert time.monotonic() - started >= 0.05
+
+
+def test_attempts_are_bounded_by_the_deadline():
+    client = ScriptedHttpClient(response(503), response(200), timeout=10)
+
+    async def main():
+        with request_context(deadline=time.monotonic() + 0.5):
+            return await client.get("/quotes")
+
+    assert asyncio.run(main()).status == 200
+    assert all(timeout <= 0.5 for timeout in client.timeouts)
+
+
+def test_a_passed_deadline_fails_fast():
+    client = ScriptedHttpClient(response(200))
+
+    async def main():
+        with request_context(deadline=time.monotonic() - 1):
+            return await client.get("/quotes")
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(main())
+    assert client.timeouts == []
+
+
+def test_retry_after_accepts_seconds_and_dates():
+    assert response(429, **{"RETRY-AFTER": "2"}).retry_after() == 2
+    assert response(429, **{"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}).retry_after() == 0
+    assert response(429, **{"Retry-After": "soon"}).retry_after() is None
+    assert response(429).retry_after() is None
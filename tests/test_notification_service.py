@@ -0,0 +1,126 @@
+import asyncio
+from collections import deque
+
+import aiohttp
+import discord
+from aiohttp import web
+
+from gigabot.services.notification_service import NotificationService, embed_size
+
+
+def embed(characters: int) -> dict:
+    return {"title": "x" * characters}
+
+
+class RecordingNotificationService(NotificationService):
+    BACKOFF_BASE = 0
+
+    def __init__(self, failures: int = 0):
+        super().__init__()
+        self.failures = failures
+        self.posts = []
+
+    async def _post(self, webhook_url, embeds):
+        if self.failures:
+            self.failures -= 1
+            raise aiohttp.ClientConnectionError("connection reset")
+        self.posts.append((webhook_url, [embed_size(e) for e in embeds]))
+
+
+def test_embed_size_counts_like_discord():
+    rich = discord.Embed(title="Price", description="GIGA is up")
+    rich.add_field(name="Price", value="`1 USD`")
+    rich.set_footer(text="Thanks")
+
+    assert embed_size(rich.to_dict()) == len(rich) == 5 + 10 + 5 + 7 + 6
+    assert embed_size({"fields": [{"name": "a", "value": None}], "author": {"name": "bot"}}) == 4
+
+
+def test_next_message_respects_the_embed_and_character_limits():
+    service = NotificationService()
+    queue = deque((embed(100), None) for _ in range(12))
+    assert len(service._next_message(queue)) == 10
+    assert len(service._next_message(queue)) == 2
+
+    queue = deque((embed(size), None) for size in (2500, 2500, 2500, 7000))
+    assert [embed_size(e) for e, _ in service._next_message(queue)] == [2500, 2500]
+    assert [embed_size(e) for e, _ in service._next_message(queue)] == [2500]
+    # An embed over the limit on its own is still sent, alone.
+    assert [embed_size(e) for e, _ in service._next_message(queue)] == [7000]
+
+
+def test_concurrent_sends_to_a_webhook_share_messages():
+    service = RecordingNotificationService()
+
+    async def main():
+        await asyncio.gather(
+            service.send("https://hook/1", [embed(10)] * 6),
+            service.send("https://hook/1", [embed(20)] * 6),
+            service.send("https://hook/2", [embed(30)]),
+        )
+        await service.close()
+
+    asyncio.run(main())
+    assert sorted(service.posts) == [
+        ("https://hook/1", [10] * 6 + [20] * 4),
+        ("https://hook/1", [20] * 2),
+        ("https://hook/2", [30]),
+    ]
+    assert (service.messages, service.embeds) == (3, 13)
+
+
+def test_failed_posts_are_retried():
+    service = RecordingNotificationService(failures=2)
+
+    async def main():
+        await service.send("https://hook/1", [embed(10)])
+        await service.close()
+
+    asyncio.run(main())
+    assert service.posts == [("https://hook/1", [10])]
+
+
+def test_rejected_posts_are_not_retried_and_count_as_dropped():
+    service = NotificationService()
+    requests = []
+
+    async def webhook(request):
+        requests.append(await request.json())
+        return web.Response(status=404, text='{"message": "Unknown Webhook"}')
+
+    async def main():
+        app = web.Application()
+        app.router.add_post("/hook", webhook)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        try:
+            return await service.send(f"http://127.0.0.1:{port}/hook", [embed(10), embed(20)])
+        finally:
+            await service.close()
+            await runner.cleanup()
+
+    assert asyncio.run(main()) is False
+    assert len(requests) == 1
+    assert (service.messages, service.embeds, service.dropped) == (0, 0, 2)
+
+
+def test_the_session_of_a_previous_loop_is_closed():
+    service = NotificationService()
+
+    async def open_session():
+        return service._get_session()
+
+    async def replace_session():
+        session = service._get_session()
+        await asyncio.sleep(0)
+        return session
+
+    first = asyncio.run(open_session())
+    second = asyncio.run(replace_session())
+
+    assert second is not first
+    assert first.closed
+    asyncio.run(service.close())
@@ -0,0 +1,93 @@
+import asyncio
+
+from gigabot.adapters.decoding import decode
+from gigabot.adapters.errors import UpstreamUnavailable
+from gigabot.adapters.models.dex_screener_models import Pair
+from gigabot.adapters.utils import create_coin_info, create_cryptocurrency_quote
+from gigabot.bot.commands.price_command import PriceCommand
+from gigabot.services.models.price_lookup import DEXSCREENER, PriceLookup
+from tests.samples import sample_coin_info, sample_pair, sample_quote
+
+
+class FakeContext:
+    guild_id = 1
+
+    def __init__(self):
+        self.responses = []
+        self.edits = []
+
+    async def respond(self, content=None, embed=None):
+        self.responses.append(content if embed is None else embed)
+
+    async def edit(self, embed=None):
+        self.edits.append(embed)
+
+
+def hedged_command(context: FakeContext, pending: asyncio.Future) -> PriceCommand:
+    command = PriceCommand(context, "giga")
+    command.hedged = True
+
+    async def fetch_price_hedged(symbol):
+        return PriceLookup(symbol=symbol, source=DEXSCREENER, pair=decode(Pair, sample_pair(1)), pending=pending)
+
+    command.price_service.fetch_price_hedged = fetch_price_hedged
+    return command
+
+
+def coinmarketcap_result():
+    quote = sample_quote(1)
+    quote["self_reported_market_cap"] = 225000000
+    return 1, create_cryptocurrency_quote(quote), create_coin_info(sample_coin_info(1))
+
+
+async def wait_for_fill_ins():
+    await asyncio.gather(*PriceCommand._fill_ins)
+
+
+def test_a_dex_screener_reply_is_edited_once_coinmarketcap_answers():
+    context = FakeContext()
+
+    async def main():
+        pending = asyncio.get_running_loop().create_future()
+        await hedged_command(context, pending).execute()
+        assert context.responses[0].title == "Giga Chad price on raydium"
+        assert context.responses[0].description == "CoinMarketCap data is on its way."
+        assert context.edits == []
+
+        pending.set_result(coinmarketcap_result())
+        await wait_for_fill_ins()
+
+    asyncio.run(main())
+    assert len(context.responses) == 1
+    assert len(context.edits) == 1
+    assert context.edits[0].title == "Giga Chad coin info and price"
+
+
+def test_a_dex_screener_reply_stays_when_coinmarketcap_fails():
+    context = FakeContext()
+
+    async def main():
+        pending = asyncio.get_running_loop().create_future()
+        await hedged_command(context, pending).execute()
+        pending.set_exception(UpstreamUnavailable("CoinMarketCap is failing"))
+        await wait_for_fill_ins()
+
+    asyncio.run(main())
+    assert len(context.responses) == 1
+    assert context.edits == []
+
+
+def test_a_dex_screener_reply_stops_waiting_after_the_fill_in_timeout():
+    context = FakeContext()
+
+    async def main():
+        pending = asyncio.get_running_loop().create_future()
+        command = hedged_command(context, pending)
+        command.FILL_IN_TIMEOUT = 0.01
+        await command.execute()
+        await wait_for_fill_ins()
+        return pending
+
+    pending = asyncio.run(main())
+    assert pending.cancelled()
+    assert context.edits == []
@@ -0,0 +1,88 @@
+import pytest
+
+from gigabot.services import price_history
+from gigabot.services.price_history import PriceHistory, PriceRingBuffer
+
+
+@pytest.fixture(params=["numpy", "python"])
+def stats_path(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(price_history, "load_numpy", lambda: None)
+    return request.param
+
+
+def buffer(prices, capacity=8):
+    ring = PriceRingBuffer(capacity)
+    for timestamp, price in enumerate(prices, start=1):
+        ring.append(float(timestamp), price)
+    return ring
+
+
+def test_ring_buffer_overwrites_the_oldest_points():
+    ring = buffer([1, 2, 3, 4, 5], capacity=3)
+
+    timestamps, prices = ring.columns()
+    assert len(ring) == 3
+    assert list(timestamps) == [3.0, 4.0, 5.0]
+    assert list(prices) == [3.0, 4.0, 5.0]
+
+
+def test_ring_buffer_ignores_points_not_newer_than_the_last():
+    ring = buffer([1, 2])
+
+    assert not ring.append(2.0, 10)
+    assert not ring.append(1.0, 10)
+    assert list(ring.columns()[1]) == [1.0, 2.0]
+
+
+def test_window_keeps_the_last_seconds():
+    ring = buffer([1, 2, 3, 4, 5, 6], capacity=4)
+
+    timestamps, prices = ring.window(2, now=6.0)
+    assert list(timestamps) == [4.0, 5.0, 6.0]
+    assert list(prices) == [4.0, 5.0, 6.0]
+
+
+def test_stats(stats_path):
+    stats = buffer([2, 1, 4]).stats(100, now=3.0)
+
+    assert (stats.count, stats.first, stats.last, stats.min, stats.max) == (3, 2, 4, 1, 4)
+    assert stats.percent_change == 100.0
+    assert stats.volatility == pytest.approx(247.48737341529164)
+
+
+@pytest.mark.parametrize(
+    "prices, volatility",
+    [
+        ([0, 0, 0], None),
+        ([0, 1, 2], None),
+        ([1, 0, 2], None),
+        ([5], None),
+        ([1, 2, 4], 0.0),
+        ([1, 2, 3, 5], pytest.approx(11.785113019775793)),
+    ],
+)
+def test_stats_skip_returns_from_a_zero_price(stats_path, prices, volatility):
+    stats = buffer(prices, capacity=3).stats(100, now=10.0)
+
+    assert stats.volatility == volatility
+    assert stats.min == min(prices[-3:])
+    assert stats.max == max(prices[-3:])
+
+
+def test_stats_of_an_empty_window_is_none(stats_path):
+    assert buffer([1, 2]).stats(1, now=100.0) is None
+
+
+def test_price_history_evicts_the_least_recent_symbol():
+    history = PriceHistory(capacity=4, max_symbols=2)
+    history.record("A", 1.0, timestamp=1.0)
+    history.record("B", 1.0, timestamp=1.0)
+    history.record("A", 2.0, timestamp=2.0)
+    history.record("C", 1.0, timestamp=1.0)
+
+    assert "A" in history
+    assert "B" not in history
+    assert history.stats("A", 10, now=2.0).percent_change == 100.0
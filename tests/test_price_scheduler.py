@@ -0,0 +1,91 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from gigabot.adapters.models.price_schedule import PriceSchedule
+from gigabot.adapters.schedule_store import ScheduleStore
+from gigabot.services import price_scheduler
+from gigabot.services.price_scheduler import PriceScheduler
+
+
+def cron_field_matches(field: str, value: int) -> bool:
+    if field == "*":
+        return True
+    if field.startswith("*/"):
+        return value % int(field[2:]) == 0
+    return value == int(field)
+
+
+def cron_fires(expression: str, minute: int, hour: int) -> bool:
+    minute_field, hour_field, *_ = expression.split()
+    return cron_field_matches(minute_field, minute) and cron_field_matches(hour_field, hour)
+
+
+def schedule(name: str = "giga", minute: int = 15, hour: int = 0) -> PriceSchedule:
+    return PriceSchedule(name, "GIGA", minute, hour, "https://discord.example/webhook")
+
+
+@pytest.mark.parametrize("minute, hour", [(1, 0), (15, 0), (7, 0), (0, 1), (30, 6), (59, 5), (0, 24)])
+def test_is_due_matches_the_cron_expression(minute, hour):
+    price_schedule = schedule(minute=minute, hour=hour)
+    for hour_of_day in range(24):
+        for minute_of_hour in range(60):
+            assert price_schedule.is_due(minute_of_hour, hour_of_day) == cron_fires(
+                price_schedule.cron_expression, minute_of_hour, hour_of_day
+            ), (price_schedule.cron_expression, hour_of_day, minute_of_hour)
+
+
+def test_scheduler_collects_the_schedules_due_in_a_minute(tmp_path):
+    scheduler = PriceScheduler(ScheduleStore(str(tmp_path / "schedules.sqlite3")), object(), object())
+    scheduler.add(schedule("every-20", minute=20))
+    scheduler.add(schedule("six-hourly", minute=30, hour=6))
+
+    assert [s.name for s in scheduler.due(datetime(2024, 5, 1, 12, 30))] == ["six-hourly"]
+    assert [s.name for s in scheduler.due(datetime(2024, 5, 1, 13, 40))] == ["every-20"]
+    assert scheduler.due(datetime(2024, 5, 1, 13, 30)) == []
+
+
+@pytest.mark.parametrize("minute, hour", [(0, 0), (60, 1), (5, -1), (5, 24)])
+def test_scheduler_rejects_schedules_that_never_fire(tmp_path, minute, hour):
+    scheduler = PriceScheduler(ScheduleStore(str(tmp_path / "schedules.sqlite3")), object(), object())
+    with pytest.raises(ValueError):
+        scheduler.add(schedule(minute=minute, hour=hour))
+
+
+def test_a_minute_is_ticked_once_when_the_sleep_wakes_up_early(tmp_path, monkeypatch):
+    times = [
+        datetime(2024, 5, 1, 12, 0, 30, tzinfo=timezone.utc),
+        # The monotonic sleep ended a little before the wall clock boundary.
+        datetime(2024, 5, 1, 12, 0, 59, 999000, tzinfo=timezone.utc),
+        datetime(2024, 5, 1, 12, 2, 0, 1000, tzinfo=timezone.utc),
+    ]
+
+    class FakeDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return times.pop(0)
+
+    real_sleep = asyncio.sleep
+
+    async def sleep(seconds):
+        if not times:
+            raise asyncio.CancelledError
+        await real_sleep(0)
+
+    scheduler = PriceScheduler(ScheduleStore(str(tmp_path / "schedules.sqlite3")), object(), object())
+    ticks = []
+
+    async def safe_tick(now):
+        ticks.append(now)
+
+    monkeypatch.setattr(price_scheduler, "datetime", FakeDatetime)
+    monkeypatch.setattr(price_scheduler.asyncio, "sleep", sleep)
+    monkeypatch.setattr(scheduler, "_safe_tick", safe_tick)
+
+    async def main():
+        with pytest.raises(asyncio.CancelledError):
+            await scheduler.run_forever()
+
+    asyncio.run(main())
+    assert [f"{tick:%H:%M}" for tick in ticks] == ["12:01", "12:02"]
@@ -0,0 +1,178 @@
+import asyncio
+
+import pytest
+
+from gigabot.adapters import circuit_breaker
+from gigabot.adapters.cache import TTLCache
+from gigabot.adapters.decoding import decode
+from gigabot.adapters.errors import QuoteNotFound, TokenNotFound, UpstreamTimeout, UpstreamUnavailable
+from gigabot.adapters.http_client import HttpResponse
+from gigabot.adapters.models.dex_screener_models import Pair
+from gigabot.adapters.utils import create_coin_info, create_cryptocurrency_quote
+from gigabot.services import price_service
+from gigabot.services.models.price_lookup import COINMARKETCAP, DEXSCREENER
+from gigabot.services.price_service import PriceService
+from tests.samples import sample_coin_info, sample_pair, sample_quote
+
+SOLANA_TOKEN = "GiGa11111111111111111111111111111111111pump"
+
+
+class ScriptedHttp:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.paths = []
+
+    async def get(self, path, params=None, timeout=None):
+        self.paths.append(path)
+        return self.responses.pop(0)
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "_circuit_breakers", {})
+    monkeypatch.setattr(price_service, "_token_addresses", TTLCache(ttl=300, max_size=10))
+    monkeypatch.setattr(price_service, "_dex_pairs", TTLCache(ttl=30, max_size=10))
+
+
+def service_answering(*responses) -> PriceService:
+    service = PriceService()
+    service.dex_screener_adapter.http = ScriptedHttp(*responses)
+    return service
+
+
+def test_the_last_known_address_is_served_when_search_fails():
+    service = service_answering(HttpResponse(status=503, headers={}, body=b"<html>down</html>"))
+    price_service._token_addresses.set("GIGA", SOLANA_TOKEN, ttl=0)
+
+    assert asyncio.run(service.find_token_address("giga")) == SOLANA_TOKEN
+
+
+def test_a_failing_search_is_not_reported_as_an_unknown_token():
+    service = service_answering(HttpResponse(status=503, headers={}, body=b""))
+
+    with pytest.raises(UpstreamUnavailable):
+        asyncio.run(service.find_token_address("giga"))
+
+
+def test_an_invalid_search_body_is_an_upstream_failure():
+    service = service_answering(HttpResponse(status=200, headers={}, body=b"<html>"))
+
+    with pytest.raises(UpstreamUnavailable):
+        asyncio.run(service.find_token_address("giga"))
+
+
+def test_a_search_without_supported_pairs_is_an_unknown_token():
+    service = service_answering(HttpResponse(status=200, headers={}, body=b'{"pairs": []}'))
+
+    with pytest.raises(TokenNotFound):
+        asyncio.run(service.find_token_address("giga"))
+
+
+class HedgedSources:
+    """
+    Stands in for the two halves of a hedged lookup. Each answers, or raises its
+    error, once its event is set.
+    """
+
+    def __init__(self):
+        self.coinmarketcap_error = None
+        self.dex_error = None
+        self.coinmarketcap_released = asyncio.Event()
+        self.dex_released = asyncio.Event()
+        self.dex_cancelled = False
+
+    async def resolve_coinmarketcap(self, symbol, token_address):
+        await self.coinmarketcap_released.wait()
+        if self.coinmarketcap_error is not None:
+            raise self.coinmarketcap_error
+        return 1, create_cryptocurrency_quote(sample_quote(1)), create_coin_info(sample_coin_info(1))
+
+    async def find_dex_pair(self, symbol, token_address):
+        try:
+            await self.dex_released.wait()
+        except asyncio.CancelledError:
+            self.dex_cancelled = True
+            raise
+        if self.dex_error is not None:
+            raise self.dex_error
+        return decode(Pair, sample_pair(1))
+
+
+def hedged_service(sources: HedgedSources) -> PriceService:
+    service = PriceService()
+    service.hedge_budget = 0.01
+    service._resolve_coinmarketcap = sources.resolve_coinmarketcap
+    service._find_dex_pair = sources.find_dex_pair
+    price_service._token_addresses.set("GIGA", SOLANA_TOKEN)
+    return service
+
+
+def test_dex_screener_answers_when_coinmarketcap_misses_the_hedge_budget():
+    async def main():
+        sources = HedgedSources()
+        sources.dex_released.set()
+        lookup = await hedged_service(sources).fetch_price_hedged("giga")
+
+        assert (lookup.ok, lookup.source) == (True, DEXSCREENER)
+        assert lookup.pair.baseToken.symbol == "GIGA"
+        assert lookup.quote is None and not lookup.pending.done()
+
+        sources.coinmarketcap_released.set()
+        coin_id, quote, _ = await lookup.pending
+        assert (coin_id, quote.id) == (1, 1)
+
+    asyncio.run(main())
+
+
+def test_coinmarketcap_within_the_hedge_budget_wins_the_race():
+    async def main():
+        sources = HedgedSources()
+        sources.coinmarketcap_released.set()
+        lookup = await hedged_service(sources).fetch_price_hedged("giga")
+        await asyncio.sleep(0)
+        return sources, lookup
+
+    sources, lookup = asyncio.run(main())
+    assert (lookup.source, lookup.coin_id, lookup.pending) == (COINMARKETCAP, 1, None)
+    assert lookup.coin_info.id == 1
+    assert sources.dex_cancelled
+
+
+def test_a_failing_coinmarketcap_is_answered_from_dex_screener_without_waiting():
+    async def main():
+        sources = HedgedSources()
+        sources.coinmarketcap_error = QuoteNotFound("Quote for giga was not found")
+        sources.coinmarketcap_released.set()
+        sources.dex_released.set()
+        service = hedged_service(sources)
+        service.hedge_budget = 10
+        return await asyncio.wait_for(service.fetch_price_hedged("giga"), 1)
+
+    lookup = asyncio.run(main())
+    assert (lookup.source, lookup.pending) == (DEXSCREENER, None)
+    assert lookup.coinmarketcap_error == "Quote for giga was not found"
+
+
+def test_a_failing_dex_screener_waits_for_coinmarketcap():
+    async def main():
+        sources = HedgedSources()
+        sources.dex_error = UpstreamTimeout("DexScreener timed out")
+        sources.dex_released.set()
+        asyncio.get_running_loop().call_later(0.05, sources.coinmarketcap_released.set)
+        return await hedged_service(sources).fetch_price_hedged("giga")
+
+    lookup = asyncio.run(main())
+    assert (lookup.ok, lookup.source, lookup.coin_id) == (True, COINMARKETCAP, 1)
+
+
+def test_a_hedged_lookup_fails_when_both_sources_fail():
+    async def main():
+        sources = HedgedSources()
+        sources.coinmarketcap_error = UpstreamUnavailable("CoinMarketCap is failing")
+        sources.dex_error = UpstreamTimeout("DexScreener timed out")
+        sources.dex_released.set()
+        asyncio.get_running_loop().call_later(0.05, sources.coinmarketcap_released.set)
+        return await hedged_service(sources).fetch_price_hedged("giga")
+
+    lookup = asyncio.run(main())
+    assert lookup.error == "CoinMarketCap is failing"